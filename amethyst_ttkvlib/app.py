@@ -11,6 +11,7 @@ App
 import os
 import os.path
 import pathlib
+import time
 
 from kivy.factory import Factory
 import kivy.app
@@ -34,11 +35,32 @@ class App(Factory.PlayerSlateBehavior, kivy.app.App):
     """
     :cvar XDG_APP: Name of your application. Is used by the `user_*()`
     methods as the app's XDG subdirectory.
+
+    :cvar TEXTURE_CACHE_BUDGET: Maximum size (bytes) of the on-disk card
+    texture cache. Set to 0 to disable the cache.
+
+    :cvar TRACE_CAPACITY: Maximum number of spans kept by `start_tracing()`.
     """
+    TEXTURE_CACHE_BUDGET = 256 * 2**20
+    TRACE_CAPACITY = 100000
 
     def _(self, key):
         return key
 
+    @property
+    def texture_cache(self):
+        """
+        Shared `TextureCache` stored in `user_cache("textures")`, or None
+        if disabled (or XDG_APP is unset). Used by default by all CardImage
+        widgets.
+        """
+        if not self.TEXTURE_CACHE_BUDGET or getattr(self, 'XDG_APP', None) is None:
+            return None
+        if getattr(self, '_texture_cache', None) is None:
+            from amethyst_ttkvlib.texcache import TextureCache
+            self._texture_cache = TextureCache(self.user_cache("textures", mkdir=True), budget=self.TEXTURE_CACHE_BUDGET)
+        return self._texture_cache
+
     def user_conf(self, *names, **kwargs):
         """
         :param mkdir: When True, create the directory if it does not exist.
@@ -92,3 +114,54 @@ class App(Factory.PlayerSlateBehavior, kivy.app.App):
             myapp.user_cache("foo.png", file=True, mkdir=True)       # creates ~/.cache/myapp
         """
         return _xdg_path('XDG_CACHE_HOME', os.path.expanduser("~/.cache"), self.XDG_APP, names, **kwargs)
+
+    def notice_journal(self, *names):
+        """
+        Open a `NoticeJournal` stored in the user data directory. The
+        directory is created if necessary.
+
+            journal = myapp.notice_journal("games", "1234.journal")  # ~/.local/share/myapp/games/1234.journal
+        """
+        from amethyst_ttkvlib.journal import NoticeJournal
+        return NoticeJournal(self.user_data(*names, file=True, mkdir=True))
+
+    def snapshot_store(self, *names):
+        """
+        Open a `SnapshotStore` in the user data directory (default
+        "snapshots"). The directory is created if necessary.
+
+            store = myapp.snapshot_store()                           # ~/.local/share/myapp/snapshots
+        """
+        from amethyst_ttkvlib.snapshot import SnapshotStore
+        return SnapshotStore(self.user_data(*(names or ("snapshots",)), mkdir=True))
+
+    def start_tracing(self, capacity=None, frames=True):
+        """
+        Begin recording spans from library hot paths (CardFan redraws,
+        notice dispatch, Slate content swaps, texture loads) and, if
+        `frames` is True, every Clock frame. Returns the `Tracer`, whose
+        `span()` method may be used to add application spans.
+        """
+        from amethyst_ttkvlib import trace
+        return trace.start_tracing(capacity or self.TRACE_CAPACITY, frames)
+
+    def stop_tracing(self):
+        """Stop recording. Spans already recorded may still be dumped."""
+        from amethyst_ttkvlib import trace
+        self._stopped_tracer = trace.stop_tracing()
+
+    def dump_trace(self, *names):
+        """
+        Write recorded spans as a Chrome trace-event JSON file in the user
+        cache directory and return its path. Returns None if nothing has
+        been traced.
+
+            myapp.dump_trace()                                       # ~/.cache/myapp/traces/trace-20240101-120000.json
+        """
+        from amethyst_ttkvlib import trace
+        tracer = trace.tracer or getattr(self, '_stopped_tracer', None)
+        if tracer is None:
+            return None
+        if not names:
+            names = ("traces", time.strftime("trace-%Y%m%d-%H%M%S.json"))
+        return tracer.dump(self.user_cache(*names, file=True, mkdir=True))
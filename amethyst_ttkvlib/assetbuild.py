@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+"""
+Preprocess card images into atlas pages and a manifest.
+
+Each source image is scaled to the card size and each level of detail,
+trimmed of transparent borders, and given an alpha hit mask. The results
+are packed into Kivy atlas pages and described by a JSON manifest which
+`amethyst_ttkvlib.assets.CardAssets` loads:
+
+    python3 -m amethyst_ttkvlib.assetbuild -o build/cards --card-size 240x360 art/*.png
+
+Sources are processed in parallel by a process pool. Re-runs only process
+sources whose modification time or size changed (or which are new); the
+atlas pages are repacked from the stored per-source images. Requires
+Pillow.
+"""
+__all__ = '''
+MANIFEST_VERSION
+build
+main
+'''.split()
+
+import argparse
+import base64
+import concurrent.futures
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import sys
+
+MANIFEST_VERSION = 1
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.webp', '.bmp', '.gif')
+
+
+def _require_pil():
+    try:
+        from PIL import Image
+    except ImportError:
+        raise RuntimeError("Pillow is required to build card assets (pip install Pillow)") from None
+    return Image
+
+def _stamp(filename):
+    st = os.stat(filename)
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+def _process(job):
+    """
+    Worker: scale, trim, and mask one source. Writes one PNG per level
+    into the job's work directory and returns the manifest entry (without
+    atlas ids).
+    """
+    Image = _require_pil()
+    filename, work, card_size, lod_levels, mask_scale, threshold = job
+    work = pathlib.Path(work)
+    if work.exists():
+        shutil.rmtree(work)
+    work.mkdir(parents=True)
+    cw, ch = card_size
+    with Image.open(filename) as im:
+        image = im.convert('RGBA')
+
+    levels = []
+    for level in range(lod_levels + 1):
+        k = 2 ** level
+        w, h = max(1, round(cw / k)), max(1, round(ch / k))
+        scaled = image.resize((w, h), Image.LANCZOS, reducing_gap=3.0)
+        # Box of non-transparent pixels, y from the bottom as Kivy expects
+        left, top, right, bottom = scaled.getchannel('A').getbbox() or (0, 0, 1, 1)
+        scaled.crop((left, top, right, bottom)).save(work / f"{level}.png")
+        levels.append(dict(
+            size=[right - left, bottom - top],
+            box=[left / w, (h - bottom) / h, (right - left) / w, (bottom - top) / h],
+        ))
+
+    mw, mh = max(1, round(cw / mask_scale)), max(1, round(ch / mask_scale))
+    alpha = image.getchannel('A').resize((mw, mh), Image.BOX)
+    mask = alpha.point(lambda a: 255 if a > threshold else 0).convert('1')
+    return dict(levels=levels, mask=dict(size=[mw, mh], bits=base64.b64encode(mask.tobytes()).decode('ascii')))
+
+def _pack(images, page_size, padding):
+    """
+    Shelf-pack `(id, (w, h))` items, tallest first. Returns a list of
+    pages, each `[(id, x, y), ...]` with y from the top of the page.
+    """
+    pages, page = [], None
+    x = y = shelf = 0
+    for uid, (w, h) in sorted(images, key=lambda item: (-item[1][1], item[0])):
+        w, h = w + 2 * padding, h + 2 * padding
+        if x and x + w > page_size:
+            x, y, shelf = 0, y + shelf, 0
+        if page is None or (page and y + h > page_size):
+            page, x, y, shelf = [], 0, 0, 0
+            pages.append(page)
+        page.append((uid, x + padding, y + padding))
+        x += w
+        shelf = max(shelf, h)
+    return pages
+
+def _write_atlas(out, name, sources, work, page_size, padding):
+    Image = _require_pil()
+    files = {}
+    for key, entry in sources.items():
+        for level, info in enumerate(entry['levels']):
+            files[info['id']] = (work / entry['digest'] / f"{level}.png", info['size'])
+    for old in out.glob(f"{name}-*.png"):
+        old.unlink()
+
+    meta = {}
+    pages = _pack([ (uid, size) for uid, (path, size) in files.items() ], page_size, padding)
+    for n, page in enumerate(pages):
+        width = max(x + files[uid][1][0] + padding for uid, x, y in page)
+        height = max(y + files[uid][1][1] + padding for uid, x, y in page)
+        canvas = Image.new('RGBA', (width, height))
+        coords = meta[f"{name}-{n}.png"] = {}
+        for uid, x, y in page:
+            w, h = files[uid][1]
+            with Image.open(files[uid][0]) as im:
+                canvas.paste(im, (x, y))
+                if padding:
+                    # Repeat edge pixels so that filtering does not bleed in neighbours
+                    canvas.paste(im.crop((0, 0, w, 1)), (x, y - 1))
+                    canvas.paste(im.crop((0, h - 1, w, h)), (x, y + h))
+                    canvas.paste(im.crop((0, 0, 1, h)), (x - 1, y))
+                    canvas.paste(im.crop((w - 1, 0, w, h)), (x + w, y))
+            coords[uid] = [x, height - y - h, w, h]
+        canvas.save(out / f"{name}-{n}.png")
+    with open(out / f"{name}.atlas", 'w') as fh:
+        json.dump(meta, fh, indent=1, sort_keys=True)
+    return len(pages)
+
+def build(sources, output, card_size, name="cards", root=None, lod_levels=2,
+          mask_scale=4, alpha_threshold=50, page_size=2048, padding=2, jobs=None,
+          force=False, log=None):
+    """
+    Build (or update) the manifest `output/<name>.json` and its atlas.
+
+    :param sources: Image files or directories (searched recursively).
+
+    :param root: Directory which manifest keys are relative to, default
+    the current directory. Widgets should use the same relative paths as
+    card sources.
+
+    :param mask_scale: Hit masks have one bit per `mask_scale` pixels in
+    each direction at the full card size.
+
+    :param alpha_threshold: Pixels with greater alpha are hits (the same
+    threshold as `CardFan.card_at_point()`).
+
+    :param jobs: Worker processes (default: number of CPUs).
+
+    Returns `(processed, total)` source counts.
+    """
+    _require_pil()
+    out = pathlib.Path(output)
+    out.mkdir(parents=True, exist_ok=True)
+    work = out / f".{name}-work"
+    root = os.path.abspath(root or os.curdir)
+    settings = dict(card_size=[int(card_size[0]), int(card_size[1])], lod_levels=lod_levels,
+                    mask_scale=mask_scale, alpha_threshold=alpha_threshold)
+
+    filenames = []
+    for src in sources:
+        if os.path.isdir(src):
+            filenames.extend(sorted(str(p) for p in pathlib.Path(src).rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES))
+        else:
+            filenames.append(src)
+    keys = { os.path.relpath(os.path.abspath(f), root).replace(os.sep, '/'): f for f in filenames }
+
+    manifest_file = out / f"{name}.json"
+    old = {}
+    if manifest_file.exists() and not force:
+        with open(manifest_file) as fh:
+            manifest = json.load(fh)
+        if manifest.get('version') == MANIFEST_VERSION and manifest.get('settings') == settings:
+            old = manifest['sources']
+
+    entries, todo = {}, []
+    for key, filename in keys.items():
+        stamp = _stamp(filename)
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        entry = old.get(key)
+        if entry is not None and entry['stamp'] == stamp and (work / digest).is_dir():
+            entries[key] = entry
+        else:
+            entries[key] = dict(stamp=stamp, digest=digest)
+            todo.append((key, (filename, str(work / digest), settings['card_size'], lod_levels, mask_scale, alpha_threshold)))
+
+    if todo:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+            for (key, job), result in zip(todo, pool.map(_process, [ job for key, job in todo ])):
+                entries[key].update(result)
+                if log:
+                    log(f"processed {key}")
+
+    # Drop work directories of removed sources
+    live = { entry['digest'] for entry in entries.values() }
+    if work.is_dir():
+        for path in work.iterdir():
+            if path.name not in live:
+                shutil.rmtree(path)
+
+    atlas = out / f"{name}.atlas"
+    if todo or set(old) != set(entries) or not atlas.exists():
+        for entry in entries.values():
+            for level, info in enumerate(entry['levels']):
+                info['id'] = f"{entry['digest']}-{level}"
+        _write_atlas(out, name, entries, work, page_size, padding)
+        manifest = dict(version=MANIFEST_VERSION, settings=settings, atlas=atlas.name, sources=entries)
+        tmp = manifest_file.with_suffix('.tmp')
+        with open(tmp, 'w') as fh:
+            json.dump(manifest, fh, indent=1, sort_keys=True)
+        os.replace(tmp, manifest_file)
+    return len(todo), len(entries)
+
+
+def _size(text):
+    w, _, h = text.lower().partition('x')
+    return (int(w), int(h))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('sources', nargs='+', help="image files or directories")
+    parser.add_argument('-o', '--output', required=True, help="output directory")
+    parser.add_argument('--card-size', type=_size, required=True, metavar="WxH", help="full card size in pixels (CardFan card_size)")
+    parser.add_argument('--name', default="cards", help="manifest and atlas base name (default: cards)")
+    parser.add_argument('--root', help="directory manifest keys are relative to (default: current directory)")
+    parser.add_argument('--lod-levels', type=int, default=2, help="levels of detail below full size (default: 2)")
+    parser.add_argument('--mask-scale', type=int, default=4, help="hit mask pixels per bit (default: 4)")
+    parser.add_argument('--alpha-threshold', type=int, default=50, help="minimum alpha of a hit (default: 50)")
+    parser.add_argument('--page-size', type=int, default=2048, help="atlas page size (default: 2048)")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="reprocess every source")
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    try:
+        processed, total = build(
+            args.sources, args.output, args.card_size, name=args.name, root=args.root,
+            lod_levels=args.lod_levels, mask_scale=args.mask_scale, alpha_threshold=args.alpha_threshold,
+            page_size=args.page_size, jobs=args.jobs, force=args.force,
+            log=print if args.verbose else None,
+        )
+    except (RuntimeError, OSError) as err:
+        print(err, file=sys.stderr)
+        return 1
+    print(f"{processed} of {total} sources processed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Card images preprocessed by `amethyst_ttkvlib.assetbuild`.
+"""
+# SPDX-License-Identifier: GPL-3.0
+__all__ = '''
+CardAssets
+'''.split()
+
+import base64
+import json
+import os
+import pathlib
+
+from kivy.atlas import Atlas
+
+from amethyst_ttkvlib.assetbuild import MANIFEST_VERSION
+
+
+class CardAssets(object):
+    """
+    Loads a manifest written by `amethyst_ttkvlib.assetbuild` and serves
+    the pre-scaled card textures from its atlas pages.
+
+    Usable anywhere a `TextureCache` is: assign it to `CardImage.texture_cache`
+    (or return it from the app's `texture_cache`). `get()` picks the
+    smallest level of detail at least as large as the requested size. Card
+    images are trimmed of transparent borders, `face_box()` gives the part
+    of the card the trimmed texture covers, and `hit()` tests the alpha
+    hit mask so that CardFan does not have to render cards to find which
+    one was touched.
+
+        assets = CardAssets("build/cards/cards.json")
+        widget = CardImage(source="art/card-1.png", texture_cache=assets)
+
+    Sources are looked up by the paths (relative to the build `root`)
+    given to the pipeline; other paths are made relative to `root`
+    (default: the current directory) before lookup.
+    """
+    def __init__(self, path, root=None):
+        self.path = pathlib.Path(path)
+        self.root = os.path.abspath(root or os.curdir)
+        with open(self.path) as fh:
+            manifest = json.load(fh)
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported card asset manifest version {manifest.get('version')!r}")
+        self.card_size = tuple(manifest['settings']['card_size'])
+        self.lod_levels = manifest['settings']['lod_levels']
+        self.sources = manifest['sources']
+        self.atlas = Atlas(str(self.path.parent / manifest['atlas']))
+        self._masks = {}
+
+    def entry(self, source):
+        """Manifest entry of `source` or None."""
+        if not source:
+            return None
+        entry = self.sources.get(source)
+        if entry is None:
+            key = os.path.relpath(os.path.abspath(source), self.root).replace(os.sep, '/')
+            entry = self.sources.get(key)
+        return entry
+
+    def level(self, size):
+        """Level of detail used for textures displayed at `size`."""
+        level = 0
+        w, h = self.card_size
+        while level < self.lod_levels and w / 2 >= size[0] and h / 2 >= size[1]:
+            w, h = w / 2, h / 2
+            level += 1
+        return level
+
+    def get(self, source, size):
+        """
+        Returns the (trimmed) texture of `source` for display at `size`,
+        or None if the source is not in the manifest.
+        """
+        entry = self.entry(source)
+        if entry is None or size[0] < 1 or size[1] < 1:
+            return None
+        return self.atlas[entry['levels'][self.level(size)]['id']]
+
+    def face_box(self, source, size):
+        """
+        Part of the card covered by the texture `get(source, size)` as
+        fractions `[x, y, width, height]` of the card size, or None if the
+        source is not in the manifest.
+        """
+        entry = self.entry(source)
+        if entry is None:
+            return None
+        return entry['levels'][self.level(size)]['box']
+
+    def hit(self, source, u, v):
+        """
+        True if the point at fractions `(u, v)` of the card (from the
+        bottom left) is opaque in the hit mask of `source`. None if the
+        source is not in the manifest.
+        """
+        entry = self.entry(source)
+        if entry is None:
+            return None
+        if not (0 <= u < 1 and 0 <= v < 1):
+            return False
+        mask = self._masks.get(entry['digest'])
+        if mask is None:
+            mask = self._masks[entry['digest']] = base64.b64decode(entry['mask']['bits'])
+        w, h = entry['mask']['size']
+        # Mask rows start at the top; v == 0 is the bottom edge of the last row
+        col, row = min(w - 1, int(u * w)), min(h - 1, int((1 - v) * h))
+        stride = (w + 7) // 8
+        return bool(mask[row * stride + col // 8] & (0x80 >> (col % 8)))
+
+    def clear(self):
+        """Drop decoded hit masks. Atlas textures stay loaded."""
+        self._masks.clear()
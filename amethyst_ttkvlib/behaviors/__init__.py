@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+"""
+Behaviors are registered with the kivy Factory here, but their modules are
+only imported on first Factory lookup or first attribute access.
+"""
+import importlib
+
+from kivy.factory import Factory
+
+_MODULES = {
+    'PlayerSlateBehavior':    'amethyst_ttkvlib.behaviors.slate',
+    'SlateSubwidgetBehavior': 'amethyst_ttkvlib.behaviors.slate',
+    'ToastBehavior':          'amethyst_ttkvlib.behaviors.toast',
+}
+__all__ = list(_MODULES)
+
+for _name, _module in _MODULES.items():
+    Factory.register(_name, module=_module)
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
@@ -15,6 +15,8 @@ from kivy.factory import Factory
 
 from amethyst_games import NoticeType
 
+from amethyst_ttkvlib import trace
+
 
 class PlayerSlateBehavior(object):
     """
@@ -82,7 +84,15 @@ class PlayerSlateBehavior(object):
             else:
                 cb = getattr(self, f"on_{self.notice_dispatchers[notice.type]}_{notice.name}", None)
             if cb and callable(cb):
-                cb(game, player_num, notice.data)
+                tracer = trace.tracer
+                if tracer is None:
+                    cb(game, player_num, notice.data)
+                else:
+                    start = tracer.now()
+                    try:
+                        cb(game, player_num, notice.data)
+                    finally:
+                        tracer.add(cb.__name__, "notice", start, args=dict(seq=seq, player_num=player_num))
 
 
 
@@ -106,7 +116,8 @@ class SlateSubwidgetBehavior(object):
         while parent is not None:
             if isinstance(parent, SlateSubwidgetBehavior):
                 return getattr(parent, 'slate', None)
-            parent = getattr(parent, 'parent', None)
+            p = getattr(parent, 'parent', None)
+            parent = None if p is parent else p  # Window is its own parent
         return None
     slate = Factory.AliasProperty(_find_slate, bind=['parent'], rebind=True, cache=True)
 
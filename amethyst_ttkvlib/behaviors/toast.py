@@ -6,53 +6,178 @@
 __all__ = ['ToastBehavior']
 
 import collections
-import threading
-import time
+import heapq
+import itertools
 
 from kivy.clock import Clock
 from kivy.factory import Factory
 
+
+class ToastEntry(object):
+    """
+    Internal object for a queued or visible toast.
+    """
+    __slots__ = ('severity', 'msg', 'timeout', 'count', 'order')
+    def __init__(self, severity, msg, timeout, order):
+        self.severity = severity
+        self.msg = msg
+        self.timeout = timeout
+        self.count = 1
+        self.order = order
+
+    @property
+    def key(self):
+        return (self.severity, self.msg)
+
+
 class ToastBehavior(object):
+    """
+    Queue of short messages ("toasts") displayed one at a time via the
+    `errstr` property.
+
+    Toasts are shown highest severity first, then in order received.
+    Repeats of a queued or visible message are merged and displayed with a
+    counter ("x12") rather than queued again. At most one new toast of
+    each severity is shown per `toast_intervals[severity]` seconds.
+
+    `toast()`, `error()`, and `warning()` may be called from any thread;
+    the message is handed off to the main thread without locking.
+
+    :ivar errstr: Markup of the currently visible toast, or ''.
+
+    :ivar errtime: Time (as given by `Clock.time()`) at which the visible
+    toast expires or 0 if it remains until `pop_toast()` is called.
+
+    :cvar toast_priorities: Dictionary mapping severity to display
+    priority. Higher priority toasts are shown first.
+
+    :cvar toast_intervals: Dictionary mapping severity to minimum time
+    (seconds) between showing two toasts of that severity.
+
+    :cvar toast_colors: Dictionary mapping severity to markup color.
+
+    :cvar toast_limit: Maximum number of queued toasts. When exceeded, the
+    lowest priority, oldest toast is dropped.
+    """
     errstr = Factory.StringProperty()
     errtime = Factory.NumericProperty()
 
+    toast_priorities = { 'error': 30, 'warning': 20, 'info': 10 }
+    toast_intervals = { 'error': 0.5, 'warning': 1, 'info': 1 }
+    toast_colors = { 'error': '#f44336', 'warning': '#ffc107' }
+    toast_limit = 20
+
     def __init__(self, *args, **kwargs):
-        self.toastlock = threading.RLock()
-        self.toastjournal = collections.deque(maxlen=5)
+        self.toastinbox = collections.deque()
+        self.toastqueue = []        # heap of (-priority, order, key)
+        self.toastpending = {}      # key -> ToastEntry
+        self.toastcurrent = None
+        self.toastshown = {}        # severity -> time last shown
         self.toastclock = None
+        self._toast_order = itertools.count()
+        self._toast_trigger = Clock.create_trigger(self._drain_toasts)
         super().__init__(*args, **kwargs)
 
-    def _update_toast(self, *args):
-        with self.toastlock:
-            if self.toastclock:
-                self.toastclock.cancel()
-                self.toastclock = None
-            now = time.time()
-            if not self.errstr or (self.errtime and now > self.errtime):
-                self.pop_toast()
-            if self.errstr and self.errtime and now < self.errtime:
-                self.toastclock = Clock.schedule_once(self._update_toast, self.errtime - now)
+    def toast(self, msg, timeout=None, severity='info'):
+        """
+        Queue a message. If `timeout` is None, the message remains visible
+        until `pop_toast()` is called.
+        """
+        # deque.append is atomic and triggering a clock event is thread
+        # safe, so any thread may call this.
+        self.toastinbox.append( (severity, msg, timeout) )
+        self._toast_trigger()
+
+    def error(self, msg, timeout=None):
+        self.toast(msg, timeout, 'error')
+    def warning(self, msg, timeout=None):
+        self.toast(msg, timeout, 'warning')
 
     def pop_toast(self):
-        with self.toastlock:
-            if self.toastjournal:
-                self.errstr, self.errtime = self.toastjournal.popleft()
-                if self.errtime:
-                    self.errtime += time.time()
-                self._update_toast()
+        """
+        Hide the visible toast and show the next queued toast (subject to
+        rate limits).
+        """
+        self.toastcurrent = None
+        self._update_toast()
+
+    def format_toast(self, entry):
+        msg = entry.msg
+        if entry.count > 1:
+            msg = f"{msg} x{entry.count}"
+        color = self.toast_colors.get(entry.severity)
+        if color:
+            msg = f'[color={color}]{msg}[/color]'
+        return msg
+
+    def _drain_toasts(self, *args):
+        current = self.toastcurrent
+        refresh = False
+        while self.toastinbox:
+            severity, msg, timeout = self.toastinbox.popleft()
+            key = (severity, msg)
+            if current is not None and current.key == key:
+                current.count += 1
+                if timeout and self.errtime:
+                    self.errtime = max(self.errtime, Clock.time() + timeout)
+                refresh = True
+            elif key in self.toastpending:
+                entry = self.toastpending[key]
+                entry.count += 1
+                entry.timeout = timeout
             else:
-                self.errstr, self.errtime = '', 0
-                if self.toastclock:
-                    self.toastclock.cancel()
-                    self.toastclock = None
+                entry = ToastEntry(severity, msg, timeout, next(self._toast_order))
+                self.toastpending[key] = entry
+                heapq.heappush(self.toastqueue, (-self.toast_priorities.get(severity, 0), entry.order, key))
 
-    def toast(self, msg, timeout=None):
-        with self.toastlock:
-            self.toastjournal.append( (msg, timeout) )
-            if not self.toastclock:
-                self._update_toast()
+        if len(self.toastpending) > self.toast_limit:
+            # Drop lowest priority, then oldest toasts
+            keep = heapq.nsmallest(self.toast_limit, self.toastqueue)
+            for item in set(self.toastqueue) - set(keep):
+                self.toastpending.pop(item[2], None)
+            self.toastqueue = keep
+            heapq.heapify(self.toastqueue)
 
-    def error(self, msg, timeout=None):
-        self.toast(f'[color=#f44336]{msg}[/color]', timeout)
-    def warning(self, msg, timeout=None):
-        self.toast(f'[color=#ffc107]{msg}[/color]', timeout)
+        if refresh:
+            self.errstr = self.format_toast(current)
+        self._update_toast()
+
+    def _update_toast(self, *args):
+        if self.toastclock:
+            self.toastclock.cancel()
+            self.toastclock = None
+
+        now = Clock.time()
+        if self.toastcurrent is not None and self.errtime and now >= self.errtime:
+            self.toastcurrent = None
+
+        wake = None
+        if self.toastcurrent is None:
+            deferred = []
+            while self.toastqueue:
+                item = heapq.heappop(self.toastqueue)
+                entry = self.toastpending[item[2]]
+                ready = self.toastshown.get(entry.severity, 0) + self.toast_intervals.get(entry.severity, 0)
+                if ready > now:
+                    deferred.append(item)
+                    wake = ready if wake is None else min(wake, ready)
+                    continue
+                del self.toastpending[item[2]]
+                self.toastshown[entry.severity] = now
+                self.toastcurrent = entry
+                break
+            for item in deferred:
+                heapq.heappush(self.toastqueue, item)
+
+            if self.toastcurrent is None:
+                self.errstr, self.errtime = '', 0
+            else:
+                self.errstr = self.format_toast(self.toastcurrent)
+                self.errtime = (now + self.toastcurrent.timeout) if self.toastcurrent.timeout else 0
+
+        if self.toastcurrent is not None and self.errtime:
+            wake = self.errtime if wake is None else min(wake, self.errtime)
+        if self.toastcurrent is not None and not self.errtime:
+            wake = None     # Sticky toast, nothing happens until pop_toast()
+        if wake is not None:
+            self.toastclock = Clock.schedule_once(self._update_toast, max(0, wake - now))
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Virtual time for deterministic tests and benchmarks.
+
+All timed behavior in this library (CardFan animations and long presses,
+toast expiration, snapshot and journal timers) runs on Kivy's `Clock`
+and reads time through `Clock.time()` / `Clock.get_time()`. Installing a
+`VirtualClock` replaces that time source with one which only moves when
+stepped, so a test can run seconds of animation in microseconds:
+
+    with VirtualClock() as vclock:
+        fan.insert(0, card)
+        vclock.advance(2)       # Every animation has now completed
+"""
+# SPDX-License-Identifier: GPL-3.0
+__all__ = '''
+VirtualClock
+'''.split()
+
+import functools
+
+from kivy.base import EventLoop
+from kivy.clock import Clock
+
+
+def _shifted(time, offset):
+    return time() + offset
+
+
+class VirtualClock(object):
+    """
+    Time source for Kivy's `Clock` which only advances when stepped.
+    Virtual time starts at the current clock time so that events already
+    scheduled keep their relative deadlines.
+
+    :ivar now: Current virtual time in seconds.
+
+    :ivar frame_time: Length of one frame in seconds (default 1/60).
+    `advance()` ticks the clock once per frame so that animations pass
+    through the same intermediate steps as in real time.
+    """
+    def __init__(self, frame_time=1/60):
+        self.frame_time = frame_time
+        self.now = None
+        self._saved = None
+
+    @property
+    def installed(self):
+        return self._saved is not None
+
+    def time(self):
+        return self.now
+
+    def install(self):
+        """Make this the time source of Kivy's Clock."""
+        if self.installed:
+            return self
+        self._saved = (Clock.time, Clock._max_fps)
+        self.now = Clock.time()
+        Clock.time = self.time
+        Clock._max_fps = 0      # Frame limiting would wait on real time
+        return self
+
+    def uninstall(self):
+        """
+        Restore the previous time source. Real time is shifted by however
+        far virtual time ran ahead, so clock time never goes backwards and
+        pending events keep their remaining delays.
+        """
+        if not self.installed:
+            return
+        time, max_fps = self._saved
+        self._saved = None
+        offset = self.now - time()
+        if offset > 0:
+            if isinstance(time, functools.partial) and time.func is _shifted:
+                # Shifted by an earlier virtual clock: add to its offset
+                # rather than wrap it again
+                time, offset = time.args[0], time.args[1] + offset
+            Clock.time = functools.partial(_shifted, time, offset)
+        else:
+            Clock.time = time
+        Clock._max_fps = max_fps
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+    def step(self, frames=1):
+        """Advance by whole frames, ticking the clock once per frame."""
+        for i in range(frames):
+            self.now += self.frame_time
+            self._tick()
+
+    def advance(self, seconds):
+        """
+        Advance virtual time by `seconds`, one frame at a time. The last
+        frame is shortened so that time advances by exactly `seconds`.
+        """
+        end = self.now + seconds
+        while self.now < end:
+            self.now = min(end, self.now + self.frame_time)
+            self._tick()
+
+    def advance_until(self, condition, timeout=60):
+        """
+        Step frames until `condition()` is true. Returns False if it is
+        still false after `timeout` seconds of virtual time.
+        """
+        end = self.now + timeout
+        while not condition():
+            if self.now >= end:
+                return False
+            self.step()
+        return True
+
+    def _tick(self):
+        if EventLoop.status == 'started':
+            EventLoop.idle()    # Also dispatches input and draws the window
+        else:
+            Clock.tick()
+            Clock.tick_draw()
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Append-only game notice journal and a replay driver which feeds a journal
+back through a `PlayerSlateBehavior.dispatch_notice()`.
+"""
+# SPDX-License-Identifier: GPL-3.0
+__all__ = '''
+NoticeJournal
+NoticeReplay
+'''.split()
+
+import json
+import pathlib
+import queue
+import threading
+
+from kivy.clock import Clock
+from kivy.factory import Factory
+from kivy.logger import Logger
+
+from amethyst.core import amethyst_deflate, amethyst_inflate
+
+import amethyst_ttkvlib.widgets     # noqa: F401, registers CardFan
+
+
+class NoticeJournal(object):
+    """
+    Append-only journal of game notices stored as one JSON record per
+    line. Notices are deflated when recorded, but encoding and file
+    writes happen on a background thread so that recording is cheap
+    enough to do from an observer callback.
+
+        journal = app.notice_journal("game-1234.journal")
+        journal.observe(game, player_num)
+        ...
+        journal.close()
+
+    Iterating over a journal yields `(seq, player_num, notice)` tuples
+    from the file on disk (call `flush()` first to include everything
+    recorded so far).
+    """
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._observer = None
+
+    def observe(self, game, player_num=None):
+        """
+        Record all notices sent by `game` to `player_num`. Replaces any
+        previous observation.
+        """
+        self.unobserve()
+        self._observer = (player_num, game)
+        game.observe(player_num, self.record)
+
+    def unobserve(self):
+        if self._observer:
+            self._observer[1].unobserve(self._observer[0], self.record)
+            self._observer = None
+
+    def record(self, game, seq, player_num, notice):
+        """
+        Append a notice to the journal. The signature matches
+        `dispatch_notice()` so that it may be used as a game observer.
+        """
+        self._queue.put(dict(seq=seq, player_num=player_num, notice=amethyst_deflate(notice)))
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._writer, name="NoticeJournal", daemon=True)
+                    self._thread.start()
+
+    def _writer(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as fh:
+            while True:
+                item = self._queue.get()
+                try:
+                    if item is None:
+                        return
+                    fh.write(json.dumps(item, separators=(',', ':')) + "\n")
+                    if self._queue.empty():
+                        fh.flush()
+                except Exception:
+                    # Drop the notice, keep the writer (and flush()) alive
+                    Logger.exception(f"NoticeJournal: Could not write notice {item.get('seq')} to {self.path}")
+                finally:
+                    self._queue.task_done()
+
+    def flush(self):
+        """Block until all recorded notices have been written."""
+        self._queue.join()
+
+    def close(self):
+        """Stop observing, write any pending notices, and stop the writer thread."""
+        self.unobserve()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def __iter__(self):
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    break   # Partial final line from an interrupted write
+                yield item['seq'], item['player_num'], amethyst_inflate(item['notice'])
+
+
+class NoticeReplay(object):
+    """
+    Replay a journal (or any iterable of `(seq, player_num, notice)`
+    tuples) through the `dispatch_notice()` method of `target`, typically
+    a `Slate` or the `App`.
+
+    During `fast_forward()`, every CardFan found under `widget` (defaults
+    to `target`, or `target.root` when target is an App) has its
+    `fast_forward` property set so that changes are applied without
+    animation and without intermediate redraws. The widget tree is
+    searched again after each batch, so fans created by the replay are
+    fast-forwarded too. Once the live edge is reached, the fans redraw
+    once and resume normal animation.
+
+    :ivar batch: Number of notices to dispatch per frame while fast-forwarding.
+    """
+    batch = 250
+
+    def __init__(self, journal, target, game=None, widget=None, batch=None):
+        self.target = target
+        self.game = game
+        self.widget = widget
+        if batch is not None:
+            self.batch = batch
+        self.seq = None
+        self._notices = iter(journal)
+        self._pending = None
+        self._event = None
+        self._fans = set()
+        self._on_complete = None
+
+    @property
+    def running(self):
+        return self._event is not None
+
+    def step(self, until=None):
+        """
+        Dispatch the next notice. If `until` is given, notices with `seq >
+        until` are left in place. Returns False when nothing was dispatched.
+        """
+        if self._pending is None:
+            self._pending = next(self._notices, None)
+        if self._pending is None:
+            return False
+        seq, player_num, notice = self._pending
+        if until is not None and seq > until:
+            return False
+        self._pending = None
+        self.seq = seq
+        self.target.dispatch_notice(self.game, seq, player_num, notice)
+        return True
+
+    def fast_forward(self, until=None, on_complete=None):
+        """
+        Dispatch notices up to the live edge (or up to `seq == until`), a
+        `batch` at a time per frame. `on_complete` will be called with
+        this replay object once finished.
+        """
+        self.stop()
+        self._on_complete = on_complete
+        self._hold_fans()
+        self._event = Clock.schedule_interval(lambda dt: self._fast_forward_batch(until), 0)
+
+    def _fast_forward_batch(self, until):
+        for _ in range(self.batch):
+            if not self.step(until):
+                self._finish()
+                return False
+        # The batch may have created fans. They only redraw from a Clock
+        # trigger, so holding them before the next frame is soon enough.
+        self._hold_fans()
+
+    def _hold_fans(self):
+        for fan in self._find_fans():
+            if fan not in self._fans:
+                fan.fast_forward = True
+                self._fans.add(fan)
+
+    def play(self, interval=0.5, until=None, on_complete=None):
+        """
+        Dispatch one notice every `interval` seconds with normal animations.
+        """
+        self.stop()
+        self._on_complete = on_complete
+
+        def _play(dt):
+            if not self.step(until):
+                self._finish()
+                return False
+        self._event = Clock.schedule_interval(_play, interval)
+
+    def stop(self):
+        """Pause replay, leaving all dispatched notices in place."""
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        fans, self._fans = self._fans, set()
+        # Fans may have been created by content swaps during the replay
+        for fan in fans | set(self._find_fans()):
+            fan.fast_forward = False
+
+    def _finish(self):
+        cb, self._on_complete = self._on_complete, None
+        self.stop()
+        if cb is not None:
+            cb(self)
+
+    def _find_fans(self):
+        widget = self.widget
+        if widget is None:
+            widget = getattr(self.target, 'root', self.target)
+        if widget is None or not hasattr(widget, 'walk'):
+            return
+        CardFan = Factory.CardFan
+        for w in widget.walk(restrict=True):
+            if isinstance(w, CardFan):
+                yield w
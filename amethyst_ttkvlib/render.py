@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Offscreen batch rendering of card fans and slates to PNG files.
+"""
+# SPDX-License-Identifier: GPL-3.0
+__all__ = '''
+BatchRenderer
+encode_png
+'''.split()
+
+import queue
+import struct
+import threading
+import zlib
+
+from kivy.factory import Factory
+from kivy.lang import Builder
+import kivy.graphics
+
+from amethyst_ttkvlib.snapshot import FAN_MAGIC, SLATE_MAGIC, load_fan, load_slate
+from amethyst_ttkvlib.widgets.cardfan import CardFan, CardImage
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+class BatchRenderer(object):
+    """
+    Render many states of one widget tree (a CardFan, a Slate, or any
+    layout containing fans) into an Fbo and write each to a PNG file.
+
+    The widget tree, its recycled card widgets and their textures are
+    reused from one render to the next; only the card data changes.
+    Nothing waits for the Kivy clock: pending layouts, fan redraws and
+    face loads are applied directly before drawing, and cards are placed
+    without animation. PNG encoding and file writes happen on `writers`
+    background threads, fed through a queue of `queue_size` frames, so
+    rendering only blocks when the writers fall behind.
+
+        with BatchRenderer(CardFan(), size=(800, 300)) as renderer:
+            for i, hand in enumerate(hands):
+                renderer.render(f"hand-{i:05d}.png", cards=hand)
+
+    A GL context is required, but no visible window: scripts may set
+    `Config.set('graphics', 'window_state', 'hidden')` before creating
+    the renderer.
+
+    :param widget: Root widget, must not have a parent. Its size is set
+    to `size`.
+
+    :param texture_cache: Optional `TextureCache` (or `CardAssets`) set on
+    every CardImage which has none.
+
+    :param compress_level: zlib level of the PNG files (default 1, fast).
+
+    :ivar rendered: Number of frames rendered so far.
+    """
+    def __init__(self, widget, size, texture_cache=None, background=(0, 0, 0, 0),
+                 writers=2, queue_size=32, compress_level=1):
+        if widget.parent is not None:
+            raise ValueError("BatchRenderer widget must not have a parent")
+        self.widget = widget
+        self.size = (int(size[0]), int(size[1]))
+        self.texture_cache = texture_cache
+        self.compress_level = compress_level
+        self.rendered = 0
+        widget.size_hint = (None, None)
+        widget.pos = (0, 0)
+        widget.size = self.size
+
+        self.fbo = kivy.graphics.Fbo(size=self.size, with_stencilbuffer=True)
+        with self.fbo:
+            kivy.graphics.ClearColor(*background)
+            kivy.graphics.ClearBuffers()
+        self.fbo.add(widget.canvas)
+
+        self._error = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = [ threading.Thread(target=self._write_loop, daemon=True) for i in range(writers) ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def render(self, filename, cards=None, lifted_cards=(), snapshot=None, fans=None):
+        """
+        Apply a state to the widget tree and queue a PNG of it for writing
+        to `filename`.
+
+        :param cards: Card data for the root widget, which must be a
+        CardFan. Placed with `CardFan.restore()`, with `lifted_cards`.
+
+        :param snapshot: Blob from `dump_fan()` or `dump_slate()`, loaded
+        into the root widget first.
+
+        :param fans: Mapping of CardFan widgets in the tree to their cards,
+        or to `(cards, lifted_cards)`.
+        """
+        self._check()
+        if snapshot is not None:
+            if snapshot[:len(SLATE_MAGIC)] == SLATE_MAGIC:
+                load_slate(self.widget, snapshot)
+            elif snapshot[:len(FAN_MAGIC)] == FAN_MAGIC:
+                load_fan(self.widget, snapshot)
+            else:
+                raise ValueError("Unknown snapshot")
+        if cards is not None:
+            self.widget.restore(cards, lifted_cards)
+        for fan, state in (fans or {}).items():
+            if isinstance(state, tuple):
+                fan.restore(*state)
+            else:
+                fan.restore(state)
+
+        self.flush()
+        self.fbo.draw()
+        self._queue.put((filename, self.fbo.pixels))
+        self.rendered += 1
+
+    def flush(self, widget=None):
+        """
+        Apply pending layouts, fan redraws, and face loads in `widget`
+        (default: the root) and its children, parents first, then the
+        canvas expressions of kv rules which the event loop would apply
+        before the next frame.
+        """
+        stack = [ self.widget if widget is None else widget ]
+        while stack:
+            w = stack.pop()
+            if isinstance(w, CardFan):
+                w.settle()
+            elif isinstance(w, CardImage):
+                if w.texture_cache is None and self.texture_cache is not None:
+                    w.texture_cache = self.texture_cache
+                w.settle()
+            elif isinstance(w, Factory.Layout):
+                w.do_layout()
+            stack.extend(w.children)
+        Builder.sync()
+
+    def close(self):
+        """Wait for queued frames to be written and stop the writers."""
+        if self.fbo is None:
+            return
+        for thread in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.fbo.remove(self.widget.canvas)
+        self.fbo = None
+        self._check()
+
+    def _check(self):
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+    def _write_loop(self):
+        w, h = self.size
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            filename, pixels = item
+            try:
+                with open(filename, 'wb') as fh:
+                    fh.write(encode_png(w, h, pixels, self.compress_level))
+            except Exception as err:
+                self._error = err
+
+
+def encode_png(width, height, pixels, level=1):
+    """
+    PNG file contents for `width` x `height` RGBA `pixels` stored bottom
+    row first (as read from an Fbo).
+    """
+    stride = 4 * width
+    view = memoryview(pixels)
+    rows = []
+    for y in range(height - 1, -1, -1):
+        rows.append(b'\x00')    # Filter: none
+        rows.append(view[y * stride:(y + 1) * stride])
+    data = zlib.compress(b''.join(rows), level)
+
+    def chunk(kind, body):
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+    return b''.join((
+        PNG_SIGNATURE,
+        chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)),
+        chunk(b'IDAT', data),
+        chunk(b'IEND', b''),
+    ))
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Compact snapshots of CardFan and Slate state for fast resume.
+"""
+# SPDX-License-Identifier: GPL-3.0
+__all__ = '''
+SnapshotStore
+dump_fan
+dump_slate
+load_fan
+load_slate
+'''.split()
+
+import array
+import hashlib
+import os
+import pathlib
+import pickle
+import struct
+
+from kivy.clock import Clock
+from kivy.factory import Factory
+
+from amethyst.core.util import get_class
+
+import amethyst_ttkvlib.widgets     # noqa: F401, registers CardFan and Slate
+
+
+FAN_HEADER = struct.Struct('<4sIII8sdddd')
+FAN_MAGIC = b'TTF2'
+SLATE_MAGIC = b'TTS1'
+
+
+def _layout_digest(fan):
+    # Layout inputs of the stored targets, which are only reused when the
+    # restored fan matches
+    layout = fan.current_layout
+    key = (tuple(fan.size), tuple(fan.card_size), fan.spacing, fan.lift, fan.min_radius, fan.max_angle,
+           fan.true_center, _class_name(type(layout)), sorted((name, getattr(layout, name)) for name in layout.properties()))
+    return hashlib.sha1(repr(key).encode('utf-8')).digest()[:8]
+
+def dump_fan(fan):
+    """
+    Snapshot a CardFan's cards, lifted cards, and target positions.
+
+    Card data is pickled, so must be picklable. Targets are only included
+    if the fan has been drawn since the cards last changed, and are only
+    reused by a fan with the same size and layout settings.
+    """
+    cards = list(fan.cards)
+    targets = array.array('d')
+    for data in cards:
+        state = fan._by_data.get(id(data))
+        if state is None or state.target is None:
+            targets = array.array('d')
+            break
+        targets.extend((state.target.x, state.target.y, state.target.angle))
+    lifted = array.array('i', fan.lifted_cards)
+    return b''.join((
+        FAN_HEADER.pack(FAN_MAGIC, len(cards), len(lifted), len(targets) // 3, _layout_digest(fan),
+                        fan.actual_spacing, fan.actual_radius, *fan.circle_origin),
+        lifted.tobytes(),
+        targets.tobytes(),
+        pickle.dumps(cards, protocol=pickle.HIGHEST_PROTOCOL),
+    ))
+
+def load_fan(fan, blob):
+    """
+    Restore a snapshot created by `dump_fan()`. Every card is placed
+    directly at its target without animation.
+    """
+    magic, n, nlifted, ntargets, digest, *layout_info = FAN_HEADER.unpack_from(blob)
+    if magic != FAN_MAGIC:
+        raise ValueError("Not a CardFan snapshot")
+    offset = FAN_HEADER.size
+    lifted = array.array('i')
+    lifted.frombytes(blob[offset:offset + lifted.itemsize * nlifted])
+    offset += lifted.itemsize * nlifted
+    targets = array.array('d')
+    targets.frombytes(blob[offset:offset + targets.itemsize * 3 * ntargets])
+    offset += targets.itemsize * 3 * ntargets
+    cards = pickle.loads(blob[offset:])
+    if len(cards) != n:
+        raise ValueError("Corrupt CardFan snapshot")
+    if ntargets != n or digest != _layout_digest(fan):
+        targets = None  # Stale targets, fan will compute its own
+    fan.restore(cards, lifted, targets, layout_info)
+
+
+def _class_name(cls):
+    if cls is None or isinstance(cls, str):
+        return cls
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+def _get_class(name):
+    if name is None or '.' not in name:
+        return name     # Factory name (or None)
+    return get_class(name)
+
+def dump_slate(slate):
+    """
+    Snapshot a Slate's content class, header class, and player binding.
+    Classes are stored by Factory name or by import path.
+    """
+    return SLATE_MAGIC + pickle.dumps(dict(
+        content_class=_class_name(slate.content_class),
+        header_class=_class_name(slate.header_class),
+        player_num=slate.player_num,
+    ), protocol=pickle.HIGHEST_PROTOCOL)
+
+def load_slate(slate, blob):
+    """
+    Restore a snapshot created by `dump_slate()`. Content and header are
+    only rebuilt if their class differs from the current one.
+    """
+    if blob[:len(SLATE_MAGIC)] != SLATE_MAGIC:
+        raise ValueError("Not a Slate snapshot")
+    state = pickle.loads(blob[len(SLATE_MAGIC):])
+    for attr in ('header_class', 'content_class'):
+        if _class_name(getattr(slate, attr)) != state[attr]:
+            setattr(slate, attr, _get_class(state[attr]))
+    slate.player_num = state['player_num']
+
+
+class SnapshotStore(object):
+    """
+    Directory of named fan and slate snapshots. Each snapshot is stored in
+    its own file and only rewritten when its contents change. Writes are
+    atomic (write to a temporary file then rename).
+
+        store = app.snapshot_store()
+        store.track("hand", fan)          # saved automatically after changes
+        store.track("p1", slate)
+        ...
+        # after restart:
+        store.restore("hand", fan)
+        store.restore("p1", slate)
+
+    :ivar delay: Seconds to wait after a change before writing a tracked
+    snapshot. Changes within that time are written together.
+    """
+    delay = 1.0
+
+    def __init__(self, path, delay=None):
+        self.path = pathlib.Path(path)
+        if delay is not None:
+            self.delay = delay
+        self._digests = {}
+        self._tracked = {}
+
+    def _file(self, name):
+        return self.path / f"{name}.snapshot"
+
+    def dump(self, obj):
+        if isinstance(obj, Factory.CardFan):
+            return dump_fan(obj)
+        if isinstance(obj, Factory.Slate):
+            return dump_slate(obj)
+        raise TypeError(f"Can not snapshot {obj!r}")
+
+    def save(self, name, obj):
+        """
+        Snapshot `obj` (a CardFan or Slate) as `name`. Returns True if the
+        file was written, False if it was already up to date.
+        """
+        blob = self.dump(obj)
+        digest = hashlib.sha1(blob).digest()
+        if self._digests.get(name) == digest:
+            return False
+        filename = self._file(name)
+        tmp = filename.with_suffix('.tmp')
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(tmp, 'wb') as fh:
+            fh.write(blob)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, filename)
+        self._digests[name] = digest
+        return True
+
+    def restore(self, name, obj):
+        """
+        Restore `obj` (a CardFan or Slate) from snapshot `name`. Returns
+        False if there is no such snapshot.
+        """
+        try:
+            blob = self._file(name).read_bytes()
+        except FileNotFoundError:
+            return False
+        if isinstance(obj, Factory.CardFan):
+            load_fan(obj, blob)
+        elif isinstance(obj, Factory.Slate):
+            load_slate(obj, blob)
+        else:
+            raise TypeError(f"Can not restore {obj!r}")
+        self._digests[name] = hashlib.sha1(blob).digest()
+        return True
+
+    def remove(self, name):
+        self.untrack(name)
+        self._digests.pop(name, None)
+        try:
+            self._file(name).unlink()
+        except FileNotFoundError:
+            pass
+
+    def track(self, name, obj):
+        """
+        Save `obj` as `name` whenever it changes (after `delay` seconds).
+        """
+        self.untrack(name)
+        trigger = Clock.create_trigger(lambda dt: self.save(name, obj), self.delay)
+        if isinstance(obj, Factory.CardFan):
+            props = ('cards', 'lifted_cards', 'size')
+        else:
+            props = ('content_class', 'header_class', 'player_num')
+        uids = [ (prop, obj.fbind(prop, trigger)) for prop in props ]
+        self._tracked[name] = (obj, trigger, uids)
+
+    def untrack(self, name):
+        if name in self._tracked:
+            obj, trigger, uids = self._tracked.pop(name)
+            trigger.cancel()
+            for prop, uid in uids:
+                obj.unbind_uid(prop, uid)
+
+    def flush(self):
+        """Immediately save all tracked objects with pending changes."""
+        for name, (obj, trigger, uids) in self._tracked.items():
+            if trigger.is_triggered:
+                trigger.cancel()
+                self.save(name, obj)
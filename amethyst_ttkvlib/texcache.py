@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent cache of decoded and scaled card images.
+"""
+# SPDX-License-Identifier: GPL-3.0
+__all__ = '''
+TextureCache
+'''.split()
+
+import collections
+import hashlib
+import mmap
+import os
+import pathlib
+import struct
+
+from kivy.core.image import Image as CoreImage
+from kivy.graphics.opengl import (glBlendFunc, glBlendFuncSeparate, GL_ONE,
+                                  GL_ONE_MINUS_SRC_ALPHA, GL_SRC_ALPHA, GL_ZERO)
+from kivy.graphics.texture import Texture
+import kivy.graphics
+import kivy.resources
+
+from amethyst_ttkvlib.trace import traced
+
+
+HEADER = struct.Struct('<4sII')
+MAGIC = b'TTK1'
+
+
+def _copy_blend(instr):
+    glBlendFunc(GL_ONE, GL_ZERO)
+
+def _reset_blend(instr):
+    # kivy's default blending (Callback(reset_context=True) is not usable
+    # in a throwaway Fbo, it fails once an earlier context is collected)
+    glBlendFuncSeparate(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_ONE, GL_ONE)
+
+
+class TextureCache(object):
+    """
+    On-disk cache of images already decoded and scaled to a particular
+    size, stored as raw RGBA blobs and loaded with mmap so that warm starts
+    skip image decoding entirely.
+
+    Entries are keyed by the resolved source path, its mtime and file
+    size, and the requested size, so a modified source image is simply a
+    cache miss (the stale entry ages out). Disk usage is limited to
+    `budget` bytes, evicting least-recently-used entries.
+
+    Textures are also kept in memory, keyed by source and size, so that
+    every widget showing the same face at the same size shares one
+    texture. Memory hits do not look at the source file again; call
+    `clear()` after changing images. The textures held in memory are
+    limited to `memory_budget` bytes (least recently used are dropped).
+
+    Only image files are cached. Other sources (`atlas://` and URLs) get
+    None from `get()`, callers load those themselves.
+
+        cache = TextureCache(app.user_cache("textures", mkdir=True))
+        widget.texture = cache.get("card-1.png", (120, 180))
+    """
+    def __init__(self, path, budget=256 * 2**20, memory_budget=64 * 2**20):
+        self.path = pathlib.Path(path)
+        self.budget = budget
+        self.memory_budget = memory_budget
+        self.textures = collections.OrderedDict()   # (source, w, h) -> texture
+        self._memory_usage = 0
+        self._usage = None
+
+    def key(self, source, size):
+        """
+        Cache key for `source` rendered at `size` or None if the source
+        is not an image file or can not be found.
+        """
+        if not source or '://' in source:
+            return None
+        filename = kivy.resources.resource_find(source)
+        if not filename:
+            return None
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return None
+        w, h = int(round(size[0])), int(round(size[1]))
+        ident = f"{os.path.abspath(filename)}\0{st.st_mtime_ns}\0{st.st_size}\0{w}x{h}"
+        return hashlib.sha1(ident.encode('utf-8')).hexdigest()
+
+    def get(self, source, size):
+        """
+        Returns a texture of `source` scaled to `size` or None if the
+        source is not an image file or can not be found.
+        """
+        if not source or size[0] < 1 or size[1] < 1:
+            return None
+        ident = (source, int(round(size[0])), int(round(size[1])))
+        texture = self.textures.get(ident)
+        if texture is not None:
+            self.textures.move_to_end(ident)
+            return texture
+        key = self.key(source, size)
+        if key is None:
+            return None
+        texture = self._load(key)
+        if texture is None:
+            texture = self._render(key, source, size)
+        if texture is not None:
+            self._remember(ident, texture)
+        return texture
+
+    def clear(self):
+        """Drop in-memory textures. The on-disk cache is unaffected."""
+        self.textures.clear()
+        self._memory_usage = 0
+
+    def _remember(self, ident, texture):
+        self.textures[ident] = texture
+        self._memory_usage += 4 * ident[1] * ident[2]
+        while self._memory_usage > self.memory_budget and len(self.textures) > 1:
+            old, _ = self.textures.popitem(last=False)
+            self._memory_usage -= 4 * old[1] * old[2]
+
+    def _file(self, key):
+        return self.path / key[:2] / f"{key}.rgba"
+
+    @traced("TextureCache._load", "image")
+    def _load(self, key):
+        filename = self._file(key)
+        try:
+            with open(filename, 'rb') as fh:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_COPY) as mm:
+                    magic, w, h = HEADER.unpack_from(mm)
+                    if magic != MAGIC or len(mm) != HEADER.size + 4 * w * h:
+                        return None
+                    texture = Texture.create(size=(w, h), colorfmt='rgba')
+                    with memoryview(mm) as view:
+                        texture.blit_buffer(view[HEADER.size:], colorfmt='rgba', bufferfmt='ubyte')
+        except (OSError, ValueError, struct.error):
+            return None
+        os.utime(filename)  # LRU bookkeeping
+        return texture
+
+    @traced("TextureCache._render", "image")
+    def _render(self, key, source, size):
+        w, h = int(round(size[0])), int(round(size[1]))
+        try:
+            image = CoreImage(source)
+        except Exception:
+            return None
+        fbo = kivy.graphics.Fbo(size=(w, h))
+        with fbo:
+            kivy.graphics.ClearColor(0, 0, 0, 0)
+            kivy.graphics.ClearBuffers()
+            # Copy without blending: blending over the transparent clear
+            # would premultiply RGB and darken antialiased edges once the
+            # texture is drawn again with normal blending.
+            kivy.graphics.Callback(_copy_blend)
+            kivy.graphics.Color(1, 1, 1, 1)
+            kivy.graphics.Rectangle(texture=image.texture, pos=(0, 0), size=(w, h))
+            kivy.graphics.Callback(_reset_blend)
+        fbo.draw()
+        pixels = fbo.pixels
+
+        texture = Texture.create(size=(w, h), colorfmt='rgba')
+        texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
+        self._store(key, w, h, pixels)
+        return texture
+
+    def _store(self, key, w, h, pixels):
+        filename = self._file(key)
+        tmp = filename.with_suffix('.tmp')
+        try:
+            filename.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, 'wb') as fh:
+                fh.write(HEADER.pack(MAGIC, w, h))
+                fh.write(pixels)
+            os.replace(tmp, filename)
+        except OSError:
+            return
+        if self._usage is not None:
+            self._usage += HEADER.size + len(pixels)
+        self.evict()
+
+    def entries(self):
+        """List of (mtime, bytes, path) for every cache file."""
+        res = []
+        if self.path.is_dir():
+            for filename in self.path.glob("*/*.rgba"):
+                try:
+                    st = filename.stat()
+                except OSError:
+                    continue
+                res.append((st.st_mtime, st.st_size, filename))
+        return res
+
+    def evict(self, budget=None):
+        """
+        Remove least recently used entries until disk usage is within
+        budget.
+        """
+        budget = self.budget if budget is None else budget
+        if budget is None:
+            return
+        if self._usage is not None and self._usage <= budget:
+            return
+        entries = sorted(self.entries(), key=lambda e: e[0])
+        self._usage = sum(e[1] for e in entries)
+        for mtime, nbytes, filename in entries:
+            if self._usage <= budget:
+                break
+            try:
+                filename.unlink()
+            except OSError:
+                continue
+            self._usage -= nbytes
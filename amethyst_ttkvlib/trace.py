@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Lightweight span tracing with Chrome trace-event export.
+
+Library hot paths (CardFan redraws, notice dispatch, Slate content swaps,
+texture loads) record spans whenever a `Tracer` is active. When tracing is
+disabled, the only cost is a test of the module-level `tracer` variable.
+Traces can be viewed in chrome://tracing or https://ui.perfetto.dev/
+"""
+# SPDX-License-Identifier: GPL-3.0
+__all__ = '''
+Tracer
+start_tracing
+stop_tracing
+traced
+'''.split()
+
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+from kivy.clock import Clock
+
+
+tracer = None   # The active Tracer, if any
+
+
+class Tracer(object):
+    """
+    Bounded ring buffer of completed spans. Once `capacity` spans have
+    been recorded, the oldest are discarded.
+
+        with tracer.span("load level", "game"):
+            ...
+
+    Spans are stored as `(name, cat, start, duration, thread, args)`
+    tuples with times in seconds from `time.perf_counter()`.
+
+    :ivar frames: When True, every Clock frame is recorded as a "frame"
+    span (from the start of one frame to the start of the next).
+    """
+    def __init__(self, capacity=100000, frames=True):
+        self.spans = collections.deque(maxlen=capacity)
+        self.frames = frames
+        self._frame_event = None
+        self._frame_start = None
+
+    now = staticmethod(time.perf_counter)
+
+    def add(self, name, cat, start, end=None, args=None):
+        """Record a span which began at `start` and ends at `end` (default now)."""
+        if end is None:
+            end = time.perf_counter()
+        # deque.append is atomic, so any thread may record spans
+        self.spans.append((name, cat, start, end - start, threading.get_ident(), args))
+
+    def span(self, name, cat="ttk", args=None):
+        """Context manager recording the time spent in its body."""
+        return _Span(self, name, cat, args)
+
+    def start(self):
+        if self.frames and self._frame_event is None:
+            self._frame_start = None
+            self._frame_event = Clock.schedule_interval(self._frame, 0)
+
+    def stop(self):
+        if self._frame_event is not None:
+            self._frame_event.cancel()
+            self._frame_event = None
+
+    def _frame(self, dt):
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self.add("frame", "clock", self._frame_start, now)
+        self._frame_start = now
+
+    def clear(self):
+        self.spans.clear()
+
+    def events(self):
+        """List of Chrome trace "complete" events for the recorded spans."""
+        pid = os.getpid()
+        res = []
+        for name, cat, start, dur, tid, args in list(self.spans):
+            event = dict(name=name, cat=cat, ph="X", ts=start * 1e6, dur=dur * 1e6, pid=pid, tid=tid)
+            if args:
+                event['args'] = args
+            res.append(event)
+        return res
+
+    def dump(self, path):
+        """Write the recorded spans to `path` in Chrome trace-event JSON format."""
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(dict(traceEvents=self.events(), displayTimeUnit="ms"), fh, default=str)
+        return path
+
+
+class _Span(object):
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.cat, self.start, args=self.args)
+
+
+def start_tracing(capacity=100000, frames=True):
+    """
+    Install (and return) a new active `Tracer`, replacing any current one.
+    """
+    global tracer
+    stop_tracing()
+    tracer = Tracer(capacity, frames)
+    tracer.start()
+    return tracer
+
+def stop_tracing():
+    """
+    Deactivate the current tracer, if any, and return it so that its
+    spans may still be dumped.
+    """
+    global tracer
+    old, tracer = tracer, None
+    if old is not None:
+        old.stop()
+    return old
+
+
+def traced(name=None, cat="ttk"):
+    """
+    Decorator recording a span for each call of the function while
+    tracing is active.
+
+        @traced("CardFan._redraw")
+        def _redraw(self, dt=None):
+            ...
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tr = tracer
+            if tr is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tr.add(span_name, cat, start)
+        return wrapper
+    return decorator
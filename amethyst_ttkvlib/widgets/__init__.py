@@ -1,5 +1,48 @@
 # -*- coding: utf-8 -*-
 # SPDX-License-Identifier: GPL-3.0
+"""
+Widgets are registered with the kivy Factory here, but their modules are
+only imported on first Factory lookup or first attribute access, for
+instance `amethyst_ttkvlib.widgets.CardFan`.
 
-from amethyst_ttkvlib.widgets.cardfan import *     # noqa: F403
-from amethyst_ttkvlib.widgets.slate import *       # noqa: F403
+The widget kv rules are loaded now, not with the widget modules. Kivy
+applies rules in load order, so import this package before loading the
+application's kv (as any import at the top of the application does) and
+the application's rules override the library's.
+"""
+import importlib
+
+from kivy.factory import Factory
+
+import amethyst_ttkvlib.widgets.kv  # noqa: F401
+
+_MODULES = {
+    'ArcCardLayout':       'amethyst_ttkvlib.widgets.cardlayout',
+    'CardFan':             'amethyst_ttkvlib.widgets.cardfan',
+    'CardFanModel':        'amethyst_ttkvlib.widgets.cardfanmodel',
+    'CardFanStats':        'amethyst_ttkvlib.widgets.cardfan',
+    'CardFanStatsOverlay': 'amethyst_ttkvlib.widgets.cardfan',
+    'CardFilterIndex':     'amethyst_ttkvlib.widgets.filterindex',
+    'CardImage':           'amethyst_ttkvlib.widgets.cardfan',
+    'CardLayout':          'amethyst_ttkvlib.widgets.cardlayout',
+    'CardPile':            'amethyst_ttkvlib.widgets.cardpile',
+    'ColumnCardLayout':    'amethyst_ttkvlib.widgets.cardlayout',
+    'GridCardLayout':      'amethyst_ttkvlib.widgets.cardlayout',
+    'ICardFanReset':       'amethyst_ttkvlib.widgets.cardfan',
+    'RowCardLayout':       'amethyst_ttkvlib.widgets.cardlayout',
+    'Slate':               'amethyst_ttkvlib.widgets.slate',
+    'StackCardLayout':     'amethyst_ttkvlib.widgets.cardlayout',
+}
+__all__ = list(_MODULES)
+
+for _name, _module in _MODULES.items():
+    Factory.register(_name, module=_module)
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
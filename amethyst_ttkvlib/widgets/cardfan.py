@@ -5,54 +5,43 @@
 # SPDX-License-Identifier: GPL-3.0
 __all__ = '''
 CardFan
+CardFanStats
+CardFanStatsOverlay
 CardImage
 ICardFanReset
+async_flip_all
+flip_all
 '''.split()
 
-import math
+import asyncio
+import collections
+import queue
+import threading
 import time
 import warnings
-from math import pi, radians, degrees, hypot, sin, cos
-pi_2 = pi/2
+import weakref
+from math import radians, hypot, sin, cos
 
-from kivy.animation import Animation
+from kivy.animation import Animation, AnimationTransition
+from kivy.base import EventLoop
 from kivy.clock import Clock
+from kivy.core.image import Image as CoreImage
 from kivy.factory import Factory
 from kivy.graphics.transformation import Matrix
 from kivy.lang import Builder
 from kivy.metrics import inch
+import kivy.app
 import kivy.graphics
 
 from amethyst.core import Object, Attr
 
 from amethyst_games.filters import IFilterable
 
+from amethyst_ttkvlib.trace import traced
+from amethyst_ttkvlib.widgets.cardlayout import ArcCardLayout, CardTarget, RowCardLayout
 from amethyst_ttkvlib.util import rotation_for_animation
 
 
-Builder.load_string('''
-<CardImage>:
-    do_rotation: False
-    do_scale: False
-    do_translation: False
-
-    canvas.after:
-        Color:
-            rgba: (1,0,0,0.75)
-        Ellipse:
-            pos: (self.x-3,self.y-3)
-            size: (6,6)
-
-    Image:
-        id: img
-        size: root.size
-        source: (root.source if root.show_front else root.back_source) or ''
-
-<CardFan>:
-    default_drag_distance: min(inch(.125), self.card_width/10, self.card_height/10)
-''')
-
-
 NOVALUE = object()
 
 def ci_getter(attr):
@@ -64,6 +53,15 @@ def ci_getter(attr):
     func.__name__ = attr
     return func
 
+def card_attr(data, key):
+    """
+    Value of `key` for a CardFan data dictionary: the dictionary item, else
+    the attribute of `data["card"]`, else None.
+    """
+    if key in data:
+        return data[key]
+    return getattr(data.get('card'), key, None)
+
 def ci_setter(attr):
     def func(self, val):
         _val = getattr(self, f"_{attr}", NOVALUE)
@@ -75,6 +73,107 @@ def ci_setter(attr):
     return func
 
 
+class _Timeline(Factory.EventDispatcher):
+    # Animated by a single Animation driving several staggered cards
+    elapsed = Factory.NumericProperty(0)
+
+    def start(self, total, update, finish):
+        self.anim = Animation(elapsed=total, duration=total)
+        self.anim.bind(on_progress=update, on_complete=finish)
+        self.anim.start(self)
+        return self
+
+
+async def _await_animation(anim, widget, on_cancel=None):
+    # Wait for `anim` to complete on `widget`. Cancelling the waiting task
+    # cancels the animation (without on_complete), then calls `on_cancel`.
+    fut = asyncio.get_running_loop().create_future()
+
+    def complete(anim, obj):
+        if obj is widget and not fut.done():
+            fut.set_result(None)
+    anim.fbind('on_complete', complete)
+    try:
+        await fut
+    except asyncio.CancelledError:
+        anim.cancel(widget)
+        if on_cancel is not None:
+            on_cancel()
+        raise
+    finally:
+        anim.funbind('on_complete', complete)
+
+
+def flip_all(cards, stagger=0.05, duration=0.3, show_front=None):
+    """
+    Flip several CardImage widgets, each starting `stagger` seconds after
+    the previous one. A single Animation drives all the cards, so the
+    cost per frame is one clock callback plus an update of the cards
+    currently turning. Both faces of each card are loaded before the
+    animation starts (see `CardImage.keep_faces`).
+
+    :param show_front: Side to show at the end. By default, each card is
+    turned over.
+
+    Returns the Animation, which completes when the last card has flipped.
+    """
+    return _flip_timeline(cards, stagger, duration, show_front).anim
+
+async def async_flip_all(cards, stagger=0.05, duration=0.3, show_front=None):
+    """
+    Coroutine version of `flip_all()`, returns once the last card has
+    flipped. When cancelled, the cards stop turning and are shown flat,
+    each on the side it currently shows.
+    """
+    cards = list(cards)
+    generations = [ card._generation for card in cards ]
+    driver = _flip_timeline(cards, stagger, duration, show_front)
+
+    def flatten():
+        for card, generation in zip(cards, generations):
+            if card._generation == generation:
+                card.flip_scale = 1
+    await _await_animation(driver.anim, driver, flatten)
+
+def _flip_timeline(cards, stagger, duration, show_front):
+    cards = list(cards)
+    targets = [ (not card.show_front) if show_front is None else show_front for card in cards ]
+    generations = [ card._generation for card in cards ]
+    for card in cards:
+        card.keep_faces = True
+    n = len(cards)
+    half = duration / 2
+    total = duration + stagger * max(0, n - 1)
+    done = [0]      # Cards before this index have finished
+
+    def update(*args):
+        now = driver.elapsed
+        started = n if stagger <= 0 else min(n, int(now / stagger) + 1)
+        for i in range(done[0], started):
+            card, local = cards[i], now - i * stagger
+            if card._generation != generations[i]:
+                # Recycled since the flip started, it shows another card now
+                if i == done[0]:
+                    done[0] += 1
+                continue
+            if local >= duration or now >= total:
+                scale = 1
+                if i == done[0]:
+                    done[0] += 1
+            elif local < half:
+                scale = 1 - local / half
+            else:
+                scale = (local - half) / half
+            if local >= half and card.show_front != targets[i]:
+                card.show_front = targets[i]
+                card._update_face.cancel()
+                card._load_face()   # Swap now, while edge-on
+            card.flip_scale = scale
+
+    driver = _Timeline()
+    return driver.start(total, update, update)
+
+
 class ICardFanReset(object):
     """
     Interface indicating to a CardFan widget that a class should have its
@@ -127,7 +226,51 @@ class CardImage(ICardFanReset, IFilterable, RevisionTracking, Factory.Scatter):
 
     :ivar flags: Delegate (read-only) to `card.flags` (or None) in order to
     fulfill IFilterable contract. Not used by CarFan.
+
+    :ivar keep_faces: Boolean property which defaults to False. When True,
+    the textures of both faces are loaded and kept by the card, so that
+    changing `show_front` swaps textures without loading anything. Set
+    by `flip()`.
+
+    :ivar flip_scale: Horizontal scale of the card image, animated by
+    `flip()` and `flip_all()`.
+
+    :ivar tint: Color multiplied into the card image (default white). Used
+    by `CardFilterIndex` to highlight cards. Reset when recycled.
+
+    :ivar texture_cache: Optional `TextureCache` or `CardAssets`. When set,
+    face textures are taken from the cache (pre-scaled to `face_size`)
+    rather than loaded by the child Image. Defaults to the running app's
+    `texture_cache` attribute, if any.
+
+    :ivar face_fallback: True (read-only) while the texture cache can not
+    provide the visible face (for instance an `atlas://` source), which
+    the child Image then loads itself.
+
+    :ivar face_box: Part of the card covered by the face texture, as
+    fractions `[x, y, width, height]` of the card size. Set from the
+    texture cache for trimmed textures (see `CardAssets.face_box()`).
+
+    :ivar face_size: Size at which face textures are taken from the
+    texture cache. CardFan sets this to its `card_size`. When unset, the
+    widget size is used, once it has stopped changing for
+    `FACE_RESIZE_DELAY` seconds.
+
+    :ivar lod: Boolean property which defaults to False. When True, the
+    face texture is chosen from the on-screen scale of the card (the
+    product of the scales of all ancestor Scatters). With a texture
+    cache, level `lod_level` uses a texture at `face_size / 2**lod_level`.
+    Without one, OpenGL mipmaps are enabled instead.
+
+    :ivar lod_levels: Maximum `lod_level` (default 4, 1/16 size).
+
+    :ivar lod_hysteresis: Fraction by which the scale must pass a level
+    boundary before the level changes (default 0.15), so that zoom
+    animations do not switch textures back and forth.
+
+    :ivar lod_level: Current level of detail (read-only), 0 is full size.
     """
+    FACE_RESIZE_DELAY = 0.1
     card = Factory.ObjectProperty(allownone=True)
     id = Factory.AliasProperty(ci_getter('id'), ci_setter('id'), bind=['card', 'revision'])
     source = Factory.AliasProperty(ci_getter('source'), ci_setter('source'), bind=['card', 'revision'])
@@ -138,28 +281,210 @@ class CardImage(ICardFanReset, IFilterable, RevisionTracking, Factory.Scatter):
     angle = Factory.NumericProperty(0)
 
     show_front = Factory.BooleanProperty(True)
+    tint = Factory.ListProperty([1, 1, 1, 1])
+    keep_faces = Factory.BooleanProperty(False)
+    flip_scale = Factory.NumericProperty(1)
+
+    texture_cache = Factory.ObjectProperty(None, allownone=True)
+    face_fallback = Factory.BooleanProperty(False)
+    face_size = Factory.ListProperty([0, 0])
+    face_box = Factory.ListProperty([0, 0, 1, 1])
+
+    lod = Factory.BooleanProperty(False)
+    lod_levels = Factory.NumericProperty(4)
+    lod_hysteresis = Factory.NumericProperty(0.15)
+    lod_level = Factory.NumericProperty(0)
+
+    def __init__(self, **kwargs):
+        self._lod_bindings = []
+        self._generation = 0        # Incremented on clear(), see _flip_timeline()
+        self._faces = {}            # source -> texture, with keep_faces
+        self._update_face = Clock.create_trigger(self._load_face)
+        self._resize_face = Clock.create_trigger(self._load_face, self.FACE_RESIZE_DELAY)
+        self._update_lod = Clock.create_trigger(self._compute_lod)
+        self._rebind_lod = Clock.create_trigger(self._bind_lod)
+        kwargs.setdefault('texture_cache', getattr(kivy.app.App.get_running_app(), 'texture_cache', None))
+        self.register_event_type('on_placement')
+        super().__init__(**kwargs)
+        self.fbind('source', self._update_face)
+        self.fbind('back_source', self._update_face)
+        self.fbind('show_front', self._update_face)
+        self.fbind('texture_cache', self._update_face)
+        self.fbind('face_size', self._update_face)
+        self.fbind('size', self._on_size_face)
+        self.fbind('lod_level', self._update_face)
+        self.fbind('keep_faces', self._load_face)
+        self.fbind('lod', self._rebind_lod)
+        self.fbind('parent', self._rebind_lod)
+        self._update_face()
+
+    def _on_size_face(self, *args):
+        # Only matters without face_size. Wait until the size stops
+        # changing rather than fetch a texture every frame of an animation.
+        if not (self.face_size[0] and self.face_size[1]):
+            self._resize_face.cancel()
+            self._resize_face()
+
+    def settle(self):
+        """
+        Load the face now if a change is pending, rather than on the next
+        frame.
+        """
+        if self._update_face.is_triggered or self._resize_face.is_triggered:
+            self._update_face.cancel()
+            self._load_face()
+
+    @traced("CardImage._load_face", "image")
+    def _load_face(self, *args):
+        self._resize_face.cancel()
+        cache = self.texture_cache
+        if cache is None and not self.keep_faces:
+            self._faces = {}
+            self.face_box = [0, 0, 1, 1]
+            self.face_fallback = False
+            return
+        source = self.source if self.show_front else self.back_source
+        size = self.face_size if self.face_size[0] and self.face_size[1] else self.size
+        if self.lod_level:
+            k = 2 ** self.lod_level
+            size = (max(1, size[0] / k), max(1, size[1] / k))
+        face_box = getattr(cache, 'face_box', None)
+        self.face_box = (face_box and face_box(source, size)) or [0, 0, 1, 1]
+        if not self.keep_faces:
+            texture = cache.get(source, size)
+            self.face_fallback = texture is None and bool(source)
+            if not self.face_fallback:
+                self.ids['img'].texture = texture
+            return
+        self.face_fallback = False
+        faces = {}
+        for src in (self.source, self.back_source):
+            if not src:
+                continue
+            if cache is not None:
+                faces[src] = cache.get(src, size)
+            if faces.get(src) is not None:
+                continue
+            if src in self._faces:
+                faces[src] = self._faces[src]
+            else:
+                try:
+                    faces[src] = CoreImage(src).texture
+                except Exception:
+                    faces[src] = None
+        self._faces = faces
+        self.ids['img'].texture = faces.get(source)
+
+    def mask_hit(self, x, y):
+        """
+        Test the point `(x, y)` (parent coordinates) against the hit mask
+        of the visible face. Returns None when the texture cache has no
+        mask for it.
+        """
+        hit = getattr(self.texture_cache, 'hit', None)
+        if hit is None or not self.flip_scale or not (self.width and self.height):
+            return None
+        x, y = self.to_local(x, y)
+        u = 0.5 + (x / self.width - 0.5) / self.flip_scale
+        return hit(self.source if self.show_front else self.back_source, u, y / self.height)
+
+    def flip(self, duration=0.3, show_front=None):
+        """
+        Turn the card over (or to `show_front`) with an animation which
+        narrows the card to its edge, swaps faces, and widens it again.
+        Returns the Animation.
+        """
+        return flip_all([self], 0, duration, show_front)
+
+    async def async_flip(self, duration=0.3, show_front=None):
+        """Coroutine version of `flip()`, see `async_flip_all()`."""
+        await async_flip_all([self], 0, duration, show_front)
+
+    def effective_scale(self):
+        """Scale of this card on screen, including all ancestor Scatters."""
+        scale = self.scale
+        widget = self.parent
+        while widget is not None:
+            if isinstance(widget, Factory.Scatter):
+                scale *= widget.scale
+            p = getattr(widget, 'parent', None)
+            widget = None if p is widget else p  # Window is its own parent
+        return scale
+
+    def _bind_lod(self, *args):
+        # Watch the scale of every ancestor Scatter, and every ancestor's
+        # parent in case the chain changes.
+        for widget, name, uid in self._lod_bindings:
+            widget.unbind_uid(name, uid)
+        self._lod_bindings = []
+        if self.lod:
+            widget = self.parent
+            while widget is not None:
+                self._lod_bindings.append((widget, 'parent', widget.fbind('parent', self._rebind_lod)))
+                if isinstance(widget, Factory.Scatter):
+                    self._lod_bindings.append((widget, 'scale', widget.fbind('scale', self._update_lod)))
+                p = getattr(widget, 'parent', None)
+                widget = None if p is widget else p
+        self._compute_lod()
+
+    def _compute_lod(self, *args):
+        if not self.lod:
+            self.lod_level = 0
+            return
+        scale = self.effective_scale()
+        level, levels, h = int(self.lod_level), int(self.lod_levels), self.lod_hysteresis
+        # Level k is exact at scale 2**-k, only move once the scale is
+        # well past the boundary to the next level.
+        while level < levels and scale < 2 ** -(level + 1) * (1 - h):
+            level += 1
+        while level > 0 and scale > 2 ** -level * (1 + h):
+            level -= 1
+        self.lod_level = min(level, levels)
 
     def _get_bl(self):
-        # Vector from center to bl in parent coordinates when not rotated
-        dxp1, dyp1 = -self.width/2, -self.height/2
-        # Vector from center to bl in parent coordinates when rotated
-        s, c = sin(radians(self.rotation)), cos(radians(self.rotation))
-        dxp2, dyp2 = (c * dxp1 - s * dyp1, s * dxp1 + c * dyp1)
-        return (self.center_x + dxp2, self.center_y + dyp2)
+        # The local origin is the unrotated bottom left
+        return self.to_parent(0, 0)
     def _set_bl(self, pos):
-        # Vector from bl to center in parent coordinates when not rotated
-        dxp1, dyp1 = self.width/2, self.height/2
-        # Vector from bl to center in parent coordinates when rotated
-        s, c = sin(radians(self.rotation)), cos(radians(self.rotation))
-        dxp2, dyp2 = (c * dxp1 - s * dyp1, s * dxp1 + c * dyp1)
-        # Get center
-        cx, cy = pos[0] + dxp2, pos[1] + dyp2
+        x, y = self.to_parent(0, 0)
+        dx, dy = pos[0] - x, pos[1] - y
         # Check for no change
-        if abs(cx-self.center_x) < 1e-7 and abs(cy-self.center_y) < 1e-7:
+        if abs(dx) < 1e-7 and abs(dy) < 1e-7:
             return False
-        self.center = (cx, cy)
+        self.apply_transform(Matrix().translate(dx, dy, 0))
         return True
-    bl = Factory.AliasProperty(_get_bl, _set_bl, bind=['pos'])
+    bl = Factory.AliasProperty(_get_bl, _set_bl, bind=['transform'])
+
+    def set_placement(self, x, y, rotation, size=None, opacity=None):
+        """
+        Place the card in one step: bounding box bottom left at `(x, y)`
+        (as for a `CardTarget`), rotated `rotation` degrees about its
+        center, at scale 1. `size` and `opacity` are also set if given.
+
+        The transform is built and assigned once, where setting `size`,
+        `rotation`, `x` and `y` in turn would apply four transforms (each
+        dispatching `transform`, `bbox`, `pos` and friends). An unchanged
+        transform (a recycled card placed where it was) is not reassigned.
+        Dispatches `on_placement` once.
+        """
+        if size is not None and (self.width != size[0] or self.height != size[1]):
+            self.size = size
+        if opacity is not None:
+            self.opacity = opacity
+        w, h = self.size
+        a = radians(rotation)
+        c, s = cos(a), sin(a)
+        # Center of the rotated bounding box, then the matching local origin
+        cx = x + (abs(c) * w + abs(s) * h) / 2
+        cy = y + (abs(s) * w + abs(c) * h) / 2
+        flat = (c, s, 0, 0, -s, c, 0, 0, 0, 0, 1, 0, cx - (c * w - s * h) / 2, cy - (s * w + c * h) / 2, 0, 1)
+        if self.transform.get() != flat:
+            m = Matrix()
+            m.set(flat=flat)
+            self.transform = m
+        self.dispatch('on_placement')
+
+    def on_placement(self):
+        pass
 
 
     def clear(self):
@@ -172,6 +497,11 @@ class CardImage(ICardFanReset, IFilterable, RevisionTracking, Factory.Scatter):
         """
         self.card = None
         self._id = self._source = self._back_source = NOVALUE
+        self.tint = [1, 1, 1, 1]
+        self.flip_scale = 1
+        self.keep_faces = False
+        self._faces = {}
+        self._generation += 1
 
 
     def magic2(self, a, b, rel=None):
@@ -252,50 +582,6 @@ class CardImage(ICardFanReset, IFilterable, RevisionTracking, Factory.Scatter):
     def copy(self):
         return self.__class__().copy_from(self)
 
-class CardTarget(object):
-    """
-    Internally used object for tracking a Scatter target positions and rotation.
-
-    (x, y)    - (bottom-left) target position of the card
-
-    angle     - (radians) angle of line passing through middle of the card
-                in Kivy coordinates (0 degrees is up). This is the angle
-                used in computing positions.
-
-    rotation  - (degrees) target rotation of the Scatter, just degrees(angle)
-    sin       - precomputed sin(angle)
-    cos       - precomputed cos(angle)
-    """
-    __slots__ = ('x', 'y', 'angle', 'rotation', 'sin', 'cos')
-    def __init__(self, x, y, angle=0):
-        self.x = x
-        self.y = y
-        if abs(angle) < 0.001:  # Snap to zero
-            self.angle = 0
-            self.rotation = 0
-            self.sin = 0
-            self.cos = 1
-        else:
-            self.angle = angle
-            self.rotation = degrees(angle)
-            self.sin = sin(angle)
-            self.cos = cos(angle)
-    def __str__(self):
-        return "({}, {}) radian={:.3f} degree={:.1f}".format(self.x, self.y, self.angle, self.rotation)
-
-    def rotated_vector(self, x, y):
-        """
-        Rotate a vector by the target angle.
-        """
-        return (self.cos * x - self.sin * y, self.sin * x + self.cos * y)
-
-    def rotated_size(self, w, h):
-        """
-        Size of (minimal) bounding box containing the rotated card.
-        """
-        return (abs(self.cos) * w + abs(self.sin) * h, abs(self.sin) * w + abs(self.cos) * h)
-
-
 class CardFanState(object):
     """
     Internal object for tracking state of a card.
@@ -304,11 +590,112 @@ class CardFanState(object):
     def __init__(self, anim=None, data=None, status=None, widget=None, target=None, index=None):
         self.anim = anim
         self.data = data
-        self.status = status # new, mv, ok, rm, recycle, busy
+        self.status = status # new, mv, ok, rm, recycle, busy, deal
         self.widget = widget
         self.target = target
         self.index = index
 
+class CardStrips(Factory.Widget):
+    """
+    Internally used by a virtualized CardFan to draw a run of consecutive
+    covered cards. Each card is drawn as a single textured rectangle
+    covering little more than the strip of the card left visible by its
+    neighbour.
+    """
+    def __init__(self, **kwargs):
+        self.states = ()
+        self.strip_width = 0
+        super().__init__(**kwargs)
+        self.size_hint = (None, None)
+
+    def update(self, fan, states):
+        self.states = states
+        self.canvas.clear()
+        cw, ch = fan.card_size
+        # Strips extend under the next card to hide anti-aliased card edges
+        sw = self.strip_width = max(1, min(cw, 2 * fan.actual_spacing))
+        ox, oy = fan.pos
+        with self.canvas:
+            kivy.graphics.Color(1, 1, 1, 1)
+            for state in states:
+                t = state.target
+                w, h = t.rotated_size(cw, ch)
+                cx, cy = ox + t.x + w/2, oy + t.y + h/2
+                texture = fan._strip_texture(state.data)
+                if texture is not None:
+                    texture = texture.get_region(0, 0, max(1, int(texture.width * sw / cw)), texture.height)
+                kivy.graphics.PushMatrix()
+                kivy.graphics.Rotate(angle=t.rotation, origin=(cx, cy))
+                kivy.graphics.Rectangle(pos=(cx - cw/2, cy - ch/2), size=(sw, ch), texture=texture)
+                kivy.graphics.PopMatrix()
+
+    def index_at(self, x, y, fan):
+        """
+        Card index of the topmost strip containing the (fan relative)
+        point or None.
+        """
+        cw, ch = fan.card_size
+        for state in reversed(self.states):
+            lx, ly = _card_local(state.target, cw, ch, x, y)
+            if -cw/2 <= lx <= self.strip_width - cw/2 and -ch/2 <= ly <= ch/2:
+                return state.index
+        return None
+
+
+def _card_local(target, cw, ch, x, y):
+    # Point relative to the center of an unrotated card at `target`
+    w, h = target.rotated_size(cw, ch)
+    dx, dy = x - target.x - w/2, y - target.y - h/2
+    return (target.cos * dx + target.sin * dy, target.cos * dy - target.sin * dx)
+
+
+class CardFanStats(object):
+    """
+    Performance counters collected by a CardFan while `stats_enabled` is
+    set. Times are in seconds.
+
+    :ivar redraws: Number of `_redraw()` passes.
+    :ivar calculate_time: Total time spent in `calculate()` during redraws.
+    :ivar animations_started: Number of card animations started.
+    :ivar animations_cancelled: Number of running card animations cancelled.
+    :ivar widgets_created: Card widgets newly constructed.
+    :ivar widgets_recycled: Card widgets taken from the recycle cache.
+    :ivar hit_tests: Number of hit tests run by `card_at_point()`.
+    :ivar hit_test_time: Total time spent in hit tests.
+    :ivar hit_cache_hits: `card_at_point()` calls answered from the cache.
+    :ivar hit_masks: Number of card alpha masks rendered by hit tests.
+    :ivar events: Number of `on_card_*` events dispatched.
+    :ivar event_time: Total time spent in `on_card_*` event handlers.
+    """
+    __slots__ = ('started', 'redraws', 'calculate_time', 'animations_started',
+                 'animations_cancelled', 'widgets_created', 'widgets_recycled',
+                 'hit_tests', 'hit_test_time', 'hit_cache_hits', 'hit_masks',
+                 'events', 'event_time')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self.redraws = 0
+        self.calculate_time = 0.0
+        self.animations_started = 0
+        self.animations_cancelled = 0
+        self.widgets_created = 0
+        self.widgets_recycled = 0
+        self.hit_tests = 0
+        self.hit_test_time = 0.0
+        self.hit_cache_hits = 0
+        self.hit_masks = 0
+        self.events = 0
+        self.event_time = 0.0
+
+    def as_dict(self):
+        res = { k: getattr(self, k) for k in self.__slots__ if k != 'started' }
+        res['elapsed'] = time.perf_counter() - self.started
+        return res
+
+
 class CardFan(Factory.FloatLayout):
     """
     Widget for a Fan of cards. Includes various functions for adding cards
@@ -316,8 +703,92 @@ class CardFan(Factory.FloatLayout):
 
     Fan "shape" is determined by the spacing, min_radius, max_angle
     properties. Additionally, the actual spacing will be adjusted so that
-    the fan never exceeds the widget width.
+    the fan never exceeds the widget width. Changing any of the geometry
+    properties (`spacing`, `min_radius`, `max_angle`, `lift`, `card_size`,
+    `true_center`) animates the cards to their new positions; several
+    changes in the same frame cause a single relayout.
+
+    :ivar fast_forward: Boolean property which defaults to False. While
+    True, the fan does not redraw at all. When reset to False, the fan
+    redraws once, immediately, and places every card at its target without
+    animation (firing any pending `on_card_add` and `on_card_remove`
+    events). Used when replaying a large number of changes at once.
+
+    :ivar hover_enabled: Boolean property which defaults to False. When
+    True, `on_card_hover_enter` and `on_card_hover_leave` are dispatched
+    as the mouse moves over the cards. Hit test results are cached per
+    pixel until cards move, so returning to a pixel of a still fan costs
+    a dictionary lookup. Other mouse moves test the cards under the
+    pointer against alpha masks rendered once per card face and size.
+
+    :ivar model: Optional `CardFanModel` shared with other fans. When set,
+    the fan shows the model's cards and lifted cards, and follows changes
+    to the model incrementally. The fan's `insert()` and `pop()` and
+    changes to `lifted_cards` are forwarded to the model, `cards` must
+    not be modified directly.
+
+    :ivar live_resize: Boolean property which defaults to True. While the
+    fan is being resized continuously (size changes less than
+    `live_resize_delay` seconds apart, as in a resize animation), card
+    positions are scaled from the last layout once per frame rather than
+    recalculated. The exact layout is applied once the size settles.
+    Virtual fans always recalculate.
+
+    :ivar live_resize_delay: Seconds without a size change after which a
+    resize is considered settled (default 0.15).
+
+    :ivar post_budget: Seconds per frame spent applying changes queued by
+    the `post_*()` methods (default 0.004). At least one change is applied
+    per frame, the rest wait for the following frames.
+
+    :ivar post_limit: Maximum number of queued changes (default 1000).
+    When full, `post_*()` calls from other threads block until the main
+    thread catches up (or raise `queue.Full`, see `post_insert()`).
+
+    :ivar layout: Optional `CardLayout` strategy which positions the cards
+    (see `amethyst_ttkvlib.widgets.cardlayout`). When None (the default),
+    cards are arranged in an arc if `min_radius` is positive, otherwise
+    in a flat row.
+
+    :ivar virtual: Boolean property which defaults to False. When True and
+    cards overlap, only cards which are not covered by their neighbour
+    (the top card, lifted cards and the cards just below them, cards
+    being dragged or animated) and cards near the last hovered or touched
+    card get a full card widget. All other cards are drawn as cheap
+    strips showing only their visible edge. Widgets are swapped in from
+    the recycle pool as the pointer moves across the fan. For virtual
+    cards, `on_card_add` is dispatched with a widget of None.
+
+    :ivar virtual_window: Number of cards on either side of the hovered or
+    touched card which get full widgets in virtual mode (default 2).
+
+    :ivar stats_enabled: Boolean property which defaults to False. When
+    True, the fan counts redraws, animations, widget creation, hit tests,
+    and time spent in `calculate()`, `card_at_point()` and `on_card_*`
+    event handlers. Counters reset whenever stats are enabled. When
+    disabled, counting costs one attribute test per operation.
+
+    :ivar stats_interval: Seconds between `on_stats` events while stats
+    are enabled (default 1).
+
+    :ivar stats: Read-only dictionary of the current counters (see
+    `CardFanStats`), or None when stats are disabled.
+
+    Events:
+
+    `on_stats(stats)`: Dispatched every `stats_interval` seconds while
+    stats are enabled, with the `stats` dictionary.
+
+    `on_card_hover_enter(index, data, widget)`: The mouse moved onto a
+    card (when `hover_enabled`). The widget is None for virtual cards.
+
+    `on_card_hover_leave(index, data, widget)`: The mouse left the card
+    of the previous `on_card_hover_enter`.
+
+    `on_cards_settled(cards)`: All cards of a `deal()` have landed, with
+    the list of their data.
     """
+    HIT_CACHE_SIZE = 4096
     cards = Factory.ListProperty()
     card_widget = Factory.ObjectProperty('CardImage')
     card_width = Factory.NumericProperty(120)
@@ -338,6 +809,23 @@ class CardFan(Factory.FloatLayout):
     default_drag_distance = Factory.NumericProperty(inch(.125))
 
     lifted_cards = Factory.ListProperty()
+    fast_forward = Factory.BooleanProperty(False)
+    hover_enabled = Factory.BooleanProperty(False)
+
+    live_resize = Factory.BooleanProperty(True)
+    live_resize_delay = Factory.NumericProperty(0.15)
+
+    post_budget = Factory.NumericProperty(0.004)
+    post_limit = Factory.NumericProperty(1000)
+
+    stats_enabled = Factory.BooleanProperty(False)
+    stats_interval = Factory.NumericProperty(1.0)
+
+    virtual = Factory.BooleanProperty(False)
+    virtual_window = Factory.NumericProperty(2)
+
+    layout = Factory.ObjectProperty(None, allownone=True)
+    model = Factory.ObjectProperty(None, allownone=True)
 
     # Informational (read-ony)
     actual_radius = Factory.NumericProperty()
@@ -352,14 +840,86 @@ class CardFan(Factory.FloatLayout):
         self._by_data = {}
         self._by_widget = {}
         self._redraw_instant = False
+        self._stats = None
+        self._stats_event = None
+        self._strip_pool = []
+        self._strip_textures = {}
+        self._virtual_focus = None
+        self._layout = None
+        self._dirty = None          # ids of data needing redraw, None for everything
+        self._inserting = False
+        self._layout_key = None
+        self._layout_size = None    # Fan size for the current card targets
+        self._last_resize = None
+        self._resize_event = None
+        self._model = None
+        self._model_sync = False    # Applying a change from the model
+        self._model_widget = None   # insert(widget=) forwarded to the model
+        self._model_recycle = True  # pop(recycle=) forwarded to the model
+        self._model_popped = None   # Result of a pop() forwarded to the model
+        self._hit_cache = {}        # (x, y) -> card index, valid while cards are still
+        self._hit_masks = weakref.WeakKeyDictionary()  # widget -> (key, alpha bytes)
+        self._animating = 0         # Number of running card animations
+        self._mouse_bound = False
+        self._hover_pos = None
+        self._hover_state = None
+        self._posted = collections.deque()      # Changes queued by post_*()
+        self._post_cond = threading.Condition()
         self.register_event_type('on_card_add')
         self.register_event_type('on_card_remove')
         self.register_event_type('on_card_press')
         self.register_event_type('on_card_long_press')
         self.register_event_type('on_card_drag')
         self.register_event_type('on_card_drop')
-        super().__init__(**kwargs)
+        self.register_event_type('on_stats')
+        self.register_event_type('on_card_hover_enter')
+        self.register_event_type('on_card_hover_leave')
+        self.register_event_type('on_cards_settled')
         self.redraw = Clock.create_trigger(self._redraw)
+        self._live_resize_step = Clock.create_trigger(self._live_resize)
+        self._hover_check = Clock.create_trigger(self._update_hover)
+        self._apply_posted = Clock.create_trigger(self._drain_posted)
+        super().__init__(**kwargs)
+        self.fbind('pos', self._invalidate_hits)
+        if self.model is not None:
+            self.on_model(self, self.model)
+        for prop in ('spacing', 'min_radius', 'max_angle', 'lift', 'card_size', 'true_center'):
+            self.fbind(prop, self.redraw_all)
+
+    @property
+    def stats(self):
+        return None if self._stats is None else self._stats.as_dict()
+
+    def on_stats_enabled(self, obj, val):
+        if self._stats_event is not None:
+            self._stats_event.cancel()
+            self._stats_event = None
+        if val:
+            self._stats = CardFanStats()
+            self._stats_event = Clock.schedule_interval(self._dispatch_stats, self.stats_interval)
+        else:
+            self._stats = None
+
+    def on_stats_interval(self, obj, val):
+        if self._stats_event is not None:
+            self.on_stats_enabled(self, self.stats_enabled)
+
+    def _dispatch_stats(self, dt=None):
+        if self._stats is not None:
+            self.dispatch('on_stats', self._stats.as_dict())
+
+    def on_stats(self, stats):
+        pass
+
+    def dispatch(self, event_type, *args, **kwargs):
+        if self._stats is None or not event_type.startswith('on_card_'):
+            return super().dispatch(event_type, *args, **kwargs)
+        t0 = time.perf_counter()
+        try:
+            return super().dispatch(event_type, *args, **kwargs)
+        finally:
+            self._stats.events += 1
+            self._stats.event_time += time.perf_counter() - t0
 
     def __len__(self):
         return len(self.cards)
@@ -367,15 +927,353 @@ class CardFan(Factory.FloatLayout):
         return self.cards[i]
 
     def insert(self, index, data, *, widget=None):
+        if self.model is not None and not self._model_sync:
+            self._model_widget = widget
+            try:
+                self.model.insert(index, data)
+            finally:
+                self._model_widget = None
+            return
         state = CardFanState(data=data, widget=widget, status=('mv' if widget else 'new'))
         # TODO: CHECK data
         self._by_data[id(data)] = state
         if widget is not None:
             # TODO: CHECK widget
             self._by_widget[id(widget)] = state
-        self.cards.insert(index, data)
+        if self._dirty is None and not self.redraw.is_triggered:
+            self._dirty = set()     # Nothing else pending, may redraw incrementally
+        self._inserting = True
+        try:
+            self.cards.insert(index, data)
+        finally:
+            self._inserting = False
+        if self._dirty is not None:
+            changed = self.current_layout.changed_on_insert(self, index)
+            if changed is None:
+                self._dirty = None
+            else:
+                self._dirty.update(id(self.cards[i]) for i in changed)
+
+    def move(self, src, dst):
+        """
+        Move the card at index `src` so that it ends at index `dst`. The
+        card keeps its widget and animates to its new place.
+        """
+        if self.model is not None:
+            self.model.move(src, dst)
+            return
+        n = len(self.cards)
+        src, dst = src % n, dst % n
+        if src == dst:
+            return
+        self._on_model_move(None, src, dst)
+        if self.lifted_cards:
+            order = list(range(n))
+            order.insert(dst, order.pop(src))
+            new_index = { old: new for new, old in enumerate(order) }
+            self.lifted_cards = [ new_index[i] for i in self.lifted_cards ]
+
+    def post_insert(self, index, data, block=True, timeout=None):
+        """
+        Queue `insert(index, data)` from any thread. Queued changes are
+        applied in order on the main thread, a frame's worth at a time
+        (see `post_budget`), so a burst costs one redraw per frame.
+
+        When `post_limit` changes are already queued, waits for room (up
+        to `timeout` seconds if given) or, if `block` is False, raises
+        `queue.Full` at once. Calls from the main thread never wait, they
+        apply the queue immediately instead.
+        """
+        self._post(('insert', index, data), block, timeout)
+
+    def post_pop(self, index, block=True, timeout=None):
+        """Queue `pop(index)` from any thread, see `post_insert()`."""
+        self._post(('pop', index), block, timeout)
+
+    def post_move(self, src, dst, block=True, timeout=None):
+        """Queue `move(src, dst)` from any thread, see `post_insert()`."""
+        self._post(('move', src, dst), block, timeout)
+
+    def post_lift(self, lifted_cards, block=True, timeout=None):
+        """
+        Queue a change of `lifted_cards` from any thread, see
+        `post_insert()`. Replaces a lift queued just before it.
+        """
+        self._post(('lift', list(lifted_cards)), block, timeout)
+
+    def post_reset(self, cards, lifted_cards=(), block=True, timeout=None):
+        """
+        Queue `restore(cards, lifted_cards)` from any thread, see
+        `post_insert()`. Changes queued before it are dropped.
+        """
+        self._post(('reset', list(cards), list(lifted_cards)), block, timeout)
+
+    def _post(self, op, block, timeout):
+        with self._post_cond:
+            posted = self._posted
+            if op[0] == 'reset':
+                posted.clear()
+                self._post_cond.notify_all()
+            elif op[0] == 'lift' and posted and posted[-1][0] == 'lift':
+                posted[-1] = op
+                return
+            elif len(posted) >= self.post_limit:
+                if threading.current_thread() is threading.main_thread():
+                    self._post_cond.release()
+                    try:
+                        self._drain_posted(budget=None)
+                    finally:
+                        self._post_cond.acquire()
+                elif not block or not self._post_cond.wait_for(lambda: len(posted) < self.post_limit, timeout):
+                    raise queue.Full
+            posted.append(op)
+        self._apply_posted()    # Triggering is thread safe
+
+    def _drain_posted(self, *args, budget=NOVALUE):
+        if budget is NOVALUE:
+            budget = self.post_budget
+        deadline = None if budget is None else time.perf_counter() + budget
+        while True:
+            with self._post_cond:
+                if not self._posted:
+                    return
+                op = self._posted.popleft()
+                self._post_cond.notify_all()
+            try:
+                if op[0] == 'insert':
+                    self.insert(op[1], op[2])
+                elif op[0] == 'pop':
+                    self.pop(op[1])
+                elif op[0] == 'move':
+                    self.move(op[1], op[2])
+                elif op[0] == 'lift':
+                    self.lifted_cards = op[1]
+                elif op[0] == 'reset':
+                    if self.model is not None:
+                        self.model.reset(op[1], op[2])
+                    else:
+                        self.restore(op[1], op[2])
+            except IndexError as err:
+                warnings.warn(f"CardFan: Ignoring queued {op[0]}: {err}")
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        if self._posted:
+            self._apply_posted()    # Rest next frame
+
+    def deal(self, cards, from_widget=None, stagger=0.1, duration=0.4, index=None):
+        """
+        Insert `cards` (data dictionaries) at `index` (default: the end)
+        and fly them in from `from_widget` (for instance a CardPile; by
+        default the fan center), each starting `stagger` seconds after the
+        previous one and taking `duration` seconds.
+
+        All cards are driven by a single Animation and follow their
+        targets if the layout changes in flight. Instead of an
+        `on_card_add` per card, `on_cards_settled` is dispatched once,
+        after the last card lands, with the data of the cards still in
+        the fan. Returns the Animation.
+        """
+        return self._deal_timeline(cards, from_widget, stagger, duration, index).anim
+
+    def _deal_timeline(self, cards, from_widget, stagger, duration, index):
+        cards = list(cards)
+        if index is None:
+            index = len(self.cards)
+        if from_widget is not None:
+            start = self.to_widget(*from_widget.to_window(*from_widget.center))
+        else:
+            start = self.center
+        states = []
+        for i, data in enumerate(cards):
+            widget = self.get_card_widget()
+            self._update_widget(widget, data)
+            widget.opacity = 0
+            self.insert(index + i, data, widget=widget)
+            state = self._by_data[id(data)]
+            state.status = 'deal'
+            states.append(state)
+        self.redraw.cancel()
+        self._redraw()      # Targets for the whole hand at once
+
+        n = len(states)
+        total = duration + stagger * max(0, n - 1)
+        ease = AnimationTransition.out_quad
+        cw, ch = self.card_size
+        landed = [0]        # Cards before this index have landed
+
+        def update(*args):
+            now = driver.elapsed
+            for i in range(landed[0], n):
+                local = now - i * stagger
+                if local < 0:
+                    break
+                state = states[i]
+                if state.status != 'deal':
+                    if i == landed[0]:
+                        landed[0] += 1      # Settled, dragged or removed meanwhile
+                    continue
+                widget, target = state.widget, state.target
+                if local >= duration or now >= total:
+                    state.status = 'ok'
+                    self._instant_to_target(state)
+                    if i == landed[0]:
+                        landed[0] += 1
+                    continue
+                k = ease(local / duration)
+                w, h = target.rotated_size(cw, ch)
+                tx, ty = self.x + target.x + w/2, self.y + target.y + h/2
+                rot = k * rotation_for_animation(0, target.rotation)
+                c, s = abs(cos(radians(rot))), abs(sin(radians(rot)))
+                self._place(widget,
+                            start[0] + k * (tx - start[0]) - (c * cw + s * ch) / 2,
+                            start[1] + k * (ty - start[1]) - (s * cw + c * ch) / 2,
+                            rot, self.card_size, 1)
+            self._invalidate_hits()
+
+        def finish(*args):
+            update()
+            settled = [ st.data for st in states if self._by_data.get(id(st.data)) is st ]
+            if self.virtual:
+                self.redraw_all()   # Landed cards may now be strips
+            self.dispatch('on_cards_settled', settled)
+
+        driver = _Timeline()
+        return driver.start(total, update, finish)
+
+    async def async_insert(self, index, data, *, widget=None):
+        """
+        Coroutine version of `insert()`, returns the card widget (None for
+        a virtual card) once the card is in place and `on_card_add` has
+        been dispatched. Several may be gathered concurrently.
+
+        When cancelled, the card's animation is cancelled as by
+        `Animation.cancel()`: the card stays where it is, and the next
+        redraw animates it again.
+        """
+        fut = self.card_added_future(data)
+        self.insert(index, data, widget=widget)
+        return await fut
+
+    async def async_pop(self, index, recycle=True):
+        """
+        Coroutine version of `pop()`, returns once the card has faded out
+        and `on_card_remove` has been dispatched. Without recycling, the
+        card is removed at once. Cancellation as for `async_insert()`.
+        """
+        if not recycle:
+            return self.pop(index, recycle=False)
+        data = self.cards[index]
+        fut = self._card_future('on_card_remove', data)
+        self.pop(index)
+        await fut
+        return data
+
+    async def async_deal(self, cards, from_widget=None, stagger=0.1, duration=0.4, index=None):
+        """
+        Coroutine version of `deal()`, returns the list of settled cards.
+        When cancelled, the cards still in flight leave the deal timeline
+        and take the fan's usual animation to their places.
+        """
+        cards = list(cards)
+        fut = asyncio.get_running_loop().create_future()
+
+        def done(fan, res):
+            if not fut.done():
+                fut.set_result(res)
+        driver = self._deal_timeline(cards, from_widget, stagger, duration, index)
+        self.fbind('on_cards_settled', done)
+
+        def land():
+            for data in cards:
+                state = self._by_data.get(id(data))
+                if state is not None and state.status == 'deal':
+                    state.status = 'mv'
+            self.redraw_all()
+        try:
+            await _await_animation(driver.anim, driver, land)
+            return await fut
+        finally:
+            self.funbind('on_cards_settled', done)
+
+    async def async_flip_all(self, indexes=None, stagger=0.05, duration=0.3, show_front=None):
+        """Coroutine version of `flip_all()`."""
+        widgets = self._flip_widgets(indexes, show_front)
+        await async_flip_all(widgets, stagger, duration, show_front)
+
+    def card_added_future(self, data):
+        """
+        Future resolved with the card widget (None for a virtual card) by
+        the next `on_card_add` for `data`. Create it before the card is
+        added, for instance to await a card dealt by a `CardPile`:
+
+            fut = fan.card_added_future(data)
+            pile.deal_to(fan, data=data)
+            widget = await fut
+
+        Cancelling the future cancels the card's animation, as for
+        `async_insert()`. Requires a running asyncio event loop.
+        """
+        return self._card_future('on_card_add', data)
+
+    def _card_future(self, event, data):
+        # Future resolved by the next `event` for `data`. Cancelling it
+        # (or a task awaiting it) cancels the card's animation.
+        fut = asyncio.get_running_loop().create_future()
+        if event == 'on_card_add':
+            def handler(fan, index, obj, widget):
+                if obj is data and not fut.done():
+                    fut.set_result(widget)
+        else:
+            def handler(fan, obj, widget):
+                if obj is data and not fut.done():
+                    fut.set_result(widget)
+
+        def done(fut):
+            self.funbind(event, handler)
+            if fut.cancelled():
+                state = self._by_data.get(id(data))
+                if state is not None:
+                    self._cancel_animation(state)
+        self.fbind(event, handler)
+        fut.add_done_callback(done)
+        return fut
+
+    def flip_all(self, indexes=None, stagger=0.05, duration=0.3, show_front=None):
+        """
+        Flip the cards at `indexes` (default: all cards) in order, see
+        `flip_all()`. The card data "show_front" items are updated, so
+        that recycled and virtual cards show the new side.
+        """
+        return flip_all(self._flip_widgets(indexes, show_front), stagger, duration, show_front)
+
+    def _flip_widgets(self, indexes, show_front):
+        if indexes is None:
+            indexes = range(len(self.cards))
+        widgets = []
+        for i in indexes:
+            data = self.cards[i]
+            state = self._by_data.get(id(data))
+            widget = None if state is None else state.widget
+            if isinstance(widget, CardImage):
+                side = (not widget.show_front) if show_front is None else show_front
+                widgets.append(widget)
+            else:
+                side = (card_attr(data, 'show_front') is False) if show_front is None else show_front
+            data['show_front'] = side
+        if self.virtual:
+            self.redraw_all()   # Strips
+        return widgets
 
     def pop(self, index, recycle=True):
+        if self.model is not None and not self._model_sync:
+            self._model_recycle = recycle
+            self._model_popped = NOVALUE    # Filled in by _on_model_remove()
+            try:
+                self.model.pop(index)
+            finally:
+                self._model_recycle = True
+                res, self._model_popped = self._model_popped, None
+            return res
         data = self.cards.pop(index)
         if recycle:
             state = self._by_data.get(id(data), None)
@@ -383,13 +1281,335 @@ class CardFan(Factory.FloatLayout):
             return data
         else:
             state = self._forget(data, None)
+            if state.widget is None and state.status == 'virtual':
+                state.widget = self.get_card_widget()
+                self._update_widget(state.widget, data)
+                self._instant_to_target(state)
             return state.data, state.widget
 
+    def restore(self, cards, lifted_cards=(), targets=None, layout_info=None):
+        """
+        Replace all cards at once, placing every card directly at its
+        target without animation. Used to resume a saved state.
+        `on_card_add` is dispatched for each card once all are placed.
+
+        :param targets: Optional flat sequence of `(x, y, angle)` for each
+        card (see `CardTarget`). When omitted, targets are calculated.
+
+        :param layout_info: Optional `(actual_spacing, actual_radius,
+        circle_origin_x, circle_origin_y)` of the layout which computed
+        `targets`. When omitted, the layout is calculated to set them.
+        """
+        cards = list(cards)
+        kept = 0
+        for widget in self.children[:]:
+            state = self._by_widget.get(id(widget))
+            if state is None:
+                # Not a card (e.g., CardStrips, pooled and re-added by _redraw)
+                self.remove_widget(widget)
+                continue
+            self._cancel_animation(state)
+            self.recycle(widget, keep=(kept < len(cards)))
+            kept += 1
+        self._by_data.clear()
+        self._by_widget.clear()
+
+        self.cards = cards
+        self.lifted_cards = list(lifted_cards)
+        self.redraw.cancel()
+        if targets is None:
+            targets = self.calculate()
+        else:
+            if layout_info is None:
+                self.calculate()
+            else:
+                self.actual_spacing, self.actual_radius, self.circle_origin_x, self.circle_origin_y = layout_info
+            targets = [ CardTarget(*targets[i:i+3]) for i in range(0, len(targets), 3) ]
+
+        self._dirty = None
+        self._layout_key = self._get_layout_key()
+        self._layout_size = tuple(self.size)
+        materialize = self._virtual_indices(targets)
+        states = []
+        for i, data in enumerate(self.cards):
+            if materialize is not None and i not in materialize:
+                state = CardFanState(data=data, status='virtual', target=targets[i], index=i)
+                self._by_data[id(data)] = state
+                states.append(state)
+                continue
+            widget = self.get_card_widget()
+            self._update_widget(widget, data)
+            if isinstance(widget, CardImage):
+                widget.face_size = self.card_size
+            state = CardFanState(data=data, widget=widget, status='ok', target=targets[i], index=i)
+            self._by_data[id(data)] = state
+            self._by_widget[id(widget)] = state
+            self.add_widget(widget)
+            self._instant_to_target(state)
+            states.append(state)
+        self._invalidate_hits()
+        if materialize is not None:
+            self._redraw()  # Arrange strips
+        for state in states:
+            self.dispatch('on_card_add', state.index, state.data, state.widget)
+
+    @property
+    def current_layout(self):
+        """The layout strategy in use, `layout` or the default row or arc."""
+        if self.layout is not None:
+            return self.layout
+        return DEFAULT_ARC if self.min_radius > 0 else DEFAULT_ROW
+
+    def on_layout(self, obj, layout):
+        if self._layout is not None:
+            self._layout.unbind(**{ name: self.redraw_all for name in self._layout.properties() })
+        self._layout = layout
+        if layout is not None:
+            layout.bind(**{ name: self.redraw_all for name in layout.properties() })
+        self.redraw_all()
+
+    def redraw_all(self, *args):
+        """Schedule a redraw which re-targets every card."""
+        self._dirty = None
+        self.redraw()
+
+    def settle(self):
+        """
+        Apply pending work now rather than over the next frames: lay out
+        the fan, redraw it with every card placed at its target without
+        animation, and load the faces of its card widgets (see
+        `CardImage.settle()`). Used to draw a fan offscreen.
+        """
+        if self._trigger_layout.is_triggered:
+            self._trigger_layout.cancel()
+            self.do_layout()
+        self._live_resize_step.cancel()
+        if self.redraw.is_triggered or self._redraw_instant:
+            self.redraw.cancel()
+            self._redraw_instant = 'settle'
+            self._redraw()
+        for widget in self.children:
+            if isinstance(widget, CardImage):
+                widget.settle()
+
+    def is_animating(self):
+        """
+        True while cards are moving or fading: a redraw is pending, or card
+        animations or a `deal()` are running.
+        """
+        if self._animating or self.redraw.is_triggered:
+            return True
+        return any(state.status == 'deal' for state in self._by_data.values())
+
     def on_cards(self, obj, val):
+        if not self._inserting:
+            self._dirty = None
+        self._invalidate_hits()
         self.redraw()
 
     def on_lifted_cards(self, obj, val):
-        self.redraw()
+        if self.model is not None and not self._model_sync:
+            self.model.lifted_cards = val
+        self.redraw_all()
+
+    def on_model(self, obj, model):
+        if self.canvas is None:
+            return  # Still initializing
+        if self._model is not None:
+            self._model.unbind(on_insert=self._on_model_insert, on_remove=self._on_model_remove,
+                               on_move=self._on_model_move, on_reset=self._on_model_reset,
+                               lifted_cards=self._on_model_lifted)
+        self._model = model
+        if model is not None:
+            model.bind(on_insert=self._on_model_insert, on_remove=self._on_model_remove,
+                       on_move=self._on_model_move, on_reset=self._on_model_reset,
+                       lifted_cards=self._on_model_lifted)
+            self._on_model_reset(model, model.cards)
+
+    def _on_model_insert(self, model, index, data):
+        widget, self._model_widget = self._model_widget, None
+        self._model_sync = True
+        try:
+            self.insert(index, data, widget=widget)
+        finally:
+            self._model_sync = False
+
+    def _on_model_remove(self, model, index, data):
+        recycle, self._model_recycle = self._model_recycle, True
+        self._model_sync = True
+        try:
+            res = self.pop(index, recycle)
+        finally:
+            self._model_sync = False
+        if self._model_popped is NOVALUE:   # This fan's pop() started the removal
+            self._model_popped = res
+
+    def _on_model_move(self, model, src, dst):
+        # The card keeps its state and widget, and animates to its new place
+        data = self.cards[src]
+        self.cards[src:src+1] = []
+        self.cards.insert(dst, data)
+
+    def _on_model_reset(self, model, cards):
+        self._model_sync = True
+        try:
+            self.restore(cards, model.lifted_cards)
+        finally:
+            self._model_sync = False
+
+    def _on_model_lifted(self, model, lifted_cards):
+        self._model_sync = True
+        try:
+            self.lifted_cards = lifted_cards
+        finally:
+            self._model_sync = False
+
+    def on_virtual(self, obj, val):
+        self._bind_mouse()
+        self._virtual_focus = None
+        self.redraw_all()
+
+    def on_hover_enabled(self, obj, val):
+        self._bind_mouse()
+        if not val:
+            self._hover_pos = None
+            self._update_hover()
+
+    def on_parent(self, obj, parent):
+        self._bind_mouse()  # Window may not have existed before
+
+    def _bind_mouse(self):
+        # Weak binding (bind, not fbind), and only while in a widget tree,
+        # so that the window never keeps a fan alive
+        window = EventLoop.window
+        want = window is not None and self.parent is not None and (self.virtual or self.hover_enabled)
+        if want and not self._mouse_bound:
+            window.bind(mouse_pos=self._on_mouse_pos)
+        elif self._mouse_bound and not want and window is not None:
+            window.unbind(mouse_pos=self._on_mouse_pos)
+        self._mouse_bound = want
+
+    def on_virtual_window(self, obj, val):
+        self.redraw_all()
+
+    def _on_mouse_pos(self, window, pos):
+        if self.get_root_window() is None:
+            return
+        x, y = self.to_widget(*pos)
+        inside = self.collide_point(x, y)
+        if self.virtual and inside and self.cards:
+            self.focus_card(self._index_at(x - self.x, y - self.y))
+        if self.hover_enabled:
+            self._hover_pos = (x, y) if inside else None
+            self._update_hover()
+
+    def _update_hover(self, *args):
+        state = None
+        if self._hover_pos is not None and self.cards:
+            index = self.card_at_point(*self._hover_pos)
+            if index is not None:
+                state = self._by_data.get(id(self.cards[index]))
+        old = self._hover_state
+        if state is old:
+            return
+        self._hover_state = state
+        if old is not None:
+            self.dispatch('on_card_hover_leave', old.index, old.data, old.widget)
+        if state is not None:
+            self.dispatch('on_card_hover_enter', state.index, state.data, state.widget)
+
+    def add_widget(self, widget, *args, **kwargs):
+        super().add_widget(widget, *args, **kwargs)
+        if isinstance(widget, CardImage):
+            # Flips change the hit shape without moving the card
+            widget.fbind('flip_scale', self._invalidate_hits)
+
+    def remove_widget(self, widget, *args, **kwargs):
+        if isinstance(widget, CardImage):
+            widget.funbind('flip_scale', self._invalidate_hits)
+        super().remove_widget(widget, *args, **kwargs)
+
+    def _invalidate_hits(self, *args):
+        # Card positions (or shapes) changed
+        if self._hit_cache:
+            self._hit_cache.clear()
+        if self._hover_pos is not None:
+            self._hover_check()
+
+    def focus_card(self, index):
+        """
+        In virtual mode, give full widgets to the cards around `index`.
+        Called automatically as the mouse hovers over the fan and when a
+        card is touched.
+        """
+        if index is not None and index != self._virtual_focus:
+            self._virtual_focus = index
+            if self.virtual:
+                self.redraw_all()
+
+    def _index_at(self, x, y):
+        # Geometric hit test (fan relative) against card targets
+        cw, ch = self.card_size
+        for i in range(len(self.cards) - 1, -1, -1):
+            state = self._by_data.get(id(self.cards[i]))
+            if state is None or state.target is None:
+                continue
+            lx, ly = _card_local(state.target, cw, ch, x, y)
+            if abs(lx) <= cw/2 and abs(ly) <= ch/2:
+                return i
+        return None
+
+    def _virtual_indices(self, targets):
+        """
+        Set of card indexes which need a full widget, or None if all cards do.
+        """
+        n = len(targets)
+        if not self.virtual or n < 2 or self.actual_spacing >= self.card_width:
+            return None
+        res = { n - 1 }
+        for i in self.lifted_cards:
+            res.update((i - 1, i))      # Lifting uncovers the card below
+        for state in self._by_widget.values():
+            if state.status == 'busy' and state.index is not None:
+                res.update((state.index - 1, state.index))
+        if self._virtual_focus is not None:
+            w = int(self.virtual_window)
+            res.update(range(self._virtual_focus - w, self._virtual_focus + w + 1))
+        return res
+
+    def _strip_texture(self, data):
+        if card_attr(data, 'show_front') in (None, True):
+            source = card_attr(data, 'source')
+        else:
+            source = card_attr(data, 'back_source')
+        if not source:
+            return None
+        cache = getattr(kivy.app.App.get_running_app(), 'texture_cache', None)
+        texture = None if cache is None else cache.get(source, self.card_size)
+        if texture is not None:
+            return texture
+        if source not in self._strip_textures:
+            try:
+                self._strip_textures[source] = CoreImage(source).texture
+            except Exception:
+                self._strip_textures[source] = None
+        return self._strip_textures[source]
+
+    def _add_strips(self, states, n):
+        if n < len(self._strip_pool):
+            strips = self._strip_pool[n]
+        else:
+            strips = CardStrips()
+            self._strip_pool.append(strips)
+        strips.update(self, states)
+        self.add_widget(strips)
+        return n + 1
+
+    def on_fast_forward(self, obj, val):
+        if not val:
+            self.redraw.cancel()
+            self._redraw_instant = 'settle'
+            self._redraw()
 
 
     def on_card_add(self, index, data, widget):
@@ -448,8 +1668,24 @@ class CardFan(Factory.FloatLayout):
     def on_card_drop(self, index, data, widget, touch):
         pass
 
+    def on_card_hover_enter(self, index, data, widget):
+        pass
+
+    def on_card_hover_leave(self, index, data, widget):
+        pass
+
+    def on_cards_settled(self, cards):
+        """
+        All cards of a `deal()` have landed. Dispatched once per deal
+        instead of `on_card_add` for each dealt card.
+        """
+        pass
+
 
     def _animation_complete(self, anim, widget):
+        self._animating = max(0, self._animating - 1)
+        if not self._animating:
+            self._invalidate_hits()
         state = self._by_widget.get(id(widget), None)
         if state is None:
             return
@@ -464,6 +1700,8 @@ class CardFan(Factory.FloatLayout):
             state.status = 'ok'
             self._instant_to_target(state)
             self.dispatch('on_card_add', state.index, state.data, state.widget)
+            if self.virtual:
+                self.redraw_all()   # May now be drawn as a strip
 
     def _forget(self, data, widget, remove=True):
         # TODO: Option to ensure not still in cards or children?
@@ -480,29 +1718,112 @@ class CardFan(Factory.FloatLayout):
             self.remove_widget(state.widget)
         return state
 
+    def on_card_size(self, obj, val):
+        for state in self._by_data.values():
+            if isinstance(state.widget, CardImage):
+                state.widget.face_size = val
+
     def on_size(self, obj, val):
         # Either we did a full-screen resize in which case a discontinuous
         # jump in positions is OK, or the fan is being resized slowly (a
         # scatter or animation) in which case we don't need to stack animations.
-        self._redraw_instant = True
-        self.redraw()
+        now = Clock.get_boottime()
+        continuous = (self._last_resize is not None and now - self._last_resize < self.live_resize_delay)
+        self._last_resize = now
+        if self._resize_event is not None:
+            self._resize_event.cancel()
+        if continuous and self.live_resize and not self.virtual and self._layout_size is not None:
+            self._live_resize_step()
+            self._resize_event = Clock.schedule_once(self._resize_settled, self.live_resize_delay)
+        else:
+            self._resize_settled()
 
+    def _resize_settled(self, *args):
+        self._resize_event = None
+        self._live_resize_step.cancel()
+        self._redraw_instant = True
+        self.redraw_all()
+
+    def _live_resize(self, *args):
+        # Scale card centers from the size of the last exact layout. Cards
+        # keep their targets, the next full redraw replaces them.
+        self._invalidate_hits()
+        w0, h0 = self._layout_size
+        if not (w0 and h0):
+            return
+        sx, sy = self.width / w0, self.height / h0
+        x, y = self.pos
+        cw, ch = self.card_size
+        for state in self._by_widget.values():
+            widget = state.widget
+            if state.status != 'ok' or state.anim is not None or state.target is None or widget.parent is not self:
+                continue
+            t = state.target
+            w, h = t.rotated_size(cw, ch)
+            self._place(widget, x + (t.x + w/2) * sx - w/2, y + (t.y + h/2) * sy - h/2, t.rotation)
+
+    @traced("CardFan._redraw", "cardfan")
     def _redraw(self, dt=None):
-        targets = self.calculate()
+        if self.fast_forward:
+            return
+        self._invalidate_hits()
+        settle = (self._redraw_instant == 'settle')
+        if self._stats is not None:
+            self._stats.redraws += 1
+            t0 = time.perf_counter()
+            targets = self.calculate()
+            self._stats.calculate_time += time.perf_counter() - t0
+        else:
+            targets = self.calculate()
+
+        dirty, self._dirty = self._dirty, None
+        layout_key = self._get_layout_key()
+        if dirty is not None and not self._redraw_instant and not self.virtual and layout_key == self._layout_key:
+            self._redraw_changed(targets, dirty)
+            return
+        self._layout_key = layout_key
+        self._layout_size = tuple(self.size)
+
         widgets = self.children[:]
         self.clear_widgets()
+        materialize = self._virtual_indices(targets)
 
         keep = set()
+        settled = []
+        run, nstrips = [], 0
         for i, data in enumerate(self.cards):
             state = self._by_data.get(id(data), None)
             if state is None: # data added to cards directly
-                state = CardFanState(data=data, widget=self.get_card_widget(), status='new')
-            elif state.widget is None:
+                state = CardFanState(data=data, status='new')
+
+            if materialize is not None and i not in materialize and state.anim is None and state.status in ('new', 'ok', 'virtual'):
+                # Covered card, draw as a strip
+                if state.widget is not None:
+                    self.recycle(state.widget)
+                    state.widget = None
+                elif state.status == 'new':
+                    settled.append(state)
+                state.status = 'virtual'
+                state.index = i
+                state.target = targets[i]
+                self._by_data[id(data)] = state
+                keep.add(id(data))
+                run.append(state)
+                continue
+            if run:
+                nstrips = self._add_strips(run, nstrips)
+                run = []
+
+            swap_in = (state.status == 'virtual')
+            if state.widget is None:
                 state.widget = self.get_card_widget()
-                state.status = 'new'
+                if not swap_in:
+                    state.status = 'new'
 
             if state.status is not 'ok':
                 self._update_widget(state.widget, data)
+                if isinstance(state.widget, CardImage):
+                    state.widget.face_size = self.card_size
             state.index = i
             state.target = targets[i]
 
@@ -513,10 +1834,25 @@ class CardFan(Factory.FloatLayout):
             keep.add(id(data))
             keep.add(id(state.widget))
 
+            if swap_in:
+                # Was drawn as a strip, so is already in place
+                state.status = 'ok'
+                self._instant_to_target(state)
+                continue
+            if settle and state.status in ('new', 'mv'):
+                settled.append(state)
             self._animate_to_target(state)
+        if run:
+            self._add_strips(run, nstrips)
         # Done redrawing, clear flag if present
         self._redraw_instant = False
 
+        # Data inserted and popped again before we got a chance to draw it
+        for key in [ k for k, st in self._by_data.items() if k not in keep and st.widget is None ]:
+            state = self._by_data.pop(key)
+            if state.status == 'recycle':
+                self.dispatch('on_card_remove', state.data, None)
+
         # Any thing to recycle?
         for widget in widgets:
             if id(widget) not in keep:
@@ -529,18 +1865,51 @@ class CardFan(Factory.FloatLayout):
                     else:
                         # status might be new or ok if data was removed directly from self.cards
                         state.status == 'recycle'
-                        if state.anim:
-                            state.anim.cancel(widget)  # Kill without triggering complete
-                        if widget.opacity > 0:
+                        self._cancel_animation(state)
+                        if widget.opacity > 0 and not settle:
                             dt = widget.opacity * self.fade_time
-                            state.anim = Animation(opacity=0, duration=dt)
-                            state.anim.bind(on_complete=self._animation_complete)
-                            state.anim.start(widget)
-                        else: # Unlikely - only if user triggers a fade before removing
+                            self._start_animation(state, Animation(opacity=0, duration=dt))
+                        else: # Settling, or user triggered a fade before removing
                             self.recycle(widget)
                             self.dispatch('on_card_remove', state.data, None)
 
-    def recycle(self, widget):
+        for state in settled:
+            self.dispatch('on_card_add', state.index, state.data, state.widget)
+
+    def _get_layout_key(self):
+        # Layout inputs which are not otherwise tracked. When any of these
+        # change, an incremental redraw is not possible.
+        return (tuple(self.pos), tuple(self.size), tuple(self.card_size), self.spacing, self.lift,
+                self.min_radius, self.max_angle, self.true_center, id(self.current_layout))
+
+    def _redraw_changed(self, targets, dirty):
+        # Incremental redraw after insert(): only cards the layout declared
+        # as changed are updated. Z-order of children matches card order,
+        # so new widgets are inserted in place.
+        for i, data in enumerate(self.cards):
+            state = self._by_data.get(id(data))
+            state.index = i
+            if id(data) not in dirty:
+                continue
+            state.target = targets[i]
+            if state.widget is None:
+                state.widget = self.get_card_widget()
+                state.status = 'new'
+            if state.widget.parent is not self:
+                self._update_widget(state.widget, data)
+                if isinstance(state.widget, CardImage):
+                    state.widget.face_size = self.card_size
+                self._by_widget[id(state.widget)] = state
+                self.add_widget(state.widget, index=len(self.children) - i)
+            self._animate_to_target(state)
+
+    def recycle(self, widget, keep=False):
+        """
+        Remove `widget` and keep it for reuse by `get_card_widget()`.
+
+        :param keep: Cache the widget even past the usual limit, because
+        it is about to be reused.
+        """
         self._forget(None, widget)
         if widget.parent:
             widget.parent.remove_widget(widget)
@@ -548,7 +1917,7 @@ class CardFan(Factory.FloatLayout):
             widget.clear()
         # Don't allow the cache to grow forever.
         n = len(self._widget_cache)
-        if n < 10 or n < 0.5 * len(self.cards):
+        if keep or n < 10 or n < 0.5 * len(self.cards):
             self._widget_cache.append(widget)
 
     def on_card_widget(self, obj, val):
@@ -556,9 +1925,14 @@ class CardFan(Factory.FloatLayout):
         self._by_data.clear()
         self._by_widget.clear()
         self._widget_cache.clear()
-        self.redraw()
+        self.redraw_all()
 
     def get_card_widget(self):
+        if self._stats is not None:
+            if self._widget_cache:
+                self._stats.widgets_recycled += 1
+            else:
+                self._stats.widgets_created += 1
         if self._widget_cache:
             return self._widget_cache.pop()
         else:
@@ -573,6 +1947,11 @@ class CardFan(Factory.FloatLayout):
         if self.collide_point(*touch.pos):
             index = self.card_at_point(*touch.pos)
             state = self._by_data.get(id(self.cards[index])) if index is not None else None
+            if state is not None and state.widget is None:
+                # Virtual card, swap in a widget now
+                self.focus_card(index)
+                self.redraw.cancel()
+                self._redraw()
             if index is not None and state is not None:
                 touch.grab(self)
                 touch.ud['cardfan:state'] = state
@@ -598,8 +1977,7 @@ class CardFan(Factory.FloatLayout):
                     touch.ud['cardfan:type'] = 'drag'
                     self.dispatch('on_card_drag', state.index, state.data, state.widget, touch)
                     if touch.ud['cardfan:type'] == 'drag': # drag hasn't been aborted
-                        if state.anim:
-                            state.anim.cancel(state.widget)  # Kill without triggering complete
+                        self._cancel_animation(state)
                         state.status = 'busy'
                         state.widget.x += dx
                         state.widget.y += dy
@@ -607,6 +1985,7 @@ class CardFan(Factory.FloatLayout):
                 for st in self._dragged(touch):
                     st.widget.x += touch.dx
                     st.widget.y += touch.dy
+                self._invalidate_hits()
             return True
 
     def add_to_drag(self, i, touch):
@@ -629,7 +2008,7 @@ class CardFan(Factory.FloatLayout):
             if st.status == 'busy':
                 st.status = 'ok'
         touch.ud['cardfan:type'] = None
-        self.redraw()
+        self.redraw_all()
 
     def _dragged(self, touch):
         if touch.ud['cardfan:type'] == 'drag':
@@ -662,7 +2041,7 @@ class CardFan(Factory.FloatLayout):
             for st in self._dragged(touch):
                 if st.status == 'busy':
                     st.status = 'ok'
-            self.redraw()
+            self.redraw_all()
             return True
 
     def _maybe_long_press(self, touch):
@@ -676,42 +2055,126 @@ class CardFan(Factory.FloatLayout):
         """
         Returns the card number (index in the cards list) of the card
         visible at the given touch position.
+
+        While no card is animating, results are cached per pixel until
+        the cards move. Misses test cards against the hit mask of their
+        texture cache when it has one, else against an alpha mask rendered
+        once per card in card coordinates and kept until the card changes
+        size or face.
         """
-        # Modified from kivy.uix.widget.Widget#export_to_png()
+        key = None
+        if not self._animating:
+            key = (int(x), int(y))
+            if key in self._hit_cache:
+                if self._stats is not None:
+                    self._stats.hit_cache_hits += 1
+                return self._hit_cache[key]
+        if self._stats is not None:
+            t0 = time.perf_counter()
+            index = self._card_at_point(x, y)
+            self._stats.hit_tests += 1
+            self._stats.hit_test_time += time.perf_counter() - t0
+        else:
+            index = self._card_at_point(x, y)
+        if key is not None:
+            if len(self._hit_cache) >= self.HIT_CACHE_SIZE:
+                self._hit_cache.clear()
+            self._hit_cache[key] = index
+        return index
+
+    def _card_at_point(self, x, y):
         n = len(self.children)-1
-        if not hasattr(self, "_fbo"):
-            self._fbo = kivy.graphics.Fbo(size=(self.right, self.top), with_stencilbuffer=True)
-        self._fbo.size = (self.right, self.top)   # Kivy recreates fbo only if size changes - convenient
-
         for i, chld in enumerate(self.children):
+            if isinstance(chld, CardStrips):
+                index = chld.index_at(x - self.x, y - self.y, self)
+                if index is not None:
+                    return index
+                continue
             # First try the cheap rectangular bounding-box test
-            if chld.collide_point(x, y):
-                canvas_index = self.canvas.indexof(chld.canvas)
-                if canvas_index > -1:
-                    self.canvas.remove(chld.canvas)
+            if not chld.collide_point(x, y):
+                continue
+            hit = chld.mask_hit(x, y) if isinstance(chld, CardImage) else None
+            if hit is None:
+                hit = self._alpha_hit(chld, x, y)
+            if not hit:
+                continue
+            if self.virtual:
+                state = self._by_widget.get(id(chld))
+                return None if state is None else state.index
+            return n-i
+        return None
 
-                try:
-                    with self._fbo:
-                        kivy.graphics.ClearColor(0, 0, 0, 0)
-                        kivy.graphics.ClearBuffers()
+    def _alpha_hit(self, widget, x, y):
+        # Is `widget` opaque at (x, y)? Looked up in its alpha mask, which
+        # is rendered in widget coordinates. CardImage masks are kept until
+        # the size or face changes, masks of other RevisionTracking widgets
+        # until the size, revision or bound data changes. Masks of other
+        # widgets are not kept, their content may change at any time.
+        # Mostly faded out cards are never hit.
+        if widget.opacity < 0.2:
+            return False
+        w, h = int(widget.width), int(widget.height)
+        if w < 1 or h < 1:
+            return False
+        if isinstance(widget, CardImage):
+            key = (w, h, widget.ids.img.texture, tuple(widget.face_box), widget.flip_scale)
+        elif isinstance(widget, RevisionTracking):
+            state = self._by_widget.get(id(widget))
+            key = (w, h, widget.revision, None if state is None else id(state.data))
+        else:
+            key = None
+        mask = self._hit_masks.get(widget) if key is not None else None
+        if mask is None or mask[0] != key:
+            mask = (key, self._render_alpha(widget, w, h))
+            if self._stats is not None:
+                self._stats.hit_masks += 1
+            if key is not None:
+                self._hit_masks[widget] = mask
+        if hasattr(widget, 'transform_inv'):
+            x, y = widget.to_local(x, y)
+        else:
+            x, y = x - widget.x, y - widget.y
+        x, y = int(x), int(y)
+        return 0 <= x < w and 0 <= y < h and mask[1][y * w + x] > 50
 
-                    self._fbo.add(chld.canvas)
-                    try:
-                        self._fbo.draw()
-                        if self._fbo.get_pixel_color(x, y)[3] > 50:
-                            return n-i
-                    finally:
-                        self._fbo.remove(chld.canvas)
-                finally:
-                    if canvas_index > -1:
-                        self.canvas.insert(canvas_index, chld.canvas)
-        return None
+    def _render_alpha(self, widget, w, h):
+        # Alpha channel of `widget` drawn alone at full opacity into a w x h
+        # Fbo, bottom row first. Modified from Widget.export_to_png()
+        if not hasattr(self, "_fbo"):
+            self._fbo = kivy.graphics.Fbo(size=(w, h), with_stencilbuffer=True)
+        self._fbo.size = (w, h)     # Kivy recreates fbo only if size changes - convenient
+        if hasattr(widget, 'transform_inv'):
+            to_local = widget.transform_inv
+        else:
+            to_local = Matrix().translate(-widget.x, -widget.y, 0)
+
+        Builder.sync()  # Apply pending kv canvas updates (flip_scale) first
+        canvas, opacity = widget.canvas, widget.canvas.opacity
+        canvas_index = self.canvas.indexof(canvas)
+        if canvas_index > -1:
+            self.canvas.remove(canvas)
+        try:
+            with self._fbo:
+                kivy.graphics.ClearColor(0, 0, 0, 0)
+                kivy.graphics.ClearBuffers()
+                kivy.graphics.PushMatrix()
+                kivy.graphics.MatrixInstruction().matrix = to_local
+            self._fbo.add(canvas)
+            self._fbo.add(kivy.graphics.PopMatrix())
+            canvas.opacity = 1
+            self._fbo.draw()
+            return self._fbo.pixels[3::4]
+        finally:
+            canvas.opacity = opacity
+            self._fbo.clear()
+            if canvas_index > -1:
+                self.canvas.insert(canvas_index, canvas)
 
 
     def calculate(self):
         r"""
         Produce a list of card positions (x and y are the card LEFT and
-        BOTTOM):
+        BOTTOM) using the current layout strategy:
 
             [ (x0, y0, rot0), (x1, y1, rot1), ... ]
 
@@ -756,156 +2219,164 @@ class CardFan(Factory.FloatLayout):
         """
         if not self.cards:
             return ()
-        n = len(self.cards)
-        # Full card width for the top card plus one spacing for each other card
-        length_needed = self.card_width + self.spacing * (n - 1)
-        spacing = self.spacing
-
-        if self.min_radius > 0 and n > 1:
-            # "angle" is spread of cards passing through the CENTER of the
-            # cards since it is easier to work with. Thus, only the
-            # spacing needs covered by the angle.
-            o_radius = max(self.min_radius, self.spacing * (n - 1) / radians(self.max_angle))
-            half_angle = self.spacing * (n - 1) / o_radius / 2
-            # Radius through center
-            c_radius = o_radius - self.card_height / 2
-
-            # How wide will we be? We may need to shrink the spacing to
-            # fit. If configured for greater than 180° fan, assume game is
-            # ready for the size. Otherwise, reducing the spacing can help.
-            if half_angle < pi_2:
-                # rotation of the card, furthest point on X from center (twice for left and right)
-                beyond_center = cos(pi_2 + half_angle) * self.card_width + sin(pi_2 + half_angle) * self.card_height
-                available_width = self.width - beyond_center
-                # width from left card center to right card center
-                width = 2 * c_radius * sin(half_angle)
-                if width > available_width:
-                    half_angle = math.asin( available_width / 2 / c_radius )
-                    spacing = available_width / (n - 1)
-
-            # Position offsets
-            x_0 = self.width / 2
-            y_0 = self.height / 2 - c_radius
-
-            # Calculate positions
-            res = []
-            d_theta = -(2 * half_angle) / (n - 1)
-            y_min = c_radius - self.card_height/2
-            for i in range(n):
-                target = CardTarget(x_0, y_0, half_angle + i*d_theta)
-                w, h = target.rotated_size(self.card_width, self.card_height)
-                target.x += c_radius * cos(pi_2 + target.angle) - w/2
-                target.y += c_radius * sin(pi_2 + target.angle) - h/2
-                if target.y < y_min:
-                    y_min = target.y
-                if i in self.lifted_cards:
-                    dx, dy = target.rotated_vector(0, self.lift)
-                    target.x += dx
-                    target.y += dy
-                res.append(target)
-
-            # Rotated cards dip below baseline, optionally shift the cards
-            # up to true center.
-            if self.true_center:
-                height = c_radius + self.card_height/2 - y_min
-                y_off  = (height - self.card_height)/2
-                for t in res:
-                    t.y += y_off
-
-            self.actual_radius = o_radius
-            self.actual_spacing = spacing
-            self.circle_origin_x = x_0
-            self.circle_origin_y = y_0
-            return res
-
-        else:
-            # x, y are the bottom-left of the first card
-            x = (self.width - length_needed) / 2
-            y = self.height / 2 - self.card_height / 2
-            # If container is too small, shrink the spacing and rely on lifting to see the cards
-            if x < 0 and n >= 2:
-                x, spacing = (0, (self.width - self.card_width) / (n - 1))
-
-            self.actual_radius = -1
-            self.actual_spacing = spacing
-            self.circle_origin_x = x
-            self.circle_origin_y = y
-            return [ CardTarget(x + spacing*i, y + self.lift * (i in self.lifted_cards)) for i in range(n) ]
-
+        layout = self.layout
+        if layout is None:
+            # Hot path: the default layouts without the current_layout lookup
+            layout = DEFAULT_ARC if self.min_radius > 0 else DEFAULT_ROW
+        return layout.calculate(self)
 
     def _instant_to_target(self, state):
-        x, y = self.pos
-        widget = state.widget
+        widget, target = state.widget, state.target
         widget.size_hint = (None, None)
         widget.pos_hint = {}
-        widget.opacity = 1
-        widget.size = self.card_size
-        widget.x = state.target.x + x
-        widget.y = state.target.y + y
-        widget.rotation = state.target.rotation
+        self._place(widget, self.x + target.x, self.y + target.y, target.rotation, self.card_size, 1)
+
+    def _place(self, widget, x, y, rotation, size=None, opacity=None):
+        # Bounding box at (x, y), see CardImage.set_placement()
+        if isinstance(widget, CardImage):
+            widget.set_placement(x, y, rotation, size, opacity)
+            return
+        if opacity is not None:
+            widget.opacity = opacity
+        if size is not None:
+            widget.size = size
+        # Rotation moves the bounding box, so must happen before positioning
+        widget.rotation = rotation
+        widget.x = x
+        widget.y = y
+
+    def _settle_to_target(self, state):
+        # Place a card as if its animation had just completed
+        self._cancel_animation(state)
+        state.status = 'ok'
+        self._instant_to_target(state)
 
     def _animate_to_target(self, state):
+        if self._redraw_instant == 'settle' and state.status in ('new', 'mv', 'ok', 'deal'):
+            self._settle_to_target(state)
+            return
         if self._redraw_instant and state.status == 'ok':
             self._instant_to_target(state)
             return
 
-        x, y = self.pos
         widget = state.widget
         widget.size_hint = (None, None)
         widget.pos_hint = {}
-        anims = []
+        tx, ty, rot = self.x + state.target.x, self.y + state.target.y, state.target.rotation
+        cw, ch = self.card_size
+        moves = {}      # property: (start, end, duration)
 
         if state.status == 'new':
-            widget.opacity = 0
-            widget.size = self.card_size
-            widget.x = x + state.target.x
-            widget.y = y + state.target.y
-            widget.rotation = state.target.rotation
-            anims.append(Animation(opacity = 1, duration = self.fade_time))
+            self._place(widget, tx, ty, rot, (cw, ch), 0)
+            moves['opacity'] = (0, 1, self.fade_time)
 
         elif state.status in ('mv', 'ok'):
             times = [ 0.050, self.fade_time ]
 
-            # Rotation "corrects" the x and y position to preserve the
-            # center point (or something). In any case, if we finish our
-            # translation before finishing our rotation, the cards aren't
-            # in the right place. Therefore, make sure the rotation is done
-            # before we finish translation. If we won't have a translation,
-            # force the rotation then reconsider whether we need a translation.
-            dx = abs(widget.x - state.target.x - x)
-            dy = abs(widget.y - state.target.y - y)
+            # Rotating in place moves the bounding box. If we won't have a
+            # translation, force the rotation then reconsider whether we
+            # need a translation.
+            dx = abs(widget.x - tx)
+            dy = abs(widget.y - ty)
             if dx <= 1 and dy <= 1:
-                widget.rotation = state.target.rotation
-                dx = abs(widget.x - state.target.x - x)
-                dy = abs(widget.y - state.target.y - y)
+                self._place(widget, tx, ty, rot)
+                dx = abs(widget.x - tx)
+                dy = abs(widget.y - ty)
             if dx > 1 or dy > 1:
                 dt = min(self.max_animation_time, hypot(dx, dy) / self.linear_speed)
                 times.append(dt)
-                anims.append(Animation(x = state.target.x + x, y = state.target.y + y, duration = dt))
+                moves['x'] = (widget.x, tx, dt)
+                moves['y'] = (widget.y, ty, dt)
 
-                rot = rotation_for_animation(widget.rotation, state.target.rotation)
-                if abs(widget.rotation - rot) > 0.1: # 0.1 degree is sufficient precision
-                    anims.append(Animation(rotation = rot, duration = 0.8 * dt))
+                end = rotation_for_animation(widget.rotation, rot)
+                if abs(widget.rotation - end) > 0.1: # 0.1 degree is sufficient precision
+                    moves['rotation'] = (widget.rotation, end, dt)
 
             if widget.opacity != 1:
-                dt = self.fade_time * (1-widget.opacity)
-                anims.append(Animation(opacity = 1, duration = dt))
+                moves['opacity'] = (widget.opacity, 1, self.fade_time * (1-widget.opacity))
 
             if widget.size != self.card_size:
-                anims.append(Animation(width=self.card_width, height=self.card_height, duration = 0.8 * max(times)))
+                dt = 0.8 * max(times)
+                moves['width'] = (widget.width, cw, dt)
+                moves['height'] = (widget.height, ch, dt)
 
-        elif state.status == 'busy':
-            pass   # Currently in a drag or other operation, do not animate
+        elif state.status in ('busy', 'deal'):
+            pass   # Currently in a drag, deal, or other operation, do not animate
 
         else:
             raise Exception("Didn't expect status '{}'".format(state.status))
 
-        if anims:
-            if state.anim:
-                state.anim.cancel(state.widget)  # Kill without triggering complete
-            anim = anims.pop()
-            for a in anims:
-                anim &= a
-            anim.bind(on_complete=self._animation_complete)
-            state.anim = anim
-            anim.start(state.widget)
+        if moves:
+            # One Animation per card, placing it in one step each frame
+            total = max(d for a, b, d in moves.values())
+            final = dict(x=tx, y=ty, rotation=rot, opacity=1, width=cw, height=ch)
+
+            def update(anim, widget, progress):
+                now = progress * total
+                val = dict(final)
+                for key, (a, b, d) in moves.items():
+                    if now < d:
+                        val[key] = a + (b - a) * now / d
+                self._place(widget, val['x'], val['y'], val['rotation'], (val['width'], val['height']), val['opacity'])
+
+            self._cancel_animation(state)
+            anim = Animation(duration=total)
+            anim.bind(on_progress=update)
+            self._start_animation(state, anim)
+
+    def _start_animation(self, state, anim):
+        anim.bind(on_complete=self._animation_complete)
+        state.anim = anim
+        self._animating += 1
+        anim.start(state.widget)
+        if self._stats is not None:
+            self._stats.animations_started += 1
+
+    def _cancel_animation(self, state):
+        if state.anim:
+            state.anim.cancel(state.widget)  # Kill without triggering complete
+            state.anim = None
+            self._animating = max(0, self._animating - 1)
+            if not self._animating:
+                self._invalidate_hits()
+            if self._stats is not None:
+                self._stats.animations_cancelled += 1
+
+
+class CardFanStatsOverlay(Factory.Label):
+    """
+    Small label showing the live counters of a CardFan. Setting `fan`
+    enables stats on that fan; they are disabled again when `fan` is
+    changed or cleared.
+
+        layout.add_widget(CardFanStatsOverlay(fan=fan))
+    """
+    fan = Factory.ObjectProperty(None, allownone=True)
+
+    def __init__(self, **kwargs):
+        self._fan = None
+        super().__init__(**kwargs)
+
+    def on_fan(self, obj, fan):
+        if self._fan is not None:
+            self._fan.unbind(on_stats=self.update)
+            self._fan.stats_enabled = False
+        self._fan = fan
+        self.text = ''
+        if fan is not None:
+            fan.bind(on_stats=self.update)
+            fan.stats_enabled = True
+
+    def update(self, fan, stats):
+        elapsed = stats['elapsed'] or 1
+        self.text = "\n".join((
+            f"redraws {stats['redraws']} ({1000 * stats['calculate_time'] / max(1, stats['redraws']):.2f} ms calc)",
+            f"anims +{stats['animations_started']} -{stats['animations_cancelled']}",
+            f"widgets new {stats['widgets_created']} reused {stats['widgets_recycled']}",
+            f"hit tests {stats['hit_tests']} ({1000 * stats['hit_test_time'] / max(1, stats['hit_tests']):.2f} ms)",
+            f"events {stats['events']} ({100 * stats['event_time'] / elapsed:.1f}% time)",
+        ))
+
+
+DEFAULT_ROW = RowCardLayout()
+DEFAULT_ARC = ArcCardLayout()
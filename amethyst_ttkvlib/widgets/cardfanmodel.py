@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Card list shared by several CardFan views.
+
+    hand = CardFanModel()
+    slate_fan.model = hand
+    minimap_fan.model = hand
+    hand.append(dict(card=card))    # Both fans animate the new card
+"""
+# SPDX-License-Identifier: GPL-3.0
+__all__ = '''
+CardFanModel
+'''.split()
+
+from kivy.event import EventDispatcher
+from kivy.factory import Factory
+
+
+class CardFanModel(EventDispatcher):
+    """
+    Ordered list of card data and the set of lifted cards, independent of
+    any widget. Each mutation is applied once and dispatched as an event
+    describing the change, which every attached `CardFan` applies to its
+    own widgets, layout, and size.
+
+    Card data are dictionaries as for CardFan. Views attached to a model
+    should be changed only through the model or through the view's
+    `insert()` and `pop()`, which forward to the model.
+
+    :ivar lifted_cards: List of lifted card indexes. Indexes are adjusted
+    as cards are inserted, removed, and moved.
+
+    :ivar count: Number of cards (read-only).
+
+    Events:
+
+    `on_insert(index, data)`: Card inserted at `index`.
+
+    `on_remove(index, data)`: Card removed from `index`.
+
+    `on_move(src, dst)`: Card moved from index `src` to index `dst`.
+
+    `on_reset(cards)`: All cards replaced.
+    """
+    lifted_cards = Factory.ListProperty()
+    count = Factory.NumericProperty(0)
+
+    def __init__(self, cards=(), **kwargs):
+        self._cards = list(cards)
+        self.register_event_type('on_insert')
+        self.register_event_type('on_remove')
+        self.register_event_type('on_move')
+        self.register_event_type('on_reset')
+        super().__init__(**kwargs)
+        self.count = len(self._cards)
+
+    @property
+    def cards(self):
+        """The card list. Do not modify it directly."""
+        return self._cards
+
+    def __len__(self):
+        return len(self._cards)
+    def __getitem__(self, i):
+        return self._cards[i]
+    def __iter__(self):
+        return iter(self._cards)
+
+    def index(self, data):
+        """Index of `data` (compared by identity). Raises ValueError if absent."""
+        for i, d in enumerate(self._cards):
+            if d is data:
+                return i
+        raise ValueError("card not in model")
+
+    def insert(self, index, data):
+        n = len(self._cards)
+        index = max(0, min(n, index + n if index < 0 else index))
+        self._cards.insert(index, data)
+        self.count = len(self._cards)
+        self.dispatch('on_insert', index, data)
+        if any(i >= index for i in self.lifted_cards):
+            self.lifted_cards = [ i + (i >= index) for i in self.lifted_cards ]
+
+    def append(self, data):
+        self.insert(len(self._cards), data)
+
+    def extend(self, cards):
+        for data in cards:
+            self.insert(len(self._cards), data)
+
+    def pop(self, index=-1):
+        """Remove and return the card at `index`."""
+        if index < 0:
+            index += len(self._cards)
+        data = self._cards.pop(index)
+        self.count = len(self._cards)
+        self.dispatch('on_remove', index, data)
+        if any(i >= index for i in self.lifted_cards):
+            self.lifted_cards = [ i - (i > index) for i in self.lifted_cards if i != index ]
+        return data
+
+    def remove(self, data):
+        self.pop(self.index(data))
+
+    def move(self, src, dst):
+        """Move the card at index `src` so that it ends at index `dst`."""
+        n = len(self._cards)
+        src, dst = src % n, dst % n
+        if src == dst:
+            return
+        self._cards.insert(dst, self._cards.pop(src))
+        self.dispatch('on_move', src, dst)
+        if self.lifted_cards:
+            order = list(range(n))
+            order.insert(dst, order.pop(src))
+            new_index = { old: new for new, old in enumerate(order) }
+            self.lifted_cards = [ new_index[i] for i in self.lifted_cards ]
+
+    def reset(self, cards, lifted_cards=()):
+        """Replace all cards and lifted cards."""
+        self._cards = list(cards)
+        self.count = len(self._cards)
+        self.lifted_cards = list(lifted_cards)
+        self.dispatch('on_reset', self._cards)
+
+    def on_insert(self, index, data):
+        pass
+
+    def on_remove(self, index, data):
+        pass
+
+    def on_move(self, src, dst):
+        pass
+
+    def on_reset(self, cards):
+        pass
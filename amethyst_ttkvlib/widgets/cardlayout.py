@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+Layout strategies for CardFan. A strategy computes the target position
+of every card; the CardFan takes care of widgets, recycling, state
+tracking, and animation.
+
+    fan.layout = GridCardLayout(cols=4)
+"""
+# SPDX-License-Identifier: GPL-3.0
+__all__ = '''
+ArcCardLayout
+CardLayout
+CardTarget
+ColumnCardLayout
+GridCardLayout
+RowCardLayout
+StackCardLayout
+'''.split()
+
+import math
+from math import pi, radians, degrees, sin, cos
+pi_2 = pi/2
+
+from kivy.event import EventDispatcher
+from kivy.factory import Factory
+
+
+class CardTarget(object):
+    """
+    Internally used object for tracking a Scatter target positions and rotation.
+
+    (x, y)    - (bottom-left) target position of the card
+
+    angle     - (radians) angle of line passing through middle of the card
+                in Kivy coordinates (0 degrees is up). This is the angle
+                used in computing positions.
+
+    rotation  - (degrees) target rotation of the Scatter, just degrees(angle)
+    sin       - precomputed sin(angle)
+    cos       - precomputed cos(angle)
+    """
+    __slots__ = ('x', 'y', 'angle', 'rotation', 'sin', 'cos')
+    def __init__(self, x, y, angle=0):
+        self.x = x
+        self.y = y
+        if abs(angle) < 0.001:  # Snap to zero
+            self.angle = 0
+            self.rotation = 0
+            self.sin = 0
+            self.cos = 1
+        else:
+            self.angle = angle
+            self.rotation = degrees(angle)
+            self.sin = sin(angle)
+            self.cos = cos(angle)
+    def __str__(self):
+        return "({}, {}) radian={:.3f} degree={:.1f}".format(self.x, self.y, self.angle, self.rotation)
+
+    def rotated_vector(self, x, y):
+        """
+        Rotate a vector by the target angle.
+        """
+        return (self.cos * x - self.sin * y, self.sin * x + self.cos * y)
+
+    def rotated_size(self, w, h):
+        """
+        Size of (minimal) bounding box containing the rotated card.
+        """
+        return (abs(self.cos) * w + abs(self.sin) * h, abs(self.sin) * w + abs(self.cos) * h)
+
+
+class CardLayout(EventDispatcher):
+    """
+    Base class for CardFan layout strategies. Subclasses implement
+    `calculate()` and, when possible, `changed_on_insert()`. Changing any
+    Kivy property of a layout redraws the fans using it.
+
+    Layouts read the general fan properties (`card_width`, `card_height`,
+    `spacing`, `lift`, `lifted_cards`, widget size), and may update the
+    informational `actual_spacing`, `actual_radius`, and `circle_origin`
+    properties of the fan.
+    """
+    def calculate(self, fan):
+        """
+        Returns a list of `CardTarget`, one per card in `fan.cards`.
+        Positions are relative to the fan position.
+        """
+        raise NotImplementedError
+
+    def changed_on_insert(self, fan, index):
+        """
+        Called just after a card has been inserted at `index` (`len(fan)`
+        already includes the new card). Returns an iterable of the card
+        indexes whose targets changed (which must include `index`), or
+        None if any target may have changed. Cards outside the returned
+        indexes keep their targets and are not touched by the next redraw.
+        """
+        return None
+
+
+class RowCardLayout(CardLayout):
+    """
+    Cards in a single horizontal row, centered in the fan, overlapping by
+    `fan.spacing`. The spacing shrinks so that the row never exceeds the
+    fan width. Lifted cards are raised by `fan.lift`.
+    """
+    def calculate(self, fan):
+        n = len(fan.cards)
+        # Full card width for the top card plus one spacing for each other card
+        length_needed = fan.card_width + fan.spacing * (n - 1)
+        spacing = fan.spacing
+
+        # x, y are the bottom-left of the first card
+        x = (fan.width - length_needed) / 2
+        y = fan.height / 2 - fan.card_height / 2
+        # If container is too small, shrink the spacing and rely on lifting to see the cards
+        if x < 0 and n >= 2:
+            x, spacing = (0, (fan.width - fan.card_width) / (n - 1))
+
+        fan.actual_radius = -1
+        fan.actual_spacing = spacing
+        fan.circle_origin_x = x
+        fan.circle_origin_y = y
+        lifted = set(fan.lifted_cards)
+        return [ CardTarget(x + spacing*i, y + fan.lift * (i in lifted)) for i in range(n) ]
+
+
+class ArcCardLayout(CardLayout):
+    """
+    Cards spread along an arc with radius at least `fan.min_radius` and
+    total angle at most `fan.max_angle` (see `CardFan.calculate()`).
+    Lifted cards are moved outward by `fan.lift`.
+    """
+    def calculate(self, fan):
+        n = len(fan.cards)
+        if n < 2:
+            return RowCardLayout.calculate(self, fan)
+
+        # "angle" is spread of cards passing through the CENTER of the
+        # cards since it is easier to work with. Thus, only the
+        # spacing needs covered by the angle.
+        o_radius = max(fan.min_radius, fan.spacing * (n - 1) / radians(fan.max_angle))
+        half_angle = fan.spacing * (n - 1) / o_radius / 2
+        spacing = fan.spacing
+        # Radius through center
+        c_radius = o_radius - fan.card_height / 2
+
+        # How wide will we be? We may need to shrink the spacing to
+        # fit. If configured for greater than 180° fan, assume game is
+        # ready for the size. Otherwise, reducing the spacing can help.
+        if half_angle < pi_2:
+            # rotation of the card, furthest point on X from center (twice for left and right)
+            beyond_center = cos(pi_2 + half_angle) * fan.card_width + sin(pi_2 + half_angle) * fan.card_height
+            available_width = fan.width - beyond_center
+            # width from left card center to right card center
+            width = 2 * c_radius * sin(half_angle)
+            if width > available_width:
+                half_angle = math.asin( available_width / 2 / c_radius )
+                spacing = available_width / (n - 1)
+
+        # Position offsets
+        x_0 = fan.width / 2
+        y_0 = fan.height / 2 - c_radius
+
+        # Calculate positions
+        res = []
+        lifted = set(fan.lifted_cards)
+        d_theta = -(2 * half_angle) / (n - 1)
+        y_min = c_radius - fan.card_height/2
+        for i in range(n):
+            target = CardTarget(x_0, y_0, half_angle + i*d_theta)
+            w, h = target.rotated_size(fan.card_width, fan.card_height)
+            target.x += c_radius * cos(pi_2 + target.angle) - w/2
+            target.y += c_radius * sin(pi_2 + target.angle) - h/2
+            if target.y < y_min:
+                y_min = target.y
+            if i in lifted:
+                dx, dy = target.rotated_vector(0, fan.lift)
+                target.x += dx
+                target.y += dy
+            res.append(target)
+
+        # Rotated cards dip below baseline, optionally shift the cards
+        # up to true center.
+        if fan.true_center:
+            height = c_radius + fan.card_height/2 - y_min
+            y_off  = (height - fan.card_height)/2
+            for t in res:
+                t.y += y_off
+
+        fan.actual_radius = o_radius
+        fan.actual_spacing = spacing
+        fan.circle_origin_x = x_0
+        fan.circle_origin_y = y_0
+        return res
+
+
+class GridCardLayout(CardLayout):
+    """
+    Cards in rows, left to right then top to bottom, starting from the top
+    of the fan. Lifted cards are raised by `fan.lift`.
+
+    :ivar cols: Number of columns. When 0 (the default), as many columns
+    as fit in the fan width.
+
+    :ivar padding: Space between cards (default 8).
+    """
+    cols = Factory.NumericProperty(0)
+    padding = Factory.NumericProperty(8)
+
+    def columns(self, fan):
+        if self.cols > 0:
+            return int(self.cols)
+        return max(1, int((fan.width + self.padding) // (fan.card_width + self.padding)))
+
+    def calculate(self, fan):
+        cols = self.columns(fan)
+        dx, dy = fan.card_width + self.padding, fan.card_height + self.padding
+        x0 = (fan.width - cols * dx + self.padding) / 2
+        y0 = fan.height - fan.card_height
+        fan.actual_radius = -1
+        fan.actual_spacing = dx
+        fan.circle_origin_x = x0
+        fan.circle_origin_y = y0
+        lifted = set(fan.lifted_cards)
+        return [ CardTarget(x0 + dx * (i % cols), y0 - dy * (i // cols) + fan.lift * (i in lifted)) for i in range(len(fan.cards)) ]
+
+    def changed_on_insert(self, fan, index):
+        return range(index, len(fan.cards))
+
+
+class StackCardLayout(CardLayout):
+    """
+    A pile of cards centered in the fan. Each card is offset from the one
+    below it by (`offset_x`, `offset_y`), up to `depth` offsets, so that
+    the thickness of the pile is visible. Lifted cards are raised by
+    `fan.lift`.
+    """
+    offset_x = Factory.NumericProperty(0)
+    offset_y = Factory.NumericProperty(2)
+    depth = Factory.NumericProperty(8)
+
+    def calculate(self, fan):
+        x0 = (fan.width - fan.card_width) / 2
+        y0 = (fan.height - fan.card_height) / 2
+        depth = int(self.depth)
+        fan.actual_radius = -1
+        fan.actual_spacing = 0
+        fan.circle_origin_x = x0
+        fan.circle_origin_y = y0
+        lifted = set(fan.lifted_cards)
+        res = []
+        for i in range(len(fan.cards)):
+            k = min(i, depth)
+            res.append(CardTarget(x0 + k * self.offset_x, y0 + k * self.offset_y + fan.lift * (i in lifted)))
+        return res
+
+    def changed_on_insert(self, fan, index):
+        # Cards beyond the depth all sit at the same offset, except that
+        # the lift passes from each lifted card to the one before it
+        n = len(fan.cards)
+        changed = set(range(index, max(index + 1, min(n, int(self.depth) + 1))))
+        for i in fan.lifted_cards:
+            if i >= index:
+                changed.update(j for j in (i, i + 1) if j < n)
+        return changed
+
+
+class ColumnCardLayout(CardLayout):
+    """
+    A tableau column: cards from the top of the fan downward, each
+    overlapping the previous one leaving `fan.spacing` visible. The spacing
+    shrinks so that the column never exceeds the fan height. Lifted cards
+    are moved right by `fan.lift`.
+    """
+    def _spacing(self, fan, n):
+        if n > 1 and fan.card_height + fan.spacing * (n - 1) > fan.height:
+            return max(0, (fan.height - fan.card_height) / (n - 1))
+        return fan.spacing
+
+    def calculate(self, fan):
+        n = len(fan.cards)
+        spacing = self._spacing(fan, n)
+        x0 = (fan.width - fan.card_width) / 2
+        y0 = fan.height - fan.card_height
+        fan.actual_radius = -1
+        fan.actual_spacing = spacing
+        fan.circle_origin_x = x0
+        fan.circle_origin_y = y0
+        lifted = set(fan.lifted_cards)
+        return [ CardTarget(x0 + fan.lift * (i in lifted), y0 - spacing * i) for i in range(n) ]
+
+    def changed_on_insert(self, fan, index):
+        n = len(fan.cards)
+        if self._spacing(fan, n) != fan.spacing:
+            return None     # Column was squeezed, everything moves
+        return range(index, n)
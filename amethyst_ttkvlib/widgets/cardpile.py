@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Draw and discard piles of any depth at constant cost.
+"""
+# SPDX-License-Identifier: GPL-3.0
+__all__ = '''
+CardPile
+'''.split()
+
+from math import atan2, degrees, hypot
+
+from kivy.factory import Factory
+import kivy.graphics
+
+from amethyst_ttkvlib.widgets.cardfan import ICardFanReset
+
+
+class CardPile(Factory.Widget):
+    """
+    A pile of cards drawn as a single top card widget plus the visible
+    edge of the cards below it. The edge is one Mesh instruction whose
+    thickness grows with the number of cards (up to `edge_max` cards), so
+    the cost of a pile does not depend on its size.
+
+    Cards are data dictionaries as for CardFan; the top card's items are
+    set as attributes on the top card widget.
+
+        pile = CardPile(back_source='card-back.png')
+        pile.push(dict(card=card))
+        pile.deal_to(fan)       # animate the top card into the fan
+
+    :ivar card_widget: Factory name or class of the top card widget
+    (default "CardImage").
+
+    :ivar show_front: Boolean property which defaults to False (a face-down
+    pile). Cards whose data includes "show_front" override this value.
+
+    :ivar back_source: Image source shown for face-down cards unless the
+    card data provides one.
+
+    :ivar edge_step_x, edge_step_y: Offset of the pile edge per card below
+    the top card (default 0.25, -0.5). `edge_step` is the
+    ReferenceListProperty of the two.
+
+    :ivar edge_max: Number of cards after which the edge stops growing.
+
+    :ivar edge_color: Color of the pile edge.
+
+    :ivar count: Number of cards in the pile (read-only).
+
+    :ivar top_card: Data of the top card or None (read-only).
+
+    :ivar top_widget: The widget displaying the top card.
+    """
+    card_widget = Factory.ObjectProperty('CardImage')
+    show_front = Factory.BooleanProperty(False)
+    back_source = Factory.StringProperty(None, allownone=True)
+
+    edge_step_x = Factory.NumericProperty(0.25)
+    edge_step_y = Factory.NumericProperty(-0.5)
+    edge_step = Factory.ReferenceListProperty(edge_step_x, edge_step_y)
+    edge_max = Factory.NumericProperty(52)
+    edge_color = Factory.ListProperty([0.85, 0.85, 0.8, 1])
+
+    count = Factory.NumericProperty(0)
+    top_card = Factory.ObjectProperty(None, allownone=True)
+    top_widget = Factory.ObjectProperty(None, allownone=True)
+
+    def __init__(self, **kwargs):
+        self._cards = []
+        self._edge_color = None
+        super().__init__(**kwargs)
+        with self.canvas.before:
+            self._edge_color = kivy.graphics.Color(*self.edge_color)
+            self._edge = kivy.graphics.Mesh(mode='triangle_fan', fmt=[(b'vPosition', 2, 'float')])
+        self.on_card_widget(self, self.card_widget)
+        self._update_edge()
+        for prop in ('pos', 'size', 'count', 'edge_step', 'edge_max'):
+            self.fbind(prop, self._update_edge)
+        self.fbind('pos', self._place_top)
+        self.fbind('size', self._place_top)
+        self.fbind('show_front', self._update_top)
+        self.fbind('back_source', self._update_top)
+
+    def __len__(self):
+        return len(self._cards)
+
+    def push(self, data):
+        """Place a card on top of the pile."""
+        self._cards.append(data)
+        self._changed()
+
+    def extend(self, cards):
+        """Push several cards, the last one ending on top."""
+        self._cards.extend(cards)
+        self._changed()
+
+    def pop(self):
+        """Remove and return the top card. Raises IndexError if empty."""
+        data = self._cards.pop()
+        self._changed()
+        return data
+
+    def peek(self):
+        """Return the top card without removing it, or None if empty."""
+        return self._cards[-1] if self._cards else None
+
+    def clear(self):
+        del self._cards[:]
+        self._changed()
+
+    def _changed(self):
+        self.count = len(self._cards)
+        self.top_card = self.peek()
+        self._update_top()
+
+    def on_edge_color(self, obj, color):
+        if self._edge_color is not None:
+            self._edge_color.rgba = color
+
+    def on_card_widget(self, obj, val):
+        if self._edge_color is None:
+            return  # Still initializing
+        if self.top_widget is not None:
+            self.remove_widget(self.top_widget)
+        widget = getattr(Factory, val)() if isinstance(val, str) else val()
+        widget.size_hint = (None, None)
+        self.top_widget = widget
+        self.add_widget(widget)
+        self._place_top()
+        self._update_top()
+
+    def _place_top(self, *args):
+        widget = self.top_widget
+        widget.rotation = 0
+        widget.size = self.size
+        widget.pos = self.pos
+
+    def _update_top(self, *args):
+        widget = self.top_widget
+        data = self.top_card
+        if isinstance(widget, ICardFanReset):
+            widget.clear()
+        if data is None:
+            widget.opacity = 0
+            return
+        widget.opacity = 1
+        widget.show_front = self.show_front
+        if self.back_source is not None:
+            widget.back_source = self.back_source
+        for k, v in data.items():
+            setattr(widget, k, v)
+
+    def _update_edge(self, *args):
+        depth = min(max(0, self.count - 1), self.edge_max)
+        dx, dy = depth * self.edge_step_x, depth * self.edge_step_y
+        if not (dx or dy):
+            self._edge.vertices = []
+            self._edge.indices = []
+            return
+        # Outline of the card rectangle swept from the top card to the
+        # bottom card; convex, so a triangle fan from its center works.
+        x, y, w, h = self.x, self.y, self.width, self.height
+        corners = [ (x, y), (x + w, y), (x + w, y + h), (x, y + h) ]
+        points = _convex_hull(corners + [ (cx + dx, cy + dy) for cx, cy in corners ])
+        center = (x + w/2 + dx/2, y + h/2 + dy/2)
+        vertices = list(center)
+        for px, py in points + points[:1]:
+            vertices.extend((px, py))
+        self._edge.vertices = vertices
+        self._edge.indices = list(range(len(vertices) // 2))
+
+    def deal_to(self, fan, index=None, data=None):
+        """
+        Move the top card (or `data`, already removed by the caller) into
+        `fan` at `index` (default: the end). The fan's card widget starts
+        exactly on top of the pile, mapped through any Scatter transforms
+        between the two, and the fan animates it into place.
+
+        Returns the card data or None if the pile is empty.
+        """
+        if data is None:
+            if not self._cards:
+                return None
+            data = self.pop()
+        widget = fan.get_card_widget()
+        widget.size_hint = (None, None)
+        widget.pos_hint = {}
+        widget.show_front = self.show_front
+        if self.back_source is not None:
+            widget.back_source = self.back_source
+
+        # Map the pile's bottom edge into fan coordinates to get the shared
+        # position, scale, and rotation.
+        x0, y0 = fan.to_widget(*self.to_window(self.x, self.y))
+        x1, y1 = fan.to_widget(*self.to_window(self.right, self.y))
+        cx, cy = fan.to_widget(*self.to_window(*self.center))
+        scale = hypot(x1 - x0, y1 - y0) / self.width if self.width else 1
+        widget.rotation = degrees(atan2(y1 - y0, x1 - x0))
+        widget.size = (self.width * scale, self.height * scale)
+        widget.center = (cx, cy)
+        fan.insert(len(fan) if index is None else index, data, widget=widget)
+        return data
+
+    async def async_deal_to(self, fan, index=None, data=None):
+        """
+        Coroutine version of `deal_to()`, returns the card data once the
+        card is in place in `fan` (or None if the pile is empty). See
+        `CardFan.async_insert()` for cancellation.
+        """
+        if data is None:
+            if not self._cards:
+                return None
+            data = self.pop()
+        fut = fan.card_added_future(data)
+        self.deal_to(fan, index, data)
+        await fut
+        return data
+
+
+def _convex_hull(points):
+    # Monotone chain, counter-clockwise
+    points = sorted(set(points))
+    if len(points) < 3:
+        return points
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+    lower, upper = [], []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Indexed name and flag queries over the cards of one or more CardFans.
+
+    index = CardFilterIndex(fans=[hand, table])
+    index.highlight(flags=["playable"])     # Tint every playable card
+    index.highlight()                       # Remove all highlights
+"""
+# SPDX-License-Identifier: GPL-3.0
+__all__ = '''
+CardFilterIndex
+'''.split()
+
+import weakref
+
+from kivy.clock import Clock
+from kivy.event import EventDispatcher
+from kivy.factory import Factory
+
+from amethyst_ttkvlib.widgets.cardfan import CardImage, card_attr
+
+
+class CardFilterIndex(EventDispatcher):
+    """
+    Index of the `name` and `flags` (see `IFilterable`) of every card in
+    the watched fans. Each card gets a bit slot; each name and flag maps
+    to an integer bitset of the cards having it, so a query is a few
+    integer operations regardless of the number of cards.
+
+    Names and flags are taken from the card widget when it is a CardImage
+    (which may override its card), else from the data dictionary or its
+    "card" object. The index follows changes incrementally: changes to a
+    fan's `cards` are merged on the next query, and a change to the
+    `revision` or `card` of a CardImage re-indexes just that card. Changes
+    to cards without a widget (virtual cards) need a call to `refresh()`.
+
+    :ivar highlight_tint: Tint applied to highlighted cards.
+
+    :ivar highlight_count: Number of currently highlighted cards (read-only).
+    """
+    highlight_tint = Factory.ListProperty([1, 0.9, 0.5, 1])
+    highlight_count = Factory.NumericProperty(0)
+
+    def __init__(self, fans=(), **kwargs):
+        self._fans = []
+        self._slots = {}        # (id(fan), id(data)) -> slot
+        self._entries = []      # slot -> (fan, data) or None
+        self._keys = []         # slot -> (name, flags)
+        self._free = []
+        self._names = {}        # name -> bitset
+        self._flags = {}        # flag -> bitset
+        self._all = 0
+        self._stale = set()     # ids of fans whose cards changed
+        self._widgets = weakref.WeakSet()   # widgets we are bound to
+        self._query = None      # current highlight query
+        self._highlight = 0     # bitset of highlighted cards
+        self._tinted = {}       # id(widget) -> widget
+        self._apply_highlight = Clock.create_trigger(self._update_tints)
+        super().__init__(**kwargs)
+        for fan in fans:
+            self.add_fan(fan)
+
+    def add_fan(self, fan):
+        if fan in self._fans:
+            return
+        self._fans.append(fan)
+        fan.bind(cards=self._on_cards, on_card_add=self._on_card_add)
+        self._stale.add(id(fan))
+
+    def remove_fan(self, fan):
+        if fan not in self._fans:
+            return
+        self._sync()
+        fan.unbind(cards=self._on_cards, on_card_add=self._on_card_add)
+        self._fans.remove(fan)
+        for slot, entry in enumerate(self._entries):
+            if entry is not None and entry[0] is fan:
+                self._remove(slot)
+        self._apply_highlight()
+
+    def refresh(self, data=None):
+        """Re-index the card `data`, or every card if None."""
+        self._sync()
+        if data is None:
+            for slot, entry in enumerate(self._entries):
+                if entry is not None:
+                    self._index(slot)
+        else:
+            # Fans sharing a CardFanModel hold the same data
+            for fan in self._fans:
+                slot = self._slots.get((id(fan), id(data)))
+                if slot is not None:
+                    self._index(slot)
+        self._rehighlight()
+
+    def select(self, name=None, flags=(), any_flags=(), exclude_flags=()):
+        """
+        Bitset of the cards named `name` (if not None) having all of
+        `flags`, at least one of `any_flags` (if any), and none of
+        `exclude_flags`.
+        """
+        self._sync()
+        bits = self._all
+        if name is not None:
+            bits &= self._names.get(name, 0)
+        for flag in flags:
+            bits &= self._flags.get(flag, 0)
+        if any_flags:
+            some = 0
+            for flag in any_flags:
+                some |= self._flags.get(flag, 0)
+            bits &= some
+        for flag in exclude_flags:
+            bits &= ~self._flags.get(flag, 0)
+        return bits
+
+    def matches(self, *args, **kwargs):
+        """
+        List of `(fan, data)` for the cards matching a query (see
+        `select()`), in no particular order.
+        """
+        return [ self._entries[slot] for slot in _slots_of(self.select(*args, **kwargs)) ]
+
+    def count(self, *args, **kwargs):
+        """Number of cards matching a query (see `select()`)."""
+        return bin(self.select(*args, **kwargs)).count("1")
+
+    def highlight(self, name=None, flags=(), any_flags=(), exclude_flags=()):
+        """
+        Tint the cards matching a query (see `select()`) and remove the
+        tint from all others. Without arguments, removes all highlights.
+        The query is kept, and re-applied as cards change. Tints are
+        updated once per frame, only on cards whose highlight changed.
+        """
+        if name is None and not (flags or any_flags or exclude_flags):
+            self._query = None
+        else:
+            self._query = (name, tuple(flags), tuple(any_flags), tuple(exclude_flags))
+        self._rehighlight()
+
+    def on_highlight_tint(self, obj, val):
+        for widget in self._tinted.values():
+            widget.tint = val
+
+    def _rehighlight(self):
+        self._highlight = 0 if self._query is None else self.select(*self._query)
+        self.highlight_count = bin(self._highlight).count("1")
+        self._apply_highlight()
+
+    def _update_tints(self, *args):
+        if self._query is not None and self._stale:
+            self._highlight = self.select(*self._query)
+            self.highlight_count = bin(self._highlight).count("1")
+        white = [1, 1, 1, 1]
+        want = {}
+        for slot in _slots_of(self._highlight):
+            fan, data = self._entries[slot]
+            state = fan._by_data.get(id(data))
+            if state is not None and isinstance(state.widget, CardImage):
+                want[id(state.widget)] = state.widget
+        for key, widget in self._tinted.items():
+            if key not in want:
+                widget.tint = white
+        # Recycled widgets lose their tint, so compare rather than trust _tinted
+        tint = list(self.highlight_tint)
+        for widget in want.values():
+            if widget.tint != tint:
+                widget.tint = tint
+        self._tinted = want
+
+    def _on_cards(self, fan, cards):
+        self._stale.add(id(fan))
+        if self._query is not None:
+            self._apply_highlight()
+
+    def _on_card_add(self, fan, index, data, widget):
+        self._watch(widget)
+        if self._query is not None:
+            self._apply_highlight()
+
+    def _on_widget_changed(self, widget, value):
+        for fan in self._fans:
+            state = fan._by_widget.get(id(widget))
+            if state is not None:
+                slot = self._slots.get((id(fan), id(state.data)))
+                if slot is not None:
+                    self._index(slot)
+                    if self._query is not None:
+                        self._rehighlight()
+                return
+
+    def _watch(self, widget):
+        if isinstance(widget, CardImage) and widget not in self._widgets:
+            self._widgets.add(widget)
+            widget.bind(revision=self._on_widget_changed, card=self._on_widget_changed)
+
+    def _sync(self):
+        # Merge card list changes of stale fans
+        if not self._stale:
+            return
+        for fan in self._fans:
+            if id(fan) not in self._stale:
+                continue
+            current = { id(data): data for data in fan.cards }
+            for slot, entry in enumerate(self._entries):
+                if entry is not None and entry[0] is fan and id(entry[1]) not in current:
+                    self._remove(slot)
+            for key, data in current.items():
+                if (id(fan), key) not in self._slots:
+                    self._add(fan, data)
+            for state in fan._by_data.values():
+                self._watch(state.widget)
+        self._stale.clear()
+
+    def _add(self, fan, data):
+        if self._free:
+            slot = self._free.pop()
+            self._entries[slot] = (fan, data)
+        else:
+            slot = len(self._entries)
+            self._entries.append((fan, data))
+            self._keys.append((None, ()))
+        self._slots[(id(fan), id(data))] = slot
+        self._all |= 1 << slot
+        self._index(slot)
+
+    def _remove(self, slot):
+        self._unindex(slot)
+        fan, data = self._entries[slot]
+        del self._slots[(id(fan), id(data))]
+        self._entries[slot] = None
+        self._all &= ~(1 << slot)
+        self._highlight &= ~(1 << slot)
+        self._free.append(slot)
+
+    def _index(self, slot):
+        self._unindex(slot)
+        fan, data = self._entries[slot]
+        state = fan._by_data.get(id(data))
+        source = state.widget if state is not None and isinstance(state.widget, CardImage) else None
+        if source is not None:
+            name, flags = source.name, source.flags
+        else:
+            name, flags = card_attr(data, 'name'), card_attr(data, 'flags')
+        if isinstance(flags, str):
+            flags = (flags,)
+        flags = tuple(flags or ())
+        bit = 1 << slot
+        if name is not None:
+            self._names[name] = self._names.get(name, 0) | bit
+        for flag in flags:
+            self._flags[flag] = self._flags.get(flag, 0) | bit
+        self._keys[slot] = (name, flags)
+
+    def _unindex(self, slot):
+        name, flags = self._keys[slot]
+        mask = ~(1 << slot)
+        if name is not None:
+            self._names[name] &= mask
+        for flag in flags:
+            self._flags[flag] &= mask
+        self._keys[slot] = (None, ())
+
+
+def _slots_of(bits):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
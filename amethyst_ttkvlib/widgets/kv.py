@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+"""
+kv rules of the library widgets. Loaded when `amethyst_ttkvlib.widgets` is
+imported, ahead of the widget modules themselves, so that application kv
+loaded later overrides them.
+"""
+from kivy.lang import Builder
+
+Builder.load_string('''
+<CardImage>:
+    do_rotation: False
+    do_scale: False
+    do_translation: False
+
+    canvas.after:
+        Color:
+            rgba: (1,0,0,0.75)
+        Ellipse:
+            pos: (self.x-3,self.y-3)
+            size: (6,6)
+
+    Image:
+        id: img
+        pos: root.width * root.face_box[0], root.height * root.face_box[1]
+        size: root.width * root.face_box[2], root.height * root.face_box[3]
+        source: ((root.source if root.show_front else root.back_source) or '') if (root.face_fallback or not (root.texture_cache or root.keep_faces)) else ''
+        mipmap: root.lod and (root.face_fallback or not root.texture_cache)
+        fit_mode: 'contain'
+        color: root.tint
+        canvas.before:
+            PushMatrix
+            Scale:
+                origin: self.center
+                x: root.flip_scale
+        canvas.after:
+            PopMatrix
+
+<CardFan>:
+    default_drag_distance: min(inch(.125), self.card_width/10, self.card_height/10)
+
+<CardFanStatsOverlay>:
+    size_hint: None, None
+    size: self.texture_size
+    padding: 4, 4
+    font_size: '11sp'
+    canvas.before:
+        Color:
+            rgba: (0, 0, 0, 0.6)
+        Rectangle:
+            pos: self.pos
+            size: self.size
+
+<Slate>:
+    do_scale: False
+    do_collide_after_children: True
+    size_hint: None, None
+
+    width: root.content_width
+    height: root.content_height + root.header_height
+
+    RelativeLayout:
+        id: head_container
+        width: root.content_width
+        height: root.header_height
+        pos: (0, root.content_height)
+
+    RelativeLayout:
+        id: content_container
+        width: root.content_width
+        height: root.content_height
+        pos: (0, 0)
+''')
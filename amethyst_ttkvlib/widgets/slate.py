@@ -8,40 +8,30 @@ Slate
 '''.split()
 
 from kivy.animation import Animation
+from kivy.clock import Clock
 from kivy.factory import Factory
-from kivy.lang import Builder
 import kivy.app
+import kivy.graphics
 
 from amethyst.core.util import get_class
 
 import amethyst_ttkvlib.behaviors.slate
+from amethyst_ttkvlib.trace import traced
 
 # slate.pos: is position in its container
 
-Builder.load_string('''
-<Slate>:
-    do_scale: False
-    do_collide_after_children: True
-    size_hint: None, None
-
-    width: root.content_width
-    height: root.content_height + root.header_height
-
-    RelativeLayout:
-        id: head_container
-        width: root.content_width
-        height: root.header_height
-        pos: (0, root.content_height)
-
-    RelativeLayout:
-        id: content_container
-        width: root.content_width
-        height: root.content_height
-        pos: (0, 0)
-''')
-
 
 class Slate(Factory.PlayerSlateBehavior, Factory.SlateSubwidgetBehavior, Factory.Scatter):
+    """
+    :ivar frozen: Boolean property which defaults to False. When True, the
+    header and content are rendered once into an offscreen texture and
+    only that texture is drawn each frame. The snapshot is refreshed
+    automatically when a game notice is dispatched to the slate, when the
+    header or content is replaced, when the slate is resized, or after a
+    touch on the slate, and then every frame for as long as any card fan
+    in the slate is animating (see `CardFan.is_animating()`). Call
+    `refresh_snapshot()` to force a refresh after any other change.
+    """
     header = Factory.ObjectProperty()
     content = Factory.ObjectProperty()
 
@@ -53,31 +43,126 @@ class Slate(Factory.PlayerSlateBehavior, Factory.SlateSubwidgetBehavior, Factory
     header_class = Factory.ObjectProperty()
     header_height = Factory.NumericProperty(32)
 
+    frozen = Factory.BooleanProperty(False)
+
+    def __init__(self, **kwargs):
+        self._snapshot = None
+        self.refresh_snapshot = Clock.create_trigger(self._refresh_snapshot)
+        super().__init__(**kwargs)
+
     @property
     def app(self):
         return kivy.app.App.get_running_app()
 
+    def on_frozen(self, obj, frozen):
+        if frozen:
+            self._freeze()
+        else:
+            self._thaw()
+
+    def _freeze(self):
+        if self._snapshot is not None:
+            return
+        fbo = kivy.graphics.Fbo(size=self.size, with_stencilbuffer=True)
+        with fbo:
+            kivy.graphics.ClearColor(0, 0, 0, 0)
+            kivy.graphics.ClearBuffers()
+
+        # Move the canvas of each child (in drawing order) out of the live
+        # canvas tree and into the fbo. While frozen, the only thing left
+        # for the renderer is a single textured quad.
+        moved = [ (self.canvas.indexof(child.canvas), child) for child in self.children ]
+        moved = sorted((x for x in moved if x[0] > -1), key=lambda x: x[0])
+        for index, child in moved:
+            self.canvas.remove(child.canvas)
+            fbo.add(child.canvas)
+
+        quad = kivy.graphics.InstructionGroup()
+        quad.add(kivy.graphics.Color(1, 1, 1, 1))
+        rect = kivy.graphics.Rectangle(texture=fbo.texture, pos=(0, 0), size=self.size)
+        quad.add(rect)
+        self.canvas.add(quad)
+
+        self._snapshot = (fbo, quad, rect, moved)
+        self._refresh_snapshot()
+
+    def _thaw(self):
+        if self._snapshot is None:
+            return
+        fbo, quad, rect, moved = self._snapshot
+        self._snapshot = None
+        self.refresh_snapshot.cancel()
+        self.canvas.remove(quad)
+        for index, child in moved:
+            fbo.remove(child.canvas)
+            if child.parent is self:
+                self.canvas.insert(index, child.canvas)
+
+    def _refresh_snapshot(self, *args):
+        if self._snapshot is None:
+            return
+        fbo, quad, rect, moved = self._snapshot
+        if tuple(fbo.size) != tuple(self.size):
+            # Kivy recreates the fbo texture when its size changes
+            fbo.size = self.size
+            rect.texture = fbo.texture
+        rect.size = self.size
+        fbo.draw()
+        # Triggers a redraw of the quad
+        self.canvas.ask_update()
+        if self._animating():
+            self.refresh_snapshot()     # Again next frame, until the fans settle
+
+    def _animating(self):
+        for widget in self.walk(restrict=True):
+            is_animating = getattr(widget, 'is_animating', None)
+            if is_animating is not None and is_animating():
+                return True
+        return False
+
+    def on_size(self, obj, size):
+        if self._snapshot is not None:
+            self.refresh_snapshot()
+
+    def dispatch_notice(self, game, seq, player_num, notice):
+        super().dispatch_notice(game, seq, player_num, notice)
+        if self._snapshot is not None:
+            self.refresh_snapshot()
+
+    def on_touch_up(self, touch):
+        if self._snapshot is not None and self.collide_point(*touch.pos):
+            self.refresh_snapshot()
+        return super().on_touch_up(touch)
+
+    @traced("Slate.on_content_class", "slate")
     def on_content_class(self, obj, cls):
         if isinstance(cls, str):
             cls = getattr(Factory, cls)
         if cls is not None:
             self.content = cls()
 
+    @traced("Slate.on_content", "slate")
     def on_content(self, obj, content):
         container = self.ids['content_container']
         container.clear_widgets()
         container.add_widget(content)
+        if self._snapshot is not None:
+            self.refresh_snapshot()
 
+    @traced("Slate.on_header_class", "slate")
     def on_header_class(self, obj, cls):
         if isinstance(cls, str):
             cls = getattr(Factory, cls)
         if cls is not None:
             self.header = cls()
 
+    @traced("Slate.on_header", "slate")
     def on_header(self, obj, header):
         container = self.ids['head_container']
         container.clear_widgets()
         container.add_widget(header)
+        if self._snapshot is not None:
+            self.refresh_snapshot()
 
     @property
     def slate(self):
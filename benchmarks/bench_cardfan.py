@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+"""
+CardFan hot path benchmarks on a hidden Kivy window.
+
+Measures calculate(), _redraw(), card_at_point() (rendered hit test,
+alpha mask lookup and hit cache), drag moves and insert/pop churn for
+several fan sizes in flat and circular layouts, and offscreen
+BatchRenderer frames of a hand. Each result (seconds per operation) is
+the best of several rounds, so that a busy machine inflates it as
+little as possible. Results may be saved as a JSON baseline and later
+runs compared against it:
+
+    python3 benchmarks/bench_cardfan.py --save benchmarks/baselines/cardfan.json
+    python3 benchmarks/bench_cardfan.py --compare benchmarks/baselines/cardfan.json
+
+When comparing, the exit status is non-zero if any case is slower than
+its baseline by more than the threshold (the baseline file "threshold"
+key, optionally overridden per case in "thresholds").
+"""
+import sys
+from os.path import dirname, abspath, join
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+_argv, sys.argv = sys.argv, [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import argparse
+import json
+import platform
+import random
+import tempfile
+import time
+
+from kivy.config import Config
+Config.set('graphics', 'window_state', 'hidden')
+from kivy.base import EventLoop
+from kivy.tests.common import UnitTestTouch
+
+from amethyst_ttkvlib.render import BatchRenderer
+from amethyst_ttkvlib.widgets.cardfan import CardFan
+
+SIZES = (10, 50, 200, 1000)
+MODES = { 'flat': -1, 'circular': 2000 }
+EXAMPLES = join(dirname(dirname(abspath(__file__))), "examples", "cardfan")
+SOURCE = join(EXAMPLES, "card-1.png")
+RENDER_SIZE = (800, 300)
+DEFAULT_THRESHOLD = 1.25
+
+
+def timed(func, min_time=0.5, max_loops=10000, rounds=10):
+    """
+    Seconds per call of `func()`: the best of `rounds` rounds, each
+    repeating the call until `min_time / rounds` elapses.
+    """
+    func()  # warm up caches and lazily created objects
+    best = None
+    for i in range(rounds):
+        loops, elapsed = 0, 0
+        t0 = time.perf_counter()
+        while elapsed < min_time / rounds and loops < max_loops:
+            func()
+            loops += 1
+            elapsed = time.perf_counter() - t0
+        if best is None or elapsed / loops < best:
+            best = elapsed / loops
+    return best
+
+
+def make_fan(n, min_radius):
+    fan = CardFan(size_hint=(None, None))
+    fan.size = EventLoop.window.size
+    fan.min_radius = min_radius
+    fan.fade_time = 0
+    fan.long_press_time = 0
+    fan.fast_forward = True
+    fan.cards = [ dict(id=i, source=SOURCE) for i in range(n) ]
+    fan.fast_forward = False    # settles all cards without animation
+    EventLoop.window.add_widget(fan)
+    EventLoop.idle()            # images finish updating on the next frame
+    return fan
+
+
+def bench_drag(fan, rng, min_time):
+    index = len(fan) // 2
+    widget = fan.children[len(fan) - 1 - index]
+    touch = UnitTestTouch(*widget.center)
+    touch.scale_for_screen(*EventLoop.window.size)
+    if not fan.on_touch_down(touch):
+        raise Exception("Drag benchmark touch missed the fan")
+    touch.grab_current = fan
+    moves = [ (rng.uniform(-3, 3), rng.uniform(-3, 3)) for i in range(50) ]
+
+    def move_to(x, y):
+        touch.move(dict(x=x / (EventLoop.window.width - 1.0), y=y / (EventLoop.window.height - 1.0)))
+        touch.scale_for_screen(*EventLoop.window.size)
+        fan.on_touch_move(touch)
+
+    def move():
+        for dx, dy in moves:
+            move_to(touch.x + dx, touch.y + dy)
+    # First move starts the drag
+    move_to(touch.x + 50, touch.y)
+    res = timed(move, min_time) / len(moves)
+    fan.on_touch_up(touch)
+    return res
+
+
+def bench_churn(fan, rng, min_time):
+    def churn():
+        n = len(fan)
+        data = fan.pop(rng.randrange(n))
+        fan.insert(rng.randrange(n), data)
+        fan.redraw.cancel()
+        fan._redraw()
+    return timed(churn, min_time)
+
+
+def bench_render(n, rng, min_time):
+    # Frames of an n card hand, a different hand each frame, PNGs written
+    # by the renderer's threads (render() blocks once they fall behind)
+    sources = [ join(EXAMPLES, f"card-{i}.png") for i in range(1, 4) ]
+    hands = [ [ dict(id=i, source=rng.choice(sources)) for i in range(n) ] for j in range(8) ]
+    frame = iter(range(10**9))
+    with tempfile.TemporaryDirectory() as path:
+        with BatchRenderer(CardFan(card_size=(120, 180)), size=RENDER_SIZE) as renderer:
+            def render():
+                i = next(frame)
+                renderer.render(join(path, f"{i % 64}.png"), cards=hands[i % len(hands)])
+            return timed(render, min_time)
+
+
+def run(sizes=SIZES, modes=MODES, min_time=0.5):
+    EventLoop.ensure_window()
+    rng = random.Random(1234)
+    results = {}
+    for mode, min_radius in modes.items():
+        for n in sizes:
+            fan = make_fan(n, min_radius)
+            points = [ (rng.uniform(0, fan.width), rng.uniform(0, fan.height)) for i in range(32) ]
+
+            def hit():
+                for x, y in points:
+                    fan._hit_cache.clear()  # Measure the hit test, not the caches
+                    fan._hit_masks.clear()
+                    fan.card_at_point(x, y)
+
+            def hit_masked():
+                for x, y in points:
+                    fan._hit_cache.clear()  # Alpha masks already rendered
+                    fan.card_at_point(x, y)
+
+            def hit_cached():
+                for x, y in points:
+                    fan.card_at_point(x, y)
+
+            results[f"calculate/{mode}/{n}"] = timed(fan.calculate, min_time)
+            results[f"redraw/{mode}/{n}"] = timed(fan._redraw, min_time)
+            results[f"card_at_point/{mode}/{n}"] = timed(hit, min_time) / len(points)
+            results[f"card_at_point_masked/{mode}/{n}"] = timed(hit_masked, min_time) / len(points)
+            results[f"card_at_point_cached/{mode}/{n}"] = timed(hit_cached, min_time) / len(points)
+            results[f"drag_move/{mode}/{n}"] = bench_drag(fan, rng, min_time)
+            results[f"insert_pop/{mode}/{n}"] = bench_churn(fan, rng, min_time)
+            EventLoop.window.remove_widget(fan)
+    for n in (7, 20):
+        results[f"render/{RENDER_SIZE[0]}x{RENDER_SIZE[1]}/{n}"] = bench_render(n, rng, min_time)
+    return results
+
+
+def compare(results, baseline):
+    """Returns list of (name, base, now, ratio, limit) for regressions."""
+    threshold = baseline.get('threshold', DEFAULT_THRESHOLD)
+    limits = baseline.get('thresholds', {})
+    regressions = []
+    for name, base in baseline.get('results', {}).items():
+        if name not in results or not base:
+            continue
+        ratio = results[name] / base
+        limit = limits.get(name, threshold)
+        if ratio > limit:
+            regressions.append((name, base, results[name], ratio, limit))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=lambda s: [int(x) for x in s.split(',')], default=SIZES, help="comma separated fan sizes")
+    parser.add_argument('--min-time', type=float, default=0.5, help="minimum seconds spent per case")
+    parser.add_argument('--save', metavar="FILE", help="write results as a JSON baseline")
+    parser.add_argument('--compare', metavar="FILE", help="compare against a JSON baseline")
+    parser.add_argument('--threshold', type=float, default=None, help="allowed slowdown ratio (default: baseline or 1.25)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, min_time=args.min_time)
+    for name, sec in results.items():
+        print(f"{name:36s} {1e6*sec:12.1f} us")
+
+    if args.save:
+        baseline = dict(
+            threshold=args.threshold or DEFAULT_THRESHOLD,
+            python=sys.version.split()[0],
+            platform=platform.platform(),
+            results=results,
+        )
+        with open(args.save, 'w') as fh:
+            json.dump(baseline, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        if args.threshold:
+            baseline['threshold'] = args.threshold
+        regressions = compare(results, baseline)
+        for name, base, now, ratio, limit in regressions:
+            print(f"REGRESSION {name}: {1e6*base:.1f} us -> {1e6*now:.1f} us ({ratio:.2f}x > {limit:.2f}x)")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(_argv[1:]))
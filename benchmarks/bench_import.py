@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+"""
+Import-time benchmark. Each target is imported in a fresh interpreter
+several times and the median wall time is reported along with the number
+of modules loaded and which of the expensive library modules were pulled
+in.
+
+    python3 benchmarks/bench_import.py
+    python3 benchmarks/bench_import.py -n 20 amethyst_ttkvlib.journal
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from os.path import dirname, abspath
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+TARGETS = [
+    'kivy.factory',
+    'amethyst_ttkvlib',
+    'amethyst_ttkvlib.util',
+    'amethyst_ttkvlib.behaviors',
+    'amethyst_ttkvlib.widgets',
+    'amethyst_ttkvlib.journal',
+    'amethyst_ttkvlib.app',
+    'amethyst_ttkvlib.widgets.cardfan',
+]
+
+WATCH = [
+    'kivy.lang.builder',
+    'kivy.uix.scatter',
+    'kivy.core.image',
+    'amethyst_games',
+    'amethyst_ttkvlib.widgets.cardfan',
+    'amethyst_ttkvlib.widgets.slate',
+    'amethyst_ttkvlib.journal',
+    'amethyst_ttkvlib.snapshot',
+    'amethyst_ttkvlib.texcache',
+]
+
+PROBE = r'''
+import sys, time
+t0 = time.perf_counter()
+import {target}
+t1 = time.perf_counter()
+import json
+print(json.dumps(dict(time=t1 - t0, modules=len(sys.modules), loaded=[m for m in {watch!r} if m in sys.modules])))
+'''
+
+
+def measure(target, n):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    env.setdefault('KIVY_NO_ARGS', '1')
+    env.setdefault('KIVY_NO_CONSOLELOG', '1')
+    times, result = [], None
+    for i in range(n):
+        out = subprocess.run(
+            [sys.executable, '-c', PROBE.format(target=target, watch=WATCH)],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True,
+        ).stdout
+        result = json.loads(out.decode('utf-8').strip().splitlines()[-1])
+        times.append(result['time'])
+    result['time'] = statistics.median(times)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', type=int, default=5, help="number of runs per target")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    parser.add_argument('targets', nargs='*', default=TARGETS)
+    args = parser.parse_args(argv)
+
+    results = { target: measure(target, args.n) for target in args.targets }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for target, res in results.items():
+        print(f"{target:40s} {1000*res['time']:8.1f} ms {res['modules']:5d} modules  {' '.join(res['loaded'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,8 @@ Tabletop Games GUI Support
 """
 # SPDX-License-Identifier: GPL-3.0
 import sys
-if sys.version_info < (3,6):
-    raise Exception("Python 3.6 required -- this is only " + sys.version)
+if sys.version_info < (3,7):
+    raise Exception("Python 3.7 required -- this is only " + sys.version)
 
 import re
 import setuptools
@@ -36,9 +36,17 @@ setuptools.setup(
     requires     = [
         'amethyst.core (>=0.8.6)',
         'amethyst_games',
-        'kivy (>=1.10)',
+        'kivy (>=2.2.0)',
     ],
-    python_requires = '>=3.6',
+    extras_require = {
+        'assets': [ 'Pillow' ],
+    },
+    entry_points = {
+        'console_scripts': [
+            'ttkvlib-assets = amethyst_ttkvlib.assetbuild:main',
+        ],
+    },
+    python_requires = '>=3.7',
     namespace_packages = [ 'amethyst' ],
     test_suite   = 'setup.my_test_suite',
 )
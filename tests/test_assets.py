@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+
+import sys
+from os.path import dirname, abspath, join
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from kivy.tests.common import GraphicUnitTest
+
+from amethyst_ttkvlib.assetbuild import build
+from amethyst_ttkvlib.assets import CardAssets
+from amethyst_ttkvlib.widgets.cardfan import CardImage
+
+try:
+    import PIL
+except ImportError:
+    PIL = None
+
+EXAMPLES = join(dirname(dirname(abspath(__file__))), "examples", "cardfan")
+
+
+@unittest.skipIf(PIL is None, "Pillow not installed")
+class MyTest(GraphicUnitTest):
+
+    def test_build(self):
+        from PIL import Image
+        with tempfile.TemporaryDirectory() as path:
+            src = join(path, "art")
+            os.mkdir(src)
+            for name in ("card-1.png", "card-2.png", "card-back.png"):
+                shutil.copy(join(EXAMPLES, name), src)
+            # A card with a transparent border
+            with Image.open(join(EXAMPLES, "card-3.png")) as im:
+                framed = Image.new('RGBA', (600, 900))
+                framed.paste(im.convert('RGBA'), (60, 90))
+                framed.save(join(src, "framed.png"))
+
+            out = join(path, "build")
+            self.assertEqual(build([src], out, (60, 90), root=path, jobs=2), (4, 4))
+            with open(join(out, "cards.json")) as fh:
+                manifest = json.load(fh)
+            self.assertEqual(sorted(manifest['sources']), ["art/card-1.png", "art/card-2.png", "art/card-back.png", "art/framed.png"])
+            framed = manifest['sources']['art/framed.png']
+            # Trimmed to the frame, plus a few pixels of resampling blur
+            w, h = framed['levels'][0]['size']
+            self.assertTrue(48 <= w < 56 and 72 <= h < 80, (w, h))
+            self.assertEqual(len(framed['levels']), 3)
+
+            # Incremental rebuilds
+            self.assertEqual(build([src], out, (60, 90), root=path), (0, 4))
+            st = os.stat(join(src, "card-2.png"))
+            os.utime(join(src, "card-2.png"), ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            self.assertEqual(build([src], out, (60, 90), root=path), (1, 4))
+            os.unlink(join(src, "card-1.png"))
+            self.assertEqual(build([src], out, (60, 90), root=path), (0, 3))
+
+            assets = CardAssets(join(out, "cards.json"), root=path)
+            self.assertEqual(assets.get("art/card-2.png", (60, 90)).size, (60, 90))
+            self.assertEqual(assets.get("art/card-2.png", (30, 45)).size, (30, 45))
+            self.assertEqual(assets.get(join(src, "card-2.png"), (12, 18)).size, (15, 22))
+            self.assertIsNone(assets.get("art/card-1.png", (60, 90)))
+            box = assets.face_box("art/framed.png", (60, 90))
+            for have, want in zip(box, [0.1, 0.1, 0.8, 0.8]):
+                self.assertAlmostEqual(have, want, delta=0.12)
+            self.assertTrue(assets.hit("art/framed.png", 0.5, 0.5))
+            self.assertFalse(assets.hit("art/framed.png", 0.05, 0.5))
+            self.assertIsNone(assets.hit("art/card-1.png", 0.5, 0.5))
+            # Edges of the card are inside the mask
+            self.assertFalse(assets.hit("art/framed.png", 0.5, 0.0))
+            self.assertTrue(assets.hit("art/card-2.png", 0.5, 0.0))
+            self.assertFalse(assets.hit("art/card-2.png", 0.5, 1.0))
+
+            card = CardImage(source="art/framed.png", texture_cache=assets, size=(60, 90))
+            card._load_face()
+            self.assertEqual(card.face_box, box)
+            self.assertEqual(list(card.ids['img'].texture.size), [w, h])
+            self.assertTrue(card.mask_hit(30, 45))
+            self.assertFalse(card.mask_hit(2, 45))
+
+
+if __name__ == '__main__':
+    unittest.main()
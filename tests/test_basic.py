@@ -3,7 +3,11 @@
 # SPDX-License-Identifier: GPL-3.0
 
 from __future__ import division, absolute_import, print_function, unicode_literals
+import os
+import subprocess
+import sys
 import unittest
+from os.path import dirname, abspath
 
 import amethyst_ttkvlib
 
@@ -12,6 +16,43 @@ class MyTest(unittest.TestCase):
     def test_stupid(self):
         self.assertTrue(True)
 
+    def test_lazy_widgets(self):
+        env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [dirname(dirname(abspath(__file__))), env.get('PYTHONPATH')]))
+        code = (
+            "import sys, amethyst_ttkvlib.widgets, amethyst_ttkvlib.behaviors;"
+            "from kivy.lang import Builder;"
+            "print(sorted(m for m in sys.modules if m.startswith('amethyst_ttkvlib.') and m.count('.') > 1));"
+            "print(all(Builder.match_rule_name(n) for n in ('CardFan', 'CardImage', 'Slate')))"
+        )
+        out = subprocess.run([sys.executable, '-c', code], env=env, stdout=subprocess.PIPE, check=True).stdout
+        # kv rules load eagerly, widget modules lazily
+        self.assertEqual(out.decode('utf-8').split(), ["['amethyst_ttkvlib.widgets.kv']", "True"])
+
+    def test_lazy_app(self):
+        env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [dirname(dirname(abspath(__file__))), env.get('PYTHONPATH')]))
+        code = (
+            "import sys, amethyst_ttkvlib.app;"
+            "print([m for m in ('journal', 'snapshot', 'texcache', 'widgets') if 'amethyst_ttkvlib.' + m in sys.modules])"
+        )
+        out = subprocess.run([sys.executable, '-c', code], env=env, stdout=subprocess.PIPE, check=True).stdout
+        # Storage and widget modules load on first use
+        self.assertEqual(out.decode('utf-8').split()[-1], "[]")
+
+    def test_app_kv_overrides(self):
+        env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [dirname(dirname(abspath(__file__))), env.get('PYTHONPATH')]))
+        code = (
+            "import amethyst_ttkvlib.widgets;"
+            "from kivy.factory import Factory;"
+            "from kivy.lang import Builder;"
+            "Builder.load_string('<CardFan>:\\n    default_drag_distance: 7\\n');"
+            "print(Factory.CardFan().default_drag_distance)"
+        )
+        out = subprocess.run([sys.executable, '-c', code], env=env, stdout=subprocess.PIPE, check=True).stdout
+        self.assertEqual(out.decode('utf-8').split()[-1], "7")
+
 
 if __name__ == '__main__':
     unittest.main()
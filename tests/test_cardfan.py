@@ -7,12 +7,24 @@ from os.path import dirname, abspath, join
 sys.path.insert(1, dirname(dirname(abspath(__file__))))
 sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
 
+import asyncio
+import gc
+import queue
+import threading
 import unittest
+import weakref
 from kivy.factory import Factory
 from kivy.tests.common import GraphicUnitTest, UnitTestTouch
 from kivy.base import EventLoop
 
-from amethyst_ttkvlib.widgets.cardfan import CardFan, CardImage, ICardFanReset
+from amethyst_ttkvlib.clock import VirtualClock
+from amethyst_ttkvlib.widgets.cardfan import CardFan, CardImage, CardStrips, ICardFanReset
+
+class GeometricCardFan(CardFan):
+    # Hit test card rectangles rather than rendered pixels
+    def _card_at_point(self, x, y):
+        return self._index_at(x - self.x, y - self.y)
+
 
 class Card(object):
     def __init__(self, id, source):
@@ -40,6 +52,517 @@ class MyTest(GraphicUnitTest):
         self.assertIsNone(img.source)
         self.assertIsNone(img.back_source)
 
+    def test_stats(self):
+        fan = CardFan()
+        fan.size = (800, 300)
+        self.assertIsNone(fan.stats)
+        fan.stats_enabled = True
+        self.render(fan)
+        fan.fast_forward = True
+        for i in range(5):
+            fan.insert(i, dict(id=i))
+        fan.fast_forward = False    # settles, dispatching on_card_add
+        self.advance_frames(1)
+
+        stats = fan.stats
+        self.assertGreaterEqual(stats['redraws'], 1)
+        self.assertEqual(stats['widgets_created'], 5)
+        self.assertGreaterEqual(stats['events'], 5)
+
+        fan.card_at_point(*fan.center)
+        self.assertEqual(fan.stats['hit_tests'], 1)
+
+        fan.stats_enabled = False
+        self.assertIsNone(fan.stats)
+
+    def test_virtual(self):
+        fan = CardFan()
+        fan.size = (400, 300)
+        fan.virtual = True
+        self.render(fan)
+        fan.fast_forward = True
+        fan.cards = [ dict(id=i) for i in range(100) ]
+        fan.fast_forward = False
+        self.advance_frames(1)
+
+        def materialized():
+            return [ i for i, data in enumerate(fan.cards) if fan._by_data[id(data)].widget is not None ]
+        self.assertEqual(materialized(), [99])
+        self.assertEqual(len([ w for w in fan.children if isinstance(w, CardStrips) ]), 1)
+
+        fan.lifted_cards = [50]
+        fan.focus_card(20)
+        self.advance_frames(1)
+        self.assertEqual(materialized(), [18, 19, 20, 21, 22, 49, 50, 99])
+        target = fan._by_data[id(fan.cards[10])].target
+        self.assertEqual(fan.card_at_point(fan.x + target.x + 1, fan.y + target.y + 10), 10)
+
+        fan.virtual = False
+        self.advance_frames(1)
+        self.assertEqual(len(materialized()), 100)
+        self.assertFalse([ w for w in fan.children if isinstance(w, CardStrips) ])
+
+    def test_virtual_restore(self):
+        fan = CardFan(virtual=True)
+        fan.size = (400, 300)
+        self.render(fan)
+        for n in (100, 100, 60):
+            fan.restore([ dict(id=i) for i in range(n) ])
+            self.advance_frames(1)
+            strips = [ w for w in fan.children if isinstance(w, CardStrips) ]
+            self.assertEqual(len(strips), 1)
+            self.assertFalse([ w for w in fan._widget_cache if isinstance(w, CardStrips) ])
+            self.assertEqual(len([ w for w in fan.children if isinstance(w, CardImage) ]), 1)
+
+    def test_virtual_mouse(self):
+        window = EventLoop.window
+        fan = CardFan(virtual=True, size_hint=(None, None), size=(400, 300))
+        self.assertFalse(fan._mouse_bound)
+        window.add_widget(fan)
+        self.assertTrue(fan._mouse_bound)
+        fan.fast_forward = True
+        fan.cards = [ dict(id=i) for i in range(100) ]
+        fan.fast_forward = False
+        self.advance_frames(1)
+        target = fan._by_data[id(fan.cards[30])].target
+        window.mouse_pos = (fan.x + target.x + 1, fan.y + target.y + 10)
+        self.assertEqual(fan._virtual_focus, 30)
+
+        # Detached fans release the window, and the window never keeps them alive
+        window.remove_widget(fan)
+        self.assertFalse(fan._mouse_bound)
+        window.add_widget(fan)
+        self.assertTrue(fan._mouse_bound)
+        ref = weakref.ref(fan)
+        window.remove_widget(fan)
+        del fan, target
+        gc.collect()
+        self.assertIsNone(ref())
+        window.mouse_pos = (5, 5)
+
+    def test_lod(self):
+        class Cache(object):
+            def __init__(self):
+                self.sizes = []
+
+            def get(self, source, size):
+                self.sizes.append(tuple(size))
+                return None
+
+        cache = Cache()
+        outer = Factory.Scatter(size=(400, 400))
+        img = CardImage(size_hint=(None, None), size=(100, 140), lod=True, texture_cache=cache, source='foo.png')
+        outer.add_widget(img)
+        self.render(outer)
+        self.advance_frames(2)
+        self.assertEqual(img.lod_level, 0)
+        self.assertEqual(cache.sizes[-1], (100, 140))
+
+        outer.scale = 0.2
+        self.advance_frames(2)
+        self.assertAlmostEqual(img.effective_scale(), 0.2)
+        self.assertEqual(img.lod_level, 2)
+        self.assertEqual(cache.sizes[-1], (25, 35))
+
+        # Hysteresis: just past the level boundary does not switch back
+        outer.scale = 0.27
+        self.advance_frames(2)
+        self.assertEqual(img.lod_level, 2)
+        outer.scale = 0.6
+        self.advance_frames(2)
+        self.assertEqual(img.lod_level, 0)
+
+        img.lod = False
+        outer.scale = 0.1
+        self.advance_frames(2)
+        self.assertEqual(img.lod_level, 0)
+
+    def test_live_resize(self):
+        fan = CardFan(size_hint=(None, None), size=(400, 300), live_resize_delay=10)
+        self.render(fan)
+        fan.fast_forward = True
+        fan.cards = [ dict(id=i) for i in range(5) ]
+        fan.fast_forward = False
+        fan.stats_enabled = True
+        widget = fan._by_data[id(fan.cards[0])].widget
+
+        # Geometry changes relayout, once per frame
+        fan.spacing = 30
+        fan.lift = 20
+        self.advance_frames(1)
+        self.assertEqual(fan.stats["redraws"], 1)
+        fan._settle_to_target(fan._by_data[id(fan.cards[0])])
+        x0 = widget.center_x
+
+        # Continuous resize scales the last layout without redrawing
+        fan.width = 500
+        fan.width = 600
+        self.advance_frames(1)
+        self.assertEqual(fan.stats["redraws"], 1)
+        self.assertAlmostEqual(widget.center_x, x0 * 1.5)
+
+        fan._resize_event.cancel()
+        fan._resize_settled()
+        fan.fast_forward = True
+        fan.fast_forward = False
+        target = fan._by_data[id(fan.cards[0])].target
+        self.assertEqual(fan.stats["redraws"], 2)
+        self.assertAlmostEqual(widget.x, fan.x + target.x)
+
+    def test_hover(self):
+        fan = GeometricCardFan(size_hint=(None, None), size=(400, 300))
+        self.render(fan)
+        window = EventLoop.window
+        window.add_widget(fan)
+        self.addCleanup(window.remove_widget, fan)
+        fan.fast_forward = True
+        fan.cards = [ dict(id=i) for i in range(3) ]
+        fan.fast_forward = False
+        self.advance_frames(1)
+        fan.hover_enabled = True
+        fan.stats_enabled = True
+        events = []
+        fan.bind(on_card_hover_enter=lambda fan, i, data, widget: events.append(('enter', i)),
+                 on_card_hover_leave=lambda fan, i, data, widget: events.append(('leave', i)))
+
+        top = fan._by_data[id(fan.cards[2])].widget
+        window.mouse_pos = (top.right - 5, top.center_y)
+        window.mouse_pos = (top.right - 6, top.center_y)
+        self.assertEqual(events, [('enter', 2)])
+        hits = fan.stats["hit_tests"]
+        for i in range(20):
+            window.mouse_pos = (top.right - 5 - i % 2, top.center_y)
+        self.assertEqual(fan.stats["hit_tests"], hits)
+
+        window.mouse_pos = (fan.right - 1, fan.top - 1)
+        self.assertEqual(events, [('enter', 2), ('leave', 2)])
+
+        # Cards moving under a still pointer
+        window.mouse_pos = (top.x + 5, top.y + 5)
+        fan.lifted_cards = [2]
+        fan.fast_forward = True
+        fan.fast_forward = False
+        self.advance_frames(1)
+        self.assertEqual(events[-2:], [('leave', 2), ('enter', 1)])
+
+    def test_hover_masks(self):
+        source = join(dirname(dirname(abspath(__file__))), "examples", "cardfan", "card-1.png")
+        fan = CardFan(size_hint=(None, None), size=(400, 300))
+        self.render(fan)
+        window = EventLoop.window
+        window.add_widget(fan)
+        self.addCleanup(window.remove_widget, fan)
+        fan.fast_forward = True
+        fan.cards = [ dict(id=i, source=source) for i in range(3) ]
+        fan.fast_forward = False
+        self.advance_frames(1)
+        fan.hover_enabled = True
+        fan.stats_enabled = True
+        events = []
+        fan.bind(on_card_hover_enter=lambda fan, i, data, widget: events.append(('enter', i)))
+
+        top = fan._by_data[id(fan.cards[2])].widget
+        points = [ top.to_parent(top.width - 10 - i, top.height / 2) for i in range(5) ]
+        window.mouse_pos = points[0]
+        self.assertEqual(events, [('enter', 2)])
+        masks = fan.stats["hit_masks"]
+        for pos in points:
+            window.mouse_pos = pos
+        hits = fan.stats["hit_tests"]
+        for i in range(20):
+            window.mouse_pos = points[i % len(points)]
+        self.assertEqual(fan.stats["hit_tests"], hits)
+        self.assertEqual(fan.stats["hit_masks"], masks)
+        self.assertEqual(events, [('enter', 2)])
+
+        # Transparent corner
+        self.assertEqual(fan.card_at_point(*top.to_parent(top.width - 12, top.height / 2)), 2)
+        self.assertIsNone(fan.card_at_point(*top.to_parent(top.width - 1, top.height - 1)))
+        self.assertEqual(fan.stats["hit_masks"], masks)
+
+        # A flip narrows the card without moving it, cached hits follow
+        edge = top.to_parent(top.width - 12, top.height / 2)
+        self.assertEqual(fan.card_at_point(*edge), 2)
+        with VirtualClock() as vclock:
+            fan.flip_all(indexes=[2], duration=0.2)
+            vclock.advance(0.05)
+            self.assertLess(top.flip_scale, 0.9)
+            self.assertNotEqual(fan.card_at_point(*edge), 2)
+            vclock.advance(0.3)
+        self.assertEqual(top.flip_scale, 1)
+        self.assertEqual(fan.card_at_point(*edge), 2)
+
+    def test_flip(self):
+        front = join(dirname(dirname(abspath(__file__))), "examples", "cardfan", "card-1.png")
+        back = join(dirname(dirname(abspath(__file__))), "examples", "cardfan", "card-back.png")
+        fan = CardFan()
+        fan.fast_forward = True
+        fan.cards = [ dict(id=i, source=front, back_source=back) for i in range(5) ]
+        fan.fast_forward = False
+        widgets = [ fan._by_data[id(data)].widget for data in fan.cards ]
+
+        with VirtualClock() as vclock:
+            anim = fan.flip_all(stagger=0.1, duration=0.2)
+            done = []
+            anim.bind(on_complete=lambda *args: done.append(True))
+            self.assertTrue(all(w.keep_faces and len(w._faces) == 2 for w in widgets))
+            faces = [ dict(w._faces) for w in widgets ]
+
+            vclock.advance(0.15)
+            # First card past its midpoint, second narrowing, others waiting
+            self.assertFalse(widgets[0].show_front)
+            self.assertTrue(widgets[1].show_front)
+            self.assertLess(widgets[1].flip_scale, 1)
+            self.assertEqual(widgets[4].flip_scale, 1)
+            self.assertIs(widgets[0].ids['img'].texture, faces[0][back])
+
+            vclock.advance(0.6)
+            self.assertEqual(done, [True])
+            self.assertEqual([ w.show_front for w in widgets ], [False] * 5)
+            self.assertEqual([ w.flip_scale for w in widgets ], [1] * 5)
+            self.assertEqual([ d['show_front'] for d in fan.cards ], [False] * 5)
+            self.assertEqual([ w._faces for w in widgets ], faces)
+
+            widgets[2].flip(duration=0.1)
+            vclock.advance(0.2)
+            self.assertTrue(widgets[2].show_front)
+            self.assertIs(widgets[2].ids['img'].texture, faces[2][front])
+
+            # A card popped mid-flip and recycled is left alone by the flip
+            fan.flip_all(indexes=[4], duration=0.2, show_front=True)
+            vclock.advance(0.05)
+            fan.pop(4)
+            fan.fast_forward = True
+            fan.fast_forward = False
+            fan.insert(0, dict(id=5, source=front, back_source=back, show_front=False))
+            fan.fast_forward = True
+            fan.fast_forward = False
+            widget = fan._by_data[id(fan.cards[0])].widget
+            self.assertIs(widget, widgets[4])
+            self.assertEqual((widget.flip_scale, widget.keep_faces, widget._faces), (1, False, {}))
+            vclock.advance(0.3)
+            self.assertFalse(widget.show_front)
+            self.assertEqual(widget.flip_scale, 1)
+
+    def test_deal(self):
+        fan = CardFan(size_hint=(None, None), size=(600, 300), pos=(100, 100))
+        pile = Factory.Widget(size_hint=(None, None), size=(60, 90), pos=(0, 400))
+        fan.cards = [ dict(id=0) ]
+        fan.fast_forward = True
+        fan.fast_forward = False
+        added, settled = [], []
+        fan.bind(on_card_add=lambda f, i, d, w: added.append(d['id']),
+                 on_cards_settled=lambda f, cards: settled.append([ d['id'] for d in cards ]))
+
+        with VirtualClock() as vclock:
+            fan.deal([ dict(id=i) for i in range(1, 5) ], from_widget=pile, stagger=0.1, duration=0.2)
+            self.assertEqual([ d['id'] for d in fan.cards ], [0, 1, 2, 3, 4])
+            widgets = [ fan._by_data[id(d)].widget for d in fan.cards[1:] ]
+
+            vclock.advance(0.05)
+            self.assertEqual(widgets[0].opacity, 1)
+            self.assertLess(widgets[0].center_y, 400)
+            self.assertGreater(widgets[0].center_y, fan._by_data[id(fan.cards[1])].target.y + fan.y + 90)
+            self.assertEqual(widgets[3].opacity, 0)
+            self.assertEqual(settled, [])
+
+            vclock.advance(0.3)
+            self.assertEqual(settled, [])
+            vclock.advance(0.2)
+            self.assertEqual(settled, [[1, 2, 3, 4]])
+            self.assertEqual(added, [])
+            for data, widget in zip(fan.cards[1:], widgets):
+                state = fan._by_data[id(data)]
+                self.assertEqual(state.status, 'ok')
+                self.assertAlmostEqual(widget.x, fan.x + state.target.x)
+                self.assertAlmostEqual(widget.y, fan.y + state.target.y)
+
+    def test_post(self):
+        fan = CardFan(post_budget=0, post_limit=4)
+        fan.cards = [ dict(id=i) for i in range(3) ]
+
+        with VirtualClock() as vclock:
+            # Backpressure: the producer waits for the main thread
+            def produce():
+                for i in range(3, 9):
+                    fan.post_insert(len(fan.cards) + i - 3, dict(id=i))
+                for i in range(5):
+                    fan.post_lift([i % 2])
+            thread = threading.Thread(target=produce)
+            thread.start()
+            thread.join(0.2)
+            self.assertTrue(thread.is_alive())
+            self.assertEqual(len(fan.cards), 3)
+            errors = []
+
+            def try_pop():
+                try:
+                    fan.post_pop(0, block=False)
+                except queue.Full:
+                    errors.append(True)
+            other = threading.Thread(target=try_pop)
+            other.start()
+            other.join()
+            self.assertEqual(errors, [True])
+
+            vclock.step()       # One change per frame with a zero budget
+            self.assertEqual(len(fan.cards), 4)
+            for i in range(20):
+                if not thread.is_alive() and not fan._posted:
+                    break
+                vclock.step()
+                thread.join(0.05)
+            self.assertFalse(thread.is_alive())
+            self.assertEqual([ d['id'] for d in fan.cards ], list(range(9)))
+            self.assertEqual(fan.lifted_cards, [0])     # Lifts coalesced
+
+            fan.post_budget = 1
+            fan.post_move(0, -1)
+            vclock.step()
+            self.assertEqual([ d['id'] for d in fan.cards ], [1, 2, 3, 4, 5, 6, 7, 8, 0])
+            self.assertEqual(fan.lifted_cards, [8])
+            fan.post_lift([])
+            fan.post_pop(0)
+            fan.post_pop(99)
+            with self.assertWarns(UserWarning):
+                vclock.step()
+            self.assertEqual([ d['id'] for d in fan.cards ], [2, 3, 4, 5, 6, 7, 8, 0])
+
+            # Main thread never blocks, a full queue is applied at once
+            fan.post_limit = 2
+            for i in range(3):
+                fan.post_insert(0, dict(id=10 + i))
+            self.assertEqual(len(fan.cards), 10)
+            fan.post_insert(0, dict(id=20))
+            fan.post_reset([ dict(id=30) ])
+            vclock.step()
+            self.assertEqual([ d['id'] for d in fan.cards ], [30])
+
+    def test_async(self):
+        fan = CardFan(size_hint=(None, None), size=(600, 300))
+        fan.cards = [ dict(id=0) ]
+        fan.fast_forward = True
+        fan.fast_forward = False
+
+        async def frames(n):
+            for i in range(n):
+                await asyncio.sleep(0)
+
+        async def scenario(vclock):
+            async def ticker():
+                while True:
+                    vclock.step()
+                    await asyncio.sleep(0)
+            tick = asyncio.ensure_future(ticker())
+            try:
+                widgets = await asyncio.gather(fan.async_insert(1, dict(id=1)), fan.async_insert(2, dict(id=2)))
+                self.assertEqual([ fan._by_data[id(d)].status for d in fan.cards ], ['ok'] * 3)
+                self.assertEqual([ w.id for w in widgets ], [1, 2])
+
+                await widgets[0].async_flip(duration=0.1)
+                self.assertFalse(widgets[0].show_front)
+
+                data = await fan.async_pop(0)
+                self.assertEqual(data['id'], 0)
+                self.assertEqual(sorted(w.id for w in fan.children), [1, 2])
+
+                settled = await fan.async_deal([ dict(id=3), dict(id=4) ], stagger=0.05, duration=0.1)
+                self.assertEqual([ d['id'] for d in settled ], [3, 4])
+
+                # Cancellation
+                task = asyncio.ensure_future(fan.async_flip_all(duration=1))
+                await frames(10)
+                self.assertTrue(any(w.flip_scale < 1 for w in fan.children))
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                self.assertTrue(all(w.flip_scale == 1 for w in fan.children))
+
+                task = asyncio.ensure_future(fan.async_deal([ dict(id=5) ], duration=1))
+                await frames(10)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                state = fan._by_data[id(fan.cards[-1])]
+                self.assertEqual(state.status, 'mv')
+                await frames(200)
+                self.assertEqual(state.status, 'ok')
+
+                task = asyncio.ensure_future(fan.async_insert(0, dict(id=6)))
+                await frames(3)
+                state = fan._by_data[id(fan.cards[0])]
+                self.assertIsNotNone(state.anim)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                self.assertIsNone(state.anim)
+            finally:
+                tick.cancel()
+
+        with VirtualClock() as vclock:
+            asyncio.run(scenario(vclock))
+
+    def test_set_placement(self):
+        a, b = CardImage(size_hint=(None, None)), CardImage(size_hint=(None, None))
+        events = []
+        b.bind(on_placement=lambda w: events.append(w))
+        for rot in (0, 30, 90, 135, 200, 330):
+            a.size = (120, 180)
+            a.rotation = rot
+            a.x, a.y = 40, 25
+            b.set_placement(40, 25, rot, (120, 180), 0.5)
+            for have, want in zip(b.transform.get(), a.transform.get()):
+                self.assertAlmostEqual(have, want)
+            self.assertAlmostEqual(b.rotation % 360, rot)
+            for have, want in zip(b.bl, a.bl):
+                self.assertAlmostEqual(have, want)
+        self.assertEqual(len(events), 6)
+        self.assertEqual(b.opacity, 0.5)
+
+        b.bl = (0, 0)
+        self.assertAlmostEqual(b.to_parent(0, 0)[0], 0)
+        self.assertAlmostEqual(b.to_parent(0, 0)[1], 0)
+
+    def test_settle(self):
+        fan = CardFan(size_hint=(None, None), size=(600, 300))
+        for i in range(3):
+            fan.insert(i, dict(id=i, source='foo.png'))
+        fan.settle()
+        for i, data in enumerate(fan.cards):
+            state = fan._by_data[id(data)]
+            self.assertEqual(state.status, 'ok')
+            self.assertIsNone(state.anim)
+            self.assertAlmostEqual(state.widget.x, fan.x + state.target.x)
+            self.assertEqual(state.widget.opacity, 1)
+            self.assertFalse(state.widget._update_face.is_triggered)
+        self.assertFalse(fan.redraw.is_triggered)
+
+    def test_move_placement(self):
+        fan = CardFan(size_hint=(None, None), size=(600, 300), spacing=100)
+        self.render(fan)
+        fan.fast_forward = True
+        for i in range(3):
+            fan.insert(i, dict(id=i))
+        fan.fast_forward = False
+        self.advance_frames(1)
+
+        widget = fan._by_data[id(fan.cards[2])].widget
+        events = []
+        widget.bind(on_placement=lambda w: events.append(w.x))
+        with VirtualClock() as vclock:
+            start = widget.x
+            fan.spacing = 10
+            for i in range(4):
+                vclock.step()
+            state = fan._by_data[id(fan.cards[2])]
+            # One Animation per moving card, each frame a single placement
+            self.assertEqual(len(events), 3)
+            self.assertLess(fan.x + state.target.x, widget.x)
+            self.assertLess(widget.x, start)
+            self.assertTrue(vclock.advance_until(lambda: state.anim is None))
+            self.assertAlmostEqual(widget.x, fan.x + state.target.x)
+            self.assertEqual(widget.opacity, 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+
+import sys
+from os.path import dirname, abspath
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import unittest
+from kivy.factory import Factory
+from kivy.tests.common import GraphicUnitTest
+
+from amethyst_ttkvlib.widgets.cardfan import CardFan
+from amethyst_ttkvlib.widgets.cardfanmodel import CardFanModel
+from amethyst_ttkvlib.widgets.cardlayout import GridCardLayout
+
+
+class MyTest(GraphicUnitTest):
+
+    def test_model(self):
+        model = CardFanModel()
+        events = []
+        model.bind(on_insert=lambda m, i, d: events.append(('insert', i, d['id'])),
+                   on_remove=lambda m, i, d: events.append(('remove', i, d['id'])),
+                   on_move=lambda m, src, dst: events.append(('move', src, dst)))
+        model.extend([ dict(id=i) for i in range(4) ])
+        model.lifted_cards = [1, 3]
+        model.insert(2, dict(id=9))
+        self.assertEqual([ d['id'] for d in model ], [0, 1, 9, 2, 3])
+        self.assertEqual(model.lifted_cards, [1, 4])
+        model.pop(1)
+        self.assertEqual(model.lifted_cards, [3])
+        model.move(3, 0)
+        self.assertEqual([ d['id'] for d in model ], [3, 0, 9, 2])
+        self.assertEqual(model.lifted_cards, [0])
+        self.assertEqual(model.count, 4)
+        self.assertEqual(events[-3:], [('insert', 2, 9), ('remove', 1, 1), ('move', 3, 0)])
+
+    def test_views(self):
+        layout = Factory.BoxLayout()
+        model = CardFanModel([ dict(id=i) for i in range(3) ])
+        big = CardFan(model=model)
+        small = CardFan(model=model, card_size=(40, 60), layout=GridCardLayout())
+        layout.add_widget(big)
+        layout.add_widget(small)
+        self.render(layout)
+        self.assertEqual(len(big), 3)
+        self.assertEqual(len(small), 3)
+
+        big.insert(1, dict(id=5))
+        small.lifted_cards = [0]
+        self.advance_frames(1)
+        for fan in (big, small):
+            self.assertEqual([ d['id'] for d in fan.cards ], [0, 5, 1, 2])
+            self.assertEqual(fan.lifted_cards, [0])
+        self.assertIsNot(big._by_data[id(model[1])].widget, small._by_data[id(model[1])].widget)
+
+        data, widget = small.pop(0, recycle=False)
+        self.assertEqual(data['id'], 0)
+        self.assertIsNotNone(widget)
+        self.assertEqual(len(big), 3)
+        self.assertIsNone(big._model_popped)
+        self.assertEqual(model.lifted_cards, [])
+
+        model.move(0, 2)
+        self.advance_frames(1)
+        self.assertEqual([ d['id'] for d in big.cards ], [1, 2, 5])
+        self.assertEqual(len(big.children), 3)
+
+        big.model = None
+        model.append(dict(id=7))
+        self.assertEqual(len(big), 3)
+        self.assertEqual(len(small), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+
+import sys
+from os.path import dirname, abspath
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import unittest
+from kivy.tests.common import GraphicUnitTest
+
+from amethyst_ttkvlib.widgets.cardfan import CardFan
+from amethyst_ttkvlib.widgets.cardlayout import (
+    ArcCardLayout, ColumnCardLayout, GridCardLayout, RowCardLayout, StackCardLayout,
+)
+
+
+class MyTest(GraphicUnitTest):
+
+    def assertOrdered(self, fan):
+        states = [ fan._by_widget[id(w)] for w in reversed(fan.children) ]
+        self.assertEqual([ st.index for st in states ], list(range(len(fan))))
+        self.assertEqual([ st.data for st in states ], fan.cards)
+
+    def test_default(self):
+        fan = CardFan()
+        self.assertIsInstance(fan.current_layout, RowCardLayout)
+        fan.min_radius = 1000
+        self.assertIsInstance(fan.current_layout, ArcCardLayout)
+
+    def test_grid(self):
+        layout = GridCardLayout(cols=4)
+        fan = CardFan(size_hint=(None, None), size=(800, 600), layout=layout)
+        self.render(fan)
+        fan.fast_forward = True
+        fan.cards = [ dict(id=i) for i in range(10) ]
+        fan.fast_forward = False
+        self.advance_frames(1)
+        targets = fan.calculate()
+        self.assertEqual(targets[1].x - targets[0].x, fan.card_width + layout.padding)
+        self.assertEqual(targets[0].y - targets[4].y, fan.card_height + layout.padding)
+        self.assertEqual(targets[4].x, targets[0].x)
+
+        # Incremental: cards before the insert point are not touched
+        fan.insert(6, dict(id=100))
+        self.advance_frames(1)
+        for i in range(len(fan)):
+            state = fan._by_data[id(fan.cards[i])]
+            self.assertEqual(state.anim is not None, i >= 6, i)
+        self.assertOrdered(fan)
+
+        layout.cols = 3
+        self.advance_frames(1)
+        self.assertEqual(fan._by_data[id(fan.cards[3])].target.x, targets[0].x + 0.5 * (fan.card_width + layout.padding))
+
+    def test_stack(self):
+        fan = CardFan(size_hint=(None, None), size=(800, 600), layout=StackCardLayout(depth=3))
+        self.render(fan)
+        fan.fast_forward = True
+        fan.cards = [ dict(id=i) for i in range(6) ]
+        fan.fast_forward = False
+        self.advance_frames(1)
+        ys = [ t.y for t in fan.calculate() ]
+        self.assertEqual(ys[1] - ys[0], 2)
+        self.assertEqual(ys[3], ys[5])
+        self.assertEqual(sorted(fan.layout.changed_on_insert(fan, 0)), [0, 1, 2, 3])
+        self.assertEqual(sorted(fan.layout.changed_on_insert(fan, 5)), [5])
+
+    def test_stack_lifted(self):
+        # Lifted card deeper than the stack depth
+        fan = CardFan(size_hint=(None, None), size=(800, 600), layout=StackCardLayout(depth=8))
+        self.render(fan)
+        fan.fast_forward = True
+        fan.cards = [ dict(id=i) for i in range(12) ]
+        fan.lifted_cards = [10]
+        fan.fast_forward = False
+        self.advance_frames(1)
+        fan.insert(0, dict(id=100))
+        self.assertEqual(sorted(fan.layout.changed_on_insert(fan, 0)), list(range(9)) + [10, 11])
+        self.advance_frames(1)
+        for i, target in enumerate(fan.calculate()):
+            state = fan._by_data[id(fan.cards[i])]
+            self.assertEqual((state.target.x, state.target.y), (target.x, target.y), i)
+
+    def test_column(self):
+        fan = CardFan(size_hint=(None, None), size=(800, 600), layout=ColumnCardLayout())
+        self.render(fan)
+        fan.fast_forward = True
+        fan.cards = [ dict(id=i) for i in range(5) ]
+        fan.fast_forward = False
+        self.advance_frames(1)
+        targets = fan.calculate()
+        self.assertEqual(targets[0].y - targets[1].y, fan.spacing)
+        self.assertEqual(list(fan.layout.changed_on_insert(fan, 4)), [4])
+        fan.cards.extend(dict(id=i) for i in range(5, 20))
+        self.assertIsNone(fan.layout.changed_on_insert(fan, 19))
+        self.advance_frames(1)
+        self.assertLess(fan.actual_spacing, fan.spacing)
+
+    def test_row_insert(self):
+        fan = CardFan(size_hint=(None, None), size=(800, 600))
+        self.render(fan)
+        fan.fast_forward = True
+        fan.cards = [ dict(id=i) for i in range(5) ]
+        fan.fast_forward = False
+        self.advance_frames(1)
+        fan.insert(0, dict(id=100))
+        fan.insert(3, dict(id=101))
+        self.advance_frames(1)
+        self.assertOrdered(fan)
+
+
+if __name__ == '__main__':
+    unittest.main()
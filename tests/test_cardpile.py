@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+
+import sys
+from os.path import dirname, abspath
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import asyncio
+import unittest
+from kivy.factory import Factory
+from kivy.tests.common import GraphicUnitTest
+
+from amethyst_ttkvlib.clock import VirtualClock
+from amethyst_ttkvlib.widgets.cardfan import CardFan
+from amethyst_ttkvlib.widgets.cardpile import CardPile
+
+
+class MyTest(GraphicUnitTest):
+
+    def test_pile(self):
+        pile = CardPile(size_hint=(None, None))
+        pile.size = (120, 180)
+        self.assertIsNone(pile.peek())
+        self.assertEqual(pile.top_widget.opacity, 0)
+
+        pile.extend([ dict(id=i) for i in range(100) ])
+        self.assertEqual(len(pile), 100)
+        self.assertEqual(pile.count, 100)
+        self.assertEqual(pile.peek()['id'], 99)
+        self.assertEqual(pile.top_widget.id, 99)
+        self.assertFalse(pile.top_widget.show_front)
+        # Edge stops growing at edge_max cards: center plus hull, closed
+        self.assertEqual(len(pile._edge.vertices), 2 * 8)
+        self.assertAlmostEqual(min(pile._edge.vertices[1::2]), -52 * 0.5)
+
+        self.assertEqual(pile.pop()['id'], 99)
+        self.assertEqual(pile.top_widget.id, 98)
+        pile.clear()
+        self.assertEqual(pile.count, 0)
+        self.assertEqual(pile._edge.vertices, [])
+
+    def test_deal(self):
+        root = Factory.FloatLayout()
+        scatter = Factory.Scatter(scale=0.5, rotation=90, pos=(300, 300), size_hint=(None, None))
+        pile = CardPile(size_hint=(None, None), size=(120, 180))
+        scatter.add_widget(pile)
+        fan = CardFan(size_hint=(None, None))
+        fan.size = (800, 300)
+        root.add_widget(fan)
+        root.add_widget(scatter)
+        self.render(root)
+
+        pile.push(dict(id='a'))
+        data = pile.deal_to(fan)
+        self.assertEqual(data['id'], 'a')
+        self.assertEqual(len(pile), 0)
+        self.assertEqual(fan.cards, [data])
+        widget = fan._by_data[id(data)].widget
+        self.assertAlmostEqual(widget.width, 60)
+        self.assertAlmostEqual(widget.rotation % 360, 90)
+        cx, cy = scatter.to_parent(*pile.center)
+        self.assertAlmostEqual(widget.center_x, cx)
+        self.assertAlmostEqual(widget.center_y, cy)
+
+    def test_async_deal(self):
+        fan = CardFan(size_hint=(None, None), size=(800, 300))
+        pile = CardPile(size_hint=(None, None), size=(120, 180), pos=(0, 400))
+        pile.push(dict(id='a'))
+
+        async def scenario(vclock):
+            task = asyncio.ensure_future(pile.async_deal_to(fan))
+            while not task.done():
+                vclock.step()
+                await asyncio.sleep(0)
+            return task.result()
+
+        with VirtualClock() as vclock:
+            data = asyncio.run(scenario(vclock))
+        self.assertEqual(data['id'], 'a')
+        self.assertEqual(fan._by_data[id(data)].status, 'ok')
+        self.assertIsNone(pile.peek())
+
+
+if __name__ == '__main__':
+    unittest.main()
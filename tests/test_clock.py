@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+
+import sys
+from os.path import dirname, abspath
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import time
+import unittest
+from kivy.clock import Clock
+from kivy.event import EventDispatcher
+from kivy.tests.common import GraphicUnitTest
+
+from amethyst_ttkvlib.behaviors.toast import ToastBehavior
+from amethyst_ttkvlib.clock import VirtualClock, _shifted
+from amethyst_ttkvlib.widgets.cardfan import CardFan
+
+
+class Toaster(ToastBehavior, EventDispatcher):
+    pass
+
+
+class MyTest(GraphicUnitTest):
+
+    def test_toast(self):
+        with VirtualClock(frame_time=0.5) as vclock:
+            obj = Toaster()
+            obj.error("boom", 30)
+            obj.toast("hello", 30)
+            vclock.step()
+            self.assertEqual(obj.errstr, "[color=#f44336]boom[/color]")
+
+            t0 = time.perf_counter()
+            vclock.advance(29.9)
+            self.assertEqual(obj.errstr, "[color=#f44336]boom[/color]")
+            vclock.advance(0.2)
+            self.assertEqual(obj.errstr, "hello")
+            self.assertLess(time.perf_counter() - t0, 5)
+        self.assertFalse(vclock.installed)
+        self.assertGreaterEqual(Clock.time(), vclock.now)
+
+    def test_repeated_install(self):
+        for i in range(5):
+            with VirtualClock() as vclock:
+                vclock.advance(10)
+            self.assertGreaterEqual(Clock.time(), vclock.now)
+        # One shift of the real time source, however many clocks ran
+        self.assertIs(Clock.time.func, _shifted)
+        self.assertIsNot(getattr(Clock.time.args[0], 'func', None), _shifted)
+
+    def test_animation(self):
+        fan = CardFan(size_hint=(None, None), size=(400, 300))
+        self.render(fan)
+        added = []
+        fan.bind(on_card_add=lambda fan, i, data, widget: added.append(i))
+        with VirtualClock() as vclock:
+            for i in range(3):
+                fan.insert(i, dict(id=i))
+            vclock.step()
+            self.assertEqual(added, [])
+            vclock.advance(fan.fade_time + 0.1)
+            self.assertEqual(sorted(added), [0, 1, 2])
+
+            fan.spacing = 10
+            self.assertTrue(vclock.advance_until(lambda: all(st.anim is None for st in fan._by_data.values())))
+            state = fan._by_data[id(fan.cards[0])]
+            self.assertAlmostEqual(state.widget.x, fan.x + state.target.x)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+
+import sys
+from os.path import dirname, abspath
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import unittest
+from kivy.tests.common import GraphicUnitTest
+
+from amethyst_ttkvlib.widgets.cardfan import CardFan
+from amethyst_ttkvlib.widgets.cardfanmodel import CardFanModel
+from amethyst_ttkvlib.widgets.filterindex import CardFilterIndex
+
+
+class Card(object):
+    def __init__(self, id, name, flags):
+        self.id = id
+        self.name = name
+        self.flags = set(flags)
+
+
+class MyTest(GraphicUnitTest):
+
+    def test_index(self):
+        hand, table = CardFan(), CardFan()
+        hand.fast_forward = table.fast_forward = True
+        hand.cards = [ dict(card=Card(i, "pawn", ["red"] if i % 2 else ["blue"])) for i in range(6) ]
+        table.cards = [ dict(name="king", flags=["red", "crowned"]) ]
+        hand.fast_forward = table.fast_forward = False
+
+        index = CardFilterIndex(fans=[hand, table])
+        self.assertEqual(index.count(flags=["red"]), 4)
+        self.assertEqual(index.count(name="pawn", flags=["red"]), 3)
+        self.assertEqual(index.count(any_flags=["blue", "crowned"]), 4)
+        self.assertEqual(index.count(exclude_flags=["blue"]), 4)
+        self.assertEqual(index.matches(flags=["crowned"]), [ (table, table.cards[0]) ])
+
+        # Incremental updates
+        data = hand.cards[0]
+        data['card'].flags.add("red")
+        hand._by_data[id(data)].widget.trigger_refresh()
+        self.assertEqual(index.count(flags=["red"]), 5)
+        hand.pop(1)
+        table.insert(0, dict(name="queen", flags="red"))
+        self.assertEqual(index.count(flags=["red"]), 5)
+        self.assertEqual(index.count(name="queen"), 1)
+
+    def test_highlight(self):
+        fan = CardFan()
+        fan.fast_forward = True
+        fan.cards = [ dict(name=str(i), flags=["odd"] if i % 2 else []) for i in range(4) ]
+        fan.fast_forward = False
+        index = CardFilterIndex(fans=[fan])
+
+        def tinted():
+            return [ i for i, data in enumerate(fan.cards) if fan._by_data[id(data)].widget.tint != [1, 1, 1, 1] ]
+
+        index.highlight(flags=["odd"])
+        self.assertEqual(index.highlight_count, 2)
+        self.advance_frames(1)
+        self.assertEqual(tinted(), [1, 3])
+
+        fan.fast_forward = True
+        fan.insert(0, dict(name="new", flags=["odd"]))
+        fan.fast_forward = False
+        self.advance_frames(1)
+        self.assertEqual(tinted(), [0, 2, 4])
+        self.assertEqual(index.highlight_count, 3)
+
+        index.highlight()
+        self.advance_frames(1)
+        self.assertEqual(tinted(), [])
+
+    def test_shared_model(self):
+        model = CardFanModel([ dict(name=str(i), flags=["p"]) for i in range(3) ])
+        views = [ CardFan(model=model), CardFan(model=model, card_size=(40, 60)) ]
+        for fan in views:
+            fan.fast_forward = True
+            fan.fast_forward = False
+        index = CardFilterIndex(fans=views)
+        self.assertEqual(index.count(flags=["p"]), 6)
+        self.assertEqual(index.count(name="1"), 2)
+
+        index.highlight(flags=["p"])
+        self.advance_frames(1)
+        widgets = [ fan._by_data[id(data)].widget for fan in views for data in fan.cards ]
+        self.assertEqual(len(set(map(id, widgets))), 6)
+        self.assertTrue(all(w.tint == index.highlight_tint for w in widgets))
+
+        # A widget change re-indexes the card of its own view only
+        widget = views[1]._by_data[id(model[0])].widget
+        widget.flags = ["q"]
+        widget.trigger_refresh()
+        self.assertEqual(index.count(flags=["p"]), 5)
+        self.assertEqual(index.matches(flags=["q"]), [ (views[1], model[0]) ])
+
+        model.pop(2)
+        self.assertEqual(index.count(flags=["p"]), 3)
+        self.assertEqual(index.count(name="2"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
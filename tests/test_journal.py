@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+
+import sys
+from os.path import dirname, abspath, join
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import tempfile
+import threading
+import unittest
+from kivy.factory import Factory
+from kivy.tests.common import GraphicUnitTest
+
+from amethyst_ttkvlib.clock import VirtualClock
+from amethyst_ttkvlib.journal import NoticeJournal, NoticeReplay
+from amethyst_ttkvlib.widgets.cardfan import CardFan
+
+
+class Game(object):
+    def __init__(self):
+        self.observers = []
+
+    def observe(self, player_num, cb):
+        self.observers.append((player_num, cb))
+
+    def unobserve(self, player_num, cb):
+        self.observers.remove((player_num, cb))
+
+    def notify(self, seq, player_num, notice):
+        for pnum, cb in self.observers:
+            if pnum is None or pnum == player_num:
+                cb(self, seq, player_num, notice)
+
+
+class Table(object):
+    """Replay target: "fan" notices add a fan, "card" notices a card to the last fan."""
+    def __init__(self):
+        self.root = Factory.BoxLayout()
+        self.seen = []
+
+    def dispatch_notice(self, game, seq, player_num, notice):
+        if notice['name'] == "fan":
+            self.root.add_widget(CardFan(stats_enabled=True))
+        else:
+            fan = self.root.children[0]
+            fan.insert(len(fan.cards), dict(id=seq))
+            self.seen.append((seq, fan.fast_forward))
+
+
+def notices():
+    res = []
+    for seq in range(1, 13):
+        res.append((seq, 0, dict(name="fan" if seq in (1, 6) else "card")))
+    return res
+
+
+class MyTest(GraphicUnitTest):
+
+    def test_journal(self):
+        with tempfile.TemporaryDirectory() as path:
+            game = Game()
+            journal = NoticeJournal(join(path, "games", "1.journal"))
+            journal.observe(game, 0)
+            for seq, player_num, notice in notices():
+                game.notify(seq, player_num, notice)
+            game.notify(99, 1, dict(name="card"))    # Other player
+            journal.flush()
+            self.assertEqual(list(journal), notices())
+            journal.close()
+            self.assertEqual(game.observers, [])
+
+            # Load, and a partial last line is ignored
+            with open(join(path, "games", "1.journal"), "a") as fh:
+                fh.write('{"seq":13,"play')
+            self.assertEqual(list(NoticeJournal(join(path, "games", "1.journal"))), notices())
+            self.assertEqual(list(NoticeJournal(join(path, "none.journal"))), [])
+
+    def test_journal_bad_notice(self):
+        with tempfile.TemporaryDirectory() as path:
+            journal = NoticeJournal(join(path, "1.journal"))
+            journal.record(None, 1, 0, dict(name="card"))
+            journal.record(None, 2, 0, dict(name="card", data=b"raw"))
+            journal.record(None, 3, 0, dict(name="card"))
+            flush = threading.Thread(target=journal.flush, daemon=True)
+            flush.start()
+            flush.join(5)
+            self.assertFalse(flush.is_alive())
+            self.assertEqual([ seq for seq, player_num, notice in journal ], [1, 3])
+            journal.close()
+
+    def test_replay(self):
+        table = Table()
+        replay = NoticeReplay(notices(), table, batch=2)
+        done = []
+        with VirtualClock() as vclock:
+            replay.fast_forward(until=9, on_complete=done.append)
+            self.assertTrue(replay.running)
+            self.assertTrue(vclock.advance_until(lambda: done))
+            self.assertEqual(done, [replay])
+            self.assertFalse(replay.running)
+            self.assertEqual(replay.seq, 9)
+            # Fans created by notices were fast-forwarded too: held from
+            # the end of the batch which created them, and redrawn once
+            # without animation at the end
+            self.assertEqual(table.seen, [ (seq, seq in (3, 4, 5, 7, 8, 9)) for seq in (2, 3, 4, 5, 7, 8, 9) ])
+            fans = table.root.children
+            self.assertEqual([ len(fan.cards) for fan in fans ], [3, 4])
+            self.assertFalse(any(fan.fast_forward for fan in fans))
+            self.assertEqual([ (fan.stats['redraws'], fan.stats['animations_started']) for fan in fans ], [(1, 0), (1, 0)])
+
+            # Stepping and stopping leave dispatched notices in place
+            self.assertTrue(replay.step())
+            self.assertEqual(replay.seq, 10)
+            replay.play(interval=1)
+            vclock.advance(1.5)
+            replay.stop()
+            self.assertFalse(replay.running)
+            self.assertEqual(replay.seq, 11)
+            vclock.advance(2)
+            self.assertEqual(replay.seq, 11)
+            self.assertEqual(table.seen[-2:], [ (10, False), (11, False) ])
+
+            replay.fast_forward()
+            self.assertTrue(vclock.advance_until(lambda: not replay.running))
+            self.assertEqual(replay.seq, 12)
+            self.assertFalse(replay.step())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+
+import sys
+from os.path import dirname, abspath, join
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from kivy.factory import Factory
+from kivy.tests.common import GraphicUnitTest
+
+from amethyst_ttkvlib.render import BatchRenderer, encode_png
+from amethyst_ttkvlib.snapshot import dump_fan
+from amethyst_ttkvlib.widgets.cardfan import CardFan
+
+EXAMPLES = join(dirname(dirname(abspath(__file__))), "examples", "cardfan")
+
+
+def read_png(filename):
+    # (width, height, rows of RGBA bytes, top first) of an unfiltered PNG
+    with open(filename, 'rb') as fh:
+        blob = fh.read()
+    assert blob[:8] == b'\x89PNG\r\n\x1a\n'
+    w, h = struct.unpack('>II', blob[16:24])
+    length = struct.unpack('>I', blob[33:37])[0]
+    data = zlib.decompress(blob[41:41 + length])
+    stride = 4 * w + 1
+    return w, h, [ data[y * stride + 1:(y + 1) * stride] for y in range(h) ]
+
+
+class MyTest(GraphicUnitTest):
+
+    def test_encode_png(self):
+        # 2x2, bottom row red, top row blue
+        pixels = bytes([255, 0, 0, 255] * 2 + [0, 0, 255, 255] * 2)
+        with tempfile.TemporaryDirectory() as path:
+            with open(join(path, "a.png"), 'wb') as fh:
+                fh.write(encode_png(2, 2, pixels))
+            w, h, rows = read_png(join(path, "a.png"))
+        self.assertEqual((w, h), (2, 2))
+        self.assertEqual(rows, [bytes([0, 0, 255, 255] * 2), bytes([255, 0, 0, 255] * 2)])
+
+    def test_render(self):
+        source = join(EXAMPLES, "card-1.png")
+        fan = CardFan(card_size=(60, 90))
+        with tempfile.TemporaryDirectory() as path:
+            with BatchRenderer(fan, size=(200, 100)) as renderer:
+                for i in range(20):
+                    renderer.render(join(path, f"hand-{i:02d}.png"), cards=[ dict(id=j, source=source) for j in range(i % 5) ])
+                blob = dump_fan(fan)
+                renderer.render(join(path, "snapshot.png"), snapshot=blob)
+            self.assertEqual(renderer.rendered, 21)
+            self.assertEqual(len(os.listdir(path)), 21)
+
+            def opaque(name):
+                w, h, rows = read_png(join(path, name))
+                self.assertEqual((w, h), (200, 100))
+                return sum(row[3::4].count(255) for row in rows)
+            self.assertEqual(opaque("hand-00.png"), 0)
+            self.assertGreater(opaque("hand-04.png"), opaque("hand-01.png"))
+            self.assertEqual(opaque("hand-04.png"), opaque("snapshot.png"))
+            self.assertIsNone(fan.parent)
+
+    def test_render_tree(self):
+        root = Factory.BoxLayout(orientation='vertical')
+        fans = [ CardFan(card_size=(30, 45)) for i in range(2) ]
+        for fan in fans:
+            root.add_widget(fan)
+        with tempfile.TemporaryDirectory() as path:
+            with BatchRenderer(root, size=(100, 200)) as renderer:
+                renderer.render(join(path, "table.png"), fans={
+                    fans[0]: [ dict(id=1, source=join(EXAMPLES, "card-2.png")) ],
+                    fans[1]: ([ dict(id=2, source=join(EXAMPLES, "card-3.png")) ], [0]),
+                })
+            self.assertEqual(fans[1].height, 100)
+            self.assertEqual(fans[1].lifted_cards, [0])
+            self.assertEqual(len(fans[0].children), 1)
+            self.assertTrue(os.path.exists(join(path, "table.png")))
+
+    def test_reuse(self):
+        # Repeated hands reuse every card widget, and unmoved cards keep
+        # their transform
+        fan = CardFan(card_size=(60, 90))
+        fan.stats_enabled = True
+        hands = [ [ dict(id=i, source=join(EXAMPLES, f"card-{1 + (i + j) % 3}.png")) for i in range(20) ] for j in range(3) ]
+        with tempfile.TemporaryDirectory() as path:
+            with BatchRenderer(fan, size=(400, 100)) as renderer:
+                renderer.render(join(path, "0.png"), cards=hands[0])
+                transforms = { id(w): w.transform for w in fan.children }
+                for i, hand in enumerate(hands):
+                    renderer.render(join(path, f"{i}.png"), cards=hand)
+        self.assertEqual(fan.stats['widgets_created'], 20)
+        self.assertEqual({ id(w): w.transform for w in fan.children }, transforms)
+
+
+if __name__ == '__main__':
+    unittest.main()
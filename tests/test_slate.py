@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+
+import sys
+from os.path import dirname, abspath
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import types
+import unittest
+from kivy.tests.common import GraphicUnitTest
+
+from amethyst_ttkvlib.clock import VirtualClock
+from amethyst_ttkvlib.widgets.cardfan import CardFan
+from amethyst_ttkvlib.widgets.slate import Slate
+
+
+class MyTest(GraphicUnitTest):
+
+    def test_frozen(self):
+        slate = Slate()
+        slate.content_class = 'Label'
+        self.render(slate)
+        live = slate.canvas.children[:]
+
+        slate.frozen = True
+        fbo = slate._snapshot[0]
+        for container in slate.children:
+            self.assertEqual(slate.canvas.indexof(container.canvas), -1)
+            self.assertGreater(fbo.indexof(container.canvas), -1)
+
+        slate.content_width = 300
+        self.advance_frames(1)
+        self.assertEqual(tuple(fbo.size), (300, slate.height))
+
+        slate.frozen = False
+        self.assertIsNone(slate._snapshot)
+        self.assertEqual(slate.canvas.children, live)
+
+    def test_frozen_fan(self):
+        refreshes = []
+
+        class CountingSlate(Slate):
+            def _refresh_snapshot(self, *args):
+                refreshes.append(fan.is_animating())
+                super()._refresh_snapshot(*args)
+
+        fan = CardFan()
+        slate = CountingSlate()
+        slate.content = fan
+        self.render(slate)
+        slate.frozen = True
+        notice = types.SimpleNamespace(type=None, name=None, data=None)
+
+        with VirtualClock() as vclock:
+            vclock.step()
+            del refreshes[:]
+            # A notice which starts a card animation
+            fan.insert(0, dict(id=1))
+            slate.dispatch_notice(None, 1, 0, notice)
+            vclock.advance(fan.fade_time + 1)
+            self.assertGreater(len(refreshes), 2)
+            self.assertTrue(refreshes[0])
+            self.assertFalse(refreshes[-1])
+            self.assertFalse(fan.is_animating())
+            self.assertEqual(fan.children[0].opacity, 1)
+
+            # Settled fans need no further refreshes
+            count = len(refreshes)
+            vclock.advance(0.5)
+            self.assertEqual(len(refreshes), count)
+
+
+if __name__ == '__main__':
+    unittest.main()
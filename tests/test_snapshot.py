@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+
+import sys
+from os.path import dirname, abspath, join
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import tempfile
+import unittest
+from kivy.tests.common import GraphicUnitTest
+
+from amethyst_ttkvlib.snapshot import SnapshotStore
+from amethyst_ttkvlib.widgets.cardfan import CardFan
+from amethyst_ttkvlib.widgets.slate import Slate
+
+SOURCE = join(dirname(dirname(abspath(__file__))), "examples", "cardfan", "card-1.png")
+
+
+class MyTest(GraphicUnitTest):
+
+    def test_fan(self):
+        fan = CardFan(size_hint=(None, None), size=(800, 300), min_radius=1000)
+        self.render(fan)
+        for i in range(10):
+            fan.insert(i, dict(id=i, source=SOURCE))
+        fan.lifted_cards = [2, 3]
+        self.advance_frames(1)
+        self.assertEqual(list(fan.size), [800, 300])    # Stored targets match fan2
+
+        with tempfile.TemporaryDirectory() as path:
+            store = SnapshotStore(path)
+            self.assertTrue(store.save("hand", fan))
+            self.assertFalse(store.save("hand", fan))
+
+            fan2 = CardFan(size_hint=(None, None), size=(800, 300), min_radius=1000)
+            self.assertTrue(SnapshotStore(path).restore("hand", fan2))
+            self.assertFalse(SnapshotStore(path).restore("nope", fan2))
+
+            # Same size, other layout: stored targets are not reused
+            fan3 = CardFan(size_hint=(None, None), size=(800, 300), min_radius=1000, spacing=20)
+            self.assertTrue(SnapshotStore(path).restore("hand", fan3))
+
+        self.assertEqual([ c['id'] for c in fan2.cards ], list(range(10)))
+        self.assertEqual(list(fan2.lifted_cards), [2, 3])
+        for data in fan.cards:
+            target = fan._by_data[id(data)].target
+            widget = fan2._by_data[id(fan2.cards[data['id']])].widget
+            self.assertEqual(widget.opacity, 1)
+            self.assertAlmostEqual(widget.x, target.x)
+            self.assertAlmostEqual(widget.y, target.y)
+            self.assertAlmostEqual(widget.rotation % 360, target.rotation % 360)
+        self.assertEqual((fan2.actual_spacing, fan2.actual_radius, tuple(fan2.circle_origin)),
+                         (fan.actual_spacing, fan.actual_radius, tuple(fan.circle_origin)))
+        self.assertEqual(fan2._layout_key, fan2._get_layout_key())
+
+        targets = fan3.calculate()
+        for i, data in enumerate(fan3.cards):
+            widget = fan3._by_data[id(data)].widget
+            self.assertAlmostEqual(widget.x, targets[i].x)
+            self.assertAlmostEqual(widget.y, targets[i].y)
+
+    def test_slate(self):
+        slate = Slate()
+        slate.content_class = 'Label'
+        slate.player_num = 3
+        with tempfile.TemporaryDirectory() as path:
+            store = SnapshotStore(path)
+            store.save("p3", slate)
+            slate2 = Slate()
+            store.restore("p3", slate2)
+        self.assertEqual(slate2.player_num, 3)
+        self.assertEqual(type(slate2.content).__name__, 'Label')
+
+
+if __name__ == '__main__':
+    unittest.main()
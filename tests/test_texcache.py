@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+
+import sys
+from os.path import dirname, abspath, join
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import tempfile
+import unittest
+from kivy.tests.common import GraphicUnitTest
+
+from amethyst_ttkvlib.texcache import TextureCache
+from amethyst_ttkvlib.widgets.cardfan import CardImage
+
+try:
+    import PIL
+except ImportError:
+    PIL = None
+
+SOURCE = join(dirname(dirname(abspath(__file__))), "examples", "cardfan", "card-1.png")
+
+
+class MyTest(GraphicUnitTest):
+
+    def test_TextureCache(self):
+        with tempfile.TemporaryDirectory() as path:
+            cache = TextureCache(path)
+            tex = cache.get(SOURCE, (120, 180))
+            self.assertEqual(tex.size, (120, 180))
+            self.assertIs(cache.get(SOURCE, (120, 180)), tex)
+            self.assertEqual(len(cache.entries()), 1)
+
+            # Warm start loads the stored blob
+            cache2 = TextureCache(path)
+            tex2 = cache2.get(SOURCE, (120, 180))
+            self.assertIsNot(tex2, tex)
+            self.assertEqual(tex2.pixels, tex.pixels)
+
+            cache2.get(SOURCE, (60, 90))
+            self.assertEqual(len(cache2.entries()), 2)
+            cache2.evict(budget=60 * 90 * 4 + 100)
+            self.assertEqual(len(cache2.entries()), 1)
+
+            self.assertIsNone(cache2.get("no-such-card.png", (60, 90)))
+
+    @unittest.skipIf(PIL is None, "Pillow not installed")
+    def test_straight_alpha(self):
+        from PIL import Image
+        with tempfile.TemporaryDirectory() as path:
+            # Half transparent white must not be darkened by blending
+            source = join(path, "half.png")
+            Image.new("RGBA", (4, 4), (255, 255, 255, 128)).save(source)
+            tex = TextureCache(join(path, "cache")).get(source, (4, 4))
+            pixels = tex.pixels
+            self.assertEqual(tuple(pixels[20:24]), (255, 255, 255, 128))
+
+    def test_non_file_sources(self):
+        with tempfile.TemporaryDirectory() as path:
+            cache = TextureCache(path)
+            atlas = "atlas://data/images/defaulttheme/button"
+            self.assertIsNone(cache.key(atlas, (60, 90)))
+            self.assertIsNone(cache.get(atlas, (60, 90)))
+            self.assertIsNone(cache.get("https://example.com/card.png", (60, 90)))
+
+            # Faces the cache can not provide are loaded by the Image
+            widget = CardImage(source=atlas, texture_cache=cache, size=(60, 90))
+            widget._load_face()
+            self.assertTrue(widget.face_fallback)
+            self.assertEqual(widget.ids['img'].source, atlas)
+            self.assertIsNotNone(widget.ids['img'].texture)
+            widget.source = SOURCE
+            widget._load_face()
+            self.assertFalse(widget.face_fallback)
+            self.assertEqual(widget.ids['img'].source, '')
+            self.assertIs(widget.ids['img'].texture, cache.get(SOURCE, (60, 90)))
+
+    def test_memory_budget(self):
+        with tempfile.TemporaryDirectory() as path:
+            cache = TextureCache(path, memory_budget=2 * 62 * 90 * 4)
+            for w in (60, 61, 62):
+                cache.get(SOURCE, (w, 90))
+            self.assertEqual(list(cache.textures), [ (SOURCE, 61, 90), (SOURCE, 62, 90) ])
+
+            # Memory hits do not touch the file system
+            cache.key = None
+            self.assertIsNotNone(cache.get(SOURCE, (62, 90)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+
+import sys
+from os.path import dirname, abspath
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import threading
+import unittest
+
+from kivy.clock import Clock
+from kivy.event import EventDispatcher
+
+from amethyst_ttkvlib.behaviors.toast import ToastBehavior
+
+
+class Toaster(ToastBehavior, EventDispatcher):
+    pass
+
+
+class MyTest(unittest.TestCase):
+
+    def test_coalesce(self):
+        obj = Toaster()
+        for i in range(12):
+            obj.error("boom", 5)
+        obj.toast("hello")
+        obj.warning("careful")
+
+        def worker():
+            for i in range(100):
+                obj.toast("net", 5)
+        threads = [ threading.Thread(target=worker) for i in range(4) ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        Clock.tick()
+
+        self.assertEqual(obj.errstr, "[color=#f44336]boom x12[/color]")
+        self.assertEqual(obj.toastpending[('info', 'net')].count, 400)
+
+        obj.pop_toast()
+        self.assertEqual(obj.errstr, "[color=#ffc107]careful[/color]")
+
+        # Info toasts are rate limited, but hello is first in line
+        obj.pop_toast()
+        self.assertEqual(obj.errstr, "hello")
+        obj.pop_toast()
+        self.assertEqual(obj.errstr, "")
+        self.assertIsNotNone(obj.toastclock)
+
+
+if __name__ == '__main__':
+    unittest.main()
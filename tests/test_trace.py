@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GPL-3.0
+
+import sys
+from os.path import dirname, abspath, join
+sys.path.insert(1, dirname(dirname(abspath(__file__))))
+sys.argv = [ sys.argv[0] ]  # clear argv else kivy gets confused
+
+import json
+import tempfile
+import unittest
+from kivy.tests.common import GraphicUnitTest
+
+from amethyst_ttkvlib import trace
+from amethyst_ttkvlib.widgets.cardfan import CardFan
+
+
+class MyTest(GraphicUnitTest):
+
+    def tearDown(self, *args, **kwargs):
+        trace.stop_tracing()
+        super().tearDown(*args, **kwargs)
+
+    def test_disabled(self):
+        self.assertIsNone(trace.tracer)
+        fan = CardFan()
+        fan._redraw()
+        self.assertIsNone(trace.stop_tracing())
+
+    def test_trace(self):
+        tracer = trace.start_tracing(capacity=50)
+        fan = CardFan()
+        fan.size = (800, 300)
+        self.render(fan)
+        for i in range(5):
+            fan.insert(i, dict(id=i))
+        self.advance_frames(3)
+        with tracer.span("custom", "test", args=dict(x=1)):
+            pass
+        for i in range(100):
+            tracer.add("filler", "test", tracer.now())
+        self.assertEqual(len(tracer.spans), 50)
+        tracer.clear()
+
+        fan.pop(0)
+        self.advance_frames(3)
+        self.assertIs(trace.stop_tracing(), tracer)
+        self.advance_frames(1)
+
+        with tempfile.TemporaryDirectory() as path:
+            tracer.dump(join(path, "trace.json"))
+            with open(join(path, "trace.json")) as fh:
+                events = json.load(fh)['traceEvents']
+        names = set(e['name'] for e in events)
+        self.assertIn("CardFan._redraw", names)
+        self.assertIn("frame", names)
+        for e in events:
+            self.assertEqual(e['ph'], "X")
+            self.assertGreaterEqual(e['dur'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()